@@ -1,26 +1,95 @@
 """Raindrop API client using httpx (Gracy compatible patterns).
 
-Provides simple pagination, auth from env, and retry/backoff for 429s.
+Provides simple pagination, auth from env, and retry/backoff driven by the
+server's rate-limit headers (429, 5xx and transient transport errors).
+`AsyncRaindropClient` offers the same surface on `httpx.AsyncClient` for
+fetching many collections concurrently under one shared rate limit.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
-import random
 import time
-from typing import Callable, Iterator, List, Optional
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+)
 from datetime import datetime, date, timezone
 
 import httpx
 
 from ..models import Raindrop
+from .rate_limiter import AdaptiveRateController, TokenBucket
 
 
 DEFAULT_BASE = "https://api.raindrop.io/rest/v1"
 
+# Page size of `list_raindrops_since` walks; resumable offsets depend on it.
+SINCE_PER_PAGE = 200
+
 Logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+def _parse_ts_to_dt(value) -> Optional[datetime]:
+    """Robust parser for API timestamps -> timezone-aware datetimes."""
+    if value is None:
+        return None
+    # Accept epoch seconds
+    try:
+        if isinstance(value, (int, float)):
+            return datetime.fromtimestamp(int(value), tz=timezone.utc)
+    except Exception:
+        pass
+    s = str(value)
+    # Normalize trailing Z to +00:00 for fromisoformat
+    if s.endswith("Z"):
+        s = s[:-1] + "+00:00"
+    try:
+        dt = datetime.fromisoformat(s)
+        if dt.tzinfo is None:
+            # Assume UTC for naive timestamps
+            return dt.replace(tzinfo=timezone.utc)
+        return dt
+    except Exception:
+        return None
+
+
+def _updated_before(item: dict, since: Optional[datetime]) -> bool:
+    """True when `item` was last updated strictly before `since`."""
+    if since is None:
+        return False
+    updated = _parse_ts_to_dt(item.get("lastUpdate"))
+    return updated is not None and updated < since
+
+
+def _created_search(iso_cursor: str | None) -> Optional[str]:
+    """Build the `search` filter used for incremental fetches.
+
+    The Raindrop API only accepts a YYYY-MM-DD date for the `created` search
+    field and supports only '<' and '>' operators. Use the parsed cursor to
+    derive a date; fall back to the raw date part if parsing failed.
+    """
+    if not iso_cursor:
+        return None
+    iso_dt = _parse_ts_to_dt(iso_cursor)
+    if iso_dt:
+        return f"created:>{iso_dt.date().isoformat()}"
+    try:
+        return f"created:>{iso_cursor.split('T')[0]}"
+    except Exception:
+        Logger.debug("Could not parse iso_cursor %r for search", iso_cursor)
+        return None
+
 
 class RaindropClient:
     def __init__(
@@ -33,6 +102,7 @@ class RaindropClient:
         enforce_rate_limit: bool = False,
         on_retry: Optional[Callable[[str, int, float], None]] = None,
         on_request: Optional[Callable[[str], None]] = None,
+        rate_controller: Optional[AdaptiveRateController] = None,
     ) -> None:
         """Create a RaindropClient.
 
@@ -40,6 +110,8 @@ class RaindropClient:
         - enforce_rate_limit: if True, enforces spacing between requests to honor rate limit.
         - on_retry: optional callback called on retry attempts: (url, attempt, delay)
         - on_request: optional callback called before each request with the url.
+        - rate_controller: reads rate-limit headers and decides retry/backoff
+          delays (429, 5xx and transport errors); a default one is created.
         """
         self.token = token or os.getenv("RAINDROP_TOKEN")
         self.base_url = base_url.rstrip("/")
@@ -48,6 +120,7 @@ class RaindropClient:
         self.enforce_rate_limit = enforce_rate_limit
         self.on_retry = on_retry
         self.on_request = on_request
+        self.rate_controller = rate_controller or AdaptiveRateController()
 
         self._client = httpx.Client(timeout=30.0)
         self._last_request_ts: float = 0.0
@@ -79,59 +152,24 @@ class RaindropClient:
             page += 1
 
     def list_raindrops_since(
-        self, collection_id: int, iso_cursor: str | None = None
+        self,
+        collection_id: int,
+        iso_cursor: str | None = None,
+        start_page: int = 0,
     ) -> Iterator[dict]:
         """Iterate raindrops sorted by created date; stop when created <= iso_cursor.
 
-        Uses perpage=200 and sort=created per contract.
+        Uses perpage=200 and sort=created per contract. `start_page` resumes
+        an interrupted walk (pages are SINCE_PER_PAGE items each).
         """
-        page = 0
-        perpage = 200
-
-        # Robust parser for timestamps -> timezone-aware datetimes
-        def _parse_ts_to_dt(value) -> Optional[datetime]:
-            if value is None:
-                return None
-            # Accept epoch seconds
-            try:
-                if isinstance(value, (int, float)):
-                    return datetime.fromtimestamp(int(value), tz=timezone.utc)
-            except Exception:
-                pass
-            s = str(value)
-            # Normalize trailing Z to +00:00 for fromisoformat
-            if s.endswith("Z"):
-                s = s[:-1] + "+00:00"
-            try:
-                dt = datetime.fromisoformat(s)
-                if dt.tzinfo is None:
-                    # Assume UTC for naive timestamps
-                    return dt.replace(tzinfo=timezone.utc)
-                return dt
-            except Exception:
-                return None
-
-        # Parse iso_cursor once for comparisons
-        iso_dt: Optional[datetime] = _parse_ts_to_dt(iso_cursor) if iso_cursor else None
+        page = start_page
+        perpage = SINCE_PER_PAGE
+        search = _created_search(iso_cursor)
         while True:
             url = f"{self.base_url}/raindrops/{collection_id}"
             params = {"page": page, "perpage": perpage, "sort": "created"}
-            if iso_cursor:
-                # The Raindrop API only accepts a YYYY-MM-DD date for the `created`
-                # search field and supports only '<' and '>' operators. Use the
-                # parsed iso_dt to derive a date; fall back to the raw date part
-                # if parsing failed.
-                if iso_dt:
-                    date_str = iso_dt.date().isoformat()
-                    params["search"] = f"created:>{date_str}"
-                else:
-                    try:
-                        date_str = iso_cursor.split("T")[0]
-                        params["search"] = f"created:>{date_str}"
-                    except Exception:
-                        Logger.debug(
-                            "Could not parse iso_cursor %r for search", iso_cursor
-                        )
+            if search:
+                params["search"] = search
             resp = self._request_with_retry("GET", url, params=params)
             data = resp.json()
             items = data.get("items", [])
@@ -146,6 +184,35 @@ class RaindropClient:
                 yield it
             page += 1
 
+    def list_raindrops_changed_since(
+        self, collection_id: int, iso_since: str | None = None
+    ) -> Iterator[dict]:
+        """Iterate raindrops by descending lastUpdate, stopping at `iso_since`.
+
+        Items updated at or after `iso_since` are yielded; the walk ends on
+        the first older item, so unchanged raindrops cost no extra pages.
+        """
+        since = _parse_ts_to_dt(iso_since)
+        page = 0
+        url = f"{self.base_url}/raindrops/{collection_id}"
+        while True:
+            params = {"page": page, "perpage": SINCE_PER_PAGE, "sort": "-lastUpdate"}
+            items = self._request_with_retry("GET", url, params=params).json().get(
+                "items", []
+            )
+            for it in items:
+                if _updated_before(it, since):
+                    return
+                yield it
+            if len(items) < SINCE_PER_PAGE:
+                return
+            page += 1
+
+    def get_user_stats(self) -> List[dict]:
+        """Return `/user/stats` items: counts for collections 0, -1 and -99."""
+        resp = self._request_with_retry("GET", f"{self.base_url}/user/stats")
+        return resp.json().get("items", [])
+
     def _enforce_rate_limit_if_needed(self) -> None:
         if not self.enforce_rate_limit or self.rate_limit_per_min <= 0:
             return
@@ -155,18 +222,17 @@ class RaindropClient:
         if elapsed < min_interval:
             to_sleep = min_interval - elapsed
             Logger.debug("Enforcing rate limit: sleeping %.3fs", to_sleep)
-            time.sleep(to_sleep)
+            self._sleep(to_sleep)
 
     def _request_with_retry(
         self, method: str, url: str, params: dict | None = None
     ) -> httpx.Response:
         attempts = 0
-        delay = 1.0
-        max_delay = 30.0
         while True:
             attempts += 1
-            # Rate limit spacing
+            # Rate limit spacing, then any slowdown requested by the server
             self._enforce_rate_limit_if_needed()
+            self._sleep(self.rate_controller.pre_request_delay(), url)
 
             if self.on_request:
                 try:
@@ -175,35 +241,348 @@ class RaindropClient:
                     Logger.exception("on_request callback raised an exception")
 
             Logger.debug("Requesting %s %s (attempt %d)", method, url, attempts)
-            resp = self._client.request(
-                method, url, headers=self._headers(), params=params
-            )
-            self._last_request_ts = time.monotonic()
-
-            if resp.status_code == 429:
-                # Exponential backoff + jitter
-                jitter = random.uniform(0, 0.25 * delay)
-                to_sleep = min(delay + jitter, max_delay)
-                Logger.warning(
-                    "Received 429 for %s, backing off %.2fs (attempt %d)",
-                    url,
-                    to_sleep,
-                    attempts,
+            try:
+                resp = self._client.request(
+                    method, url, headers=self._headers(), params=params
                 )
-                if self.on_retry:
-                    try:
-                        self.on_retry(url, attempts, to_sleep)
-                    except Exception:
-                        Logger.exception("on_retry callback raised an exception")
-                time.sleep(to_sleep)
-                delay = min(delay * 2, max_delay)
+            except httpx.HTTPError as exc:
+                to_sleep = self.rate_controller.retry_delay(attempts, exc=exc)
+                if to_sleep is None:
+                    raise
+                self._backoff(url, attempts, to_sleep, repr(exc))
+                continue
+            finally:
+                self._last_request_ts = time.monotonic()
+
+            self.rate_controller.observe(resp)
+            to_sleep = self.rate_controller.retry_delay(attempts, resp=resp)
+            if to_sleep is not None:
+                self._backoff(url, attempts, to_sleep, str(resp.status_code))
                 continue
 
             resp.raise_for_status()
             return resp
 
+    def _backoff(self, url: str, attempt: int, to_sleep: float, reason: str) -> None:
+        Logger.warning(
+            "Received %s for %s, backing off %.2fs (attempt %d)",
+            reason,
+            url,
+            to_sleep,
+            attempt,
+        )
+        if self.on_retry:
+            try:
+                self.on_retry(url, attempt, to_sleep)
+            except Exception:
+                Logger.exception("on_retry callback raised an exception")
+        self._sleep(to_sleep)
+
+    def _sleep(self, seconds: float, url: str | None = None) -> None:
+        if seconds <= 0:
+            return
+        if url is not None:
+            Logger.info("Rate limit nearly exhausted: sleeping %.2fs before %s", seconds, url)
+        time.sleep(seconds)
+        self.rate_controller.record_sleep(seconds)
+
+    @property
+    def slept_seconds(self) -> float:
+        """Total seconds spent sleeping for rate limits and retry backoff."""
+        return self.rate_controller.slept_seconds
+
     def close(self) -> None:
         try:
             self._client.close()
         except Exception:
             pass
+
+
+class AsyncRaindropClient:
+    """Asynchronous Raindrop client built on `httpx.AsyncClient`.
+
+    Exposes the same `list_collections` / `list_raindrops` /
+    `list_raindrops_since` surface as `RaindropClient` (as coroutines and
+    async iterators) so collections can be fetched concurrently. A single
+    `TokenBucket` is shared by every in-flight request, so the global
+    `rate_limit_per_min` budget holds no matter how many collections are
+    being fetched at once.
+
+    - max_concurrency: how many collections `map_collections` fetches in parallel.
+    - page_window: how many planned pages of one collection are requested at
+      once when the collection `count` is known.
+    - on_retry / on_request: same callback contract as `RaindropClient`.
+
+    The underlying `httpx.AsyncClient` is created lazily on first use and
+    released by `aclose()`; use one client per event loop run.
+    """
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        base_url: str = DEFAULT_BASE,
+        per_page: int = 50,
+        *,
+        rate_limit_per_min: int = 120,
+        enforce_rate_limit: bool = True,
+        max_concurrency: int = 4,
+        page_window: int = 8,
+        on_retry: Optional[Callable[[str, int, float], None]] = None,
+        on_request: Optional[Callable[[str], None]] = None,
+        rate_controller: Optional[AdaptiveRateController] = None,
+    ) -> None:
+        self.token = token or os.getenv("RAINDROP_TOKEN")
+        self.base_url = base_url.rstrip("/")
+        self.per_page = per_page
+        self.rate_limit_per_min = rate_limit_per_min
+        self.enforce_rate_limit = enforce_rate_limit
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.page_window = max(1, int(page_window))
+        self.on_retry = on_retry
+        self.on_request = on_request
+        self.rate_controller = rate_controller or AdaptiveRateController()
+
+        self.bucket: Optional[TokenBucket] = (
+            TokenBucket(rate_limit_per_min)
+            if enforce_rate_limit and rate_limit_per_min > 0
+            else None
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _headers(self) -> dict:
+        headers = {"Accept": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        return headers
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=30.0)
+        return self._client
+
+    async def list_collections(self) -> List[dict]:
+        url = f"{self.base_url}/collections"
+        resp = await self._request_with_retry("GET", url)
+        data = resp.json()
+        return data.get("items", [])
+
+    async def list_raindrops(
+        self, collection_id: int, count: Optional[int] = None
+    ) -> AsyncIterator[dict]:
+        """Iterate all raindrops of a collection.
+
+        When `count` (the collection's `count` from `/collections`) is known,
+        the page range is planned up front and fetched in parallel.
+        """
+        url = f"{self.base_url}/raindrops/{collection_id}"
+        async for items in self._iter_pages(url, {}, self.per_page, count):
+            for it in items:
+                yield it
+
+    async def list_raindrops_since(
+        self,
+        collection_id: int,
+        iso_cursor: str | None = None,
+        count: Optional[int] = None,
+        start_page: int = 0,
+    ) -> AsyncIterator[dict]:
+        """Async counterpart of `RaindropClient.list_raindrops_since`.
+
+        `count` enables parallel page planning but only applies to an
+        unfiltered walk (no `iso_cursor`): the collection count says nothing
+        about how many items match the `created:>` search.
+        """
+        url = f"{self.base_url}/raindrops/{collection_id}"
+        params = {"sort": "created"}
+        search = _created_search(iso_cursor)
+        if search:
+            params["search"] = search
+            count = None
+        async for items in self._iter_pages(
+            url,
+            params,
+            SINCE_PER_PAGE,
+            count,
+            stop_on_short=False,
+            start_page=start_page,
+        ):
+            for it in items:
+                yield it
+
+    async def list_raindrops_changed_since(
+        self, collection_id: int, iso_since: str | None = None
+    ) -> AsyncIterator[dict]:
+        """Async counterpart of `RaindropClient.list_raindrops_changed_since`.
+
+        Pages are fetched one at a time: where the walk stops is only known
+        once the page holding `iso_since` has been read.
+        """
+        since = _parse_ts_to_dt(iso_since)
+        url = f"{self.base_url}/raindrops/{collection_id}"
+        page = 0
+        while True:
+            items = await self._get_page(
+                url, {"sort": "-lastUpdate"}, page, SINCE_PER_PAGE
+            )
+            for it in items:
+                if _updated_before(it, since):
+                    return
+                yield it
+            if len(items) < SINCE_PER_PAGE:
+                return
+            page += 1
+
+    async def get_user_stats(self) -> List[dict]:
+        resp = await self._request_with_retry("GET", f"{self.base_url}/user/stats")
+        return resp.json().get("items", [])
+
+    async def _get_page(
+        self, url: str, params: dict, page: int, per_page: int
+    ) -> List[dict]:
+        resp = await self._request_with_retry(
+            "GET", url, params={"page": page, "perpage": per_page, **params}
+        )
+        items = resp.json().get("items", [])
+        Logger.debug("Fetched items: %d (page %d)", len(items), page)
+        return items
+
+    async def _iter_pages(
+        self,
+        url: str,
+        params: dict,
+        per_page: int,
+        count: Optional[int],
+        *,
+        stop_on_short: bool = True,
+        start_page: int = 0,
+    ) -> AsyncIterator[List[dict]]:
+        """Yield pages in order, planning the page range from `count` when known.
+
+        Planned pages are requested `page_window` at a time in parallel (all
+        requests still pass through the shared token bucket). A short page
+        ends the walk early when the count was stale-high; a full last page
+        means the count was stale-low (or missing), in which case the walk
+        falls back to sequential probing until an empty/short page.
+        """
+        planned = -(-int(count) // per_page) if count and int(count) > 0 else 0
+        page = start_page
+        while page < planned:
+            window = range(page, min(planned, page + self.page_window))
+            pages = await asyncio.gather(
+                *(self._get_page(url, params, p, per_page) for p in window)
+            )
+            for items in pages:
+                if items:
+                    yield items
+            page = window.stop
+            if len(pages[-1]) < per_page:
+                return
+
+        while True:
+            items = await self._get_page(url, params, page, per_page)
+            if items:
+                yield items
+            if not items or (stop_on_short and len(items) < per_page):
+                return
+            page += 1
+
+    async def map_collections(
+        self, collections: Iterable[T], worker: Callable[[T], Awaitable[None]]
+    ) -> None:
+        """Run `worker` for every collection, at most `max_concurrency` at a time.
+
+        The first worker exception cancels the remaining workers and is re-raised.
+        """
+        sem = asyncio.Semaphore(self.max_concurrency)
+
+        async def _run(item: T) -> None:
+            async with sem:
+                await worker(item)
+
+        tasks = [asyncio.ensure_future(_run(c)) for c in collections]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def _request_with_retry(
+        self, method: str, url: str, params: dict | None = None
+    ) -> httpx.Response:
+        attempts = 0
+        client = self._get_client()
+        while True:
+            attempts += 1
+            if self.bucket is not None:
+                waited = await self.bucket.acquire_async()
+                if waited:
+                    Logger.debug("Enforcing rate limit: waited %.3fs", waited)
+                    self.rate_controller.record_sleep(waited)
+            pause = self.rate_controller.pre_request_delay()
+            if pause > 0:
+                Logger.info("Rate limit nearly exhausted: sleeping %.2fs before %s", pause, url)
+                await self._sleep(pause)
+
+            if self.on_request:
+                try:
+                    self.on_request(url)
+                except Exception:
+                    Logger.exception("on_request callback raised an exception")
+
+            Logger.debug("Requesting %s %s (attempt %d)", method, url, attempts)
+            try:
+                resp = await client.request(
+                    method, url, headers=self._headers(), params=params
+                )
+            except httpx.HTTPError as exc:
+                to_sleep = self.rate_controller.retry_delay(attempts, exc=exc)
+                if to_sleep is None:
+                    raise
+                await self._backoff(url, attempts, to_sleep, repr(exc))
+                continue
+
+            self.rate_controller.observe(resp)
+            to_sleep = self.rate_controller.retry_delay(attempts, resp=resp)
+            if to_sleep is not None:
+                await self._backoff(url, attempts, to_sleep, str(resp.status_code))
+                continue
+
+            resp.raise_for_status()
+            return resp
+
+    async def _backoff(
+        self, url: str, attempt: int, to_sleep: float, reason: str
+    ) -> None:
+        Logger.warning(
+            "Received %s for %s, backing off %.2fs (attempt %d)",
+            reason,
+            url,
+            to_sleep,
+            attempt,
+        )
+        if self.on_retry:
+            try:
+                self.on_retry(url, attempt, to_sleep)
+            except Exception:
+                Logger.exception("on_retry callback raised an exception")
+        await self._sleep(to_sleep)
+
+    async def _sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+            self.rate_controller.record_sleep(seconds)
+
+    @property
+    def slept_seconds(self) -> float:
+        """Total seconds spent waiting for rate limits and retry backoff."""
+        return self.rate_controller.slept_seconds
+
+    async def aclose(self) -> None:
+        client, self._client = self._client, None
+        if client is not None:
+            try:
+                await client.aclose()
+            except Exception:
+                pass
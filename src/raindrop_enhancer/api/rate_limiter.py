@@ -0,0 +1,197 @@
+"""Rate limiting primitives shared by the Raindrop API clients.
+
+The token bucket hands out reservations instead of blocking while holding a
+lock, so a single bucket can be shared by many concurrent asyncio tasks (or
+threads) and still enforce one global request budget. The adaptive
+controller complements it with what the server reports at runtime.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+
+import httpx
+
+
+class TokenBucket:
+    """Token bucket enforcing a requests-per-minute budget.
+
+    - rate_per_min: sustained number of requests allowed per minute.
+    - burst: bucket capacity, i.e. how many requests may be issued back to
+      back before spacing kicks in (defaults to ``min(10, rate_per_min)``).
+    - clock: monotonic clock, injectable for tests.
+
+    Callers reserve a token with `reserve()`, which returns how long they
+    must wait before using it. Reservations may drive the token count below
+    zero; later callers then queue up behind earlier ones in FIFO order.
+    """
+
+    def __init__(
+        self,
+        rate_per_min: int,
+        burst: Optional[int] = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if rate_per_min <= 0:
+            raise ValueError("rate_per_min must be positive")
+        self.rate_per_sec = float(rate_per_min) / 60.0
+        self.capacity = float(burst if burst is not None else min(10, rate_per_min))
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return the delay (seconds) before it may be used."""
+        with self._lock:
+            now = self._clock()
+            elapsed = max(0.0, now - self._updated)
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate_per_sec)
+            self._updated = now
+            self._tokens -= 1.0
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate_per_sec
+
+    def acquire(self) -> float:
+        """Blocking acquire; returns the number of seconds slept."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self) -> float:
+        """Asyncio acquire; returns the number of seconds awaited."""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+
+# Statuses worth retrying: the API documents 5xx as "safe to retry later".
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Transport failures worth retrying (connect/read timeouts, dropped connections).
+RETRYABLE_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+
+
+class AdaptiveRateController:
+    """Decide how long to wait before and between requests from server feedback.
+
+    - Reads `Retry-After`, `X-RateLimit-Remaining` (or `RateLimit-Remaining`)
+      and `X-RateLimit-Reset` from every response via `observe()`.
+    - `pre_request_delay()` slows down pre-emptively once the remaining quota
+      drops to `low_watermark`, spreading the rest of the window evenly, and
+      waits for the reset when the quota is exhausted.
+    - `retry_delay()` returns how long to sleep before retrying a 429/5xx
+      response or a transport error, or None when the failure is not
+      retryable or `max_retries` is exhausted. Server-provided delays are
+      honored exactly; otherwise bounded exponential backoff with jitter.
+    - `slept_seconds` accumulates every sleep recorded through `record_sleep`.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_retries: int = 6,
+        backoff_base: float = 1.0,
+        max_backoff: float = 30.0,
+        max_server_delay: float = 300.0,
+        low_watermark: int = 5,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.max_server_delay = max_server_delay
+        self.low_watermark = low_watermark
+        self._clock = clock
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.slept_seconds = 0.0
+
+    def observe(self, resp: httpx.Response) -> None:
+        """Remember the quota advertised by a response's rate-limit headers."""
+        remaining = _int_header(resp, "X-RateLimit-Remaining", "RateLimit-Remaining")
+        if remaining is not None:
+            self.remaining = remaining
+        reset = _int_header(resp, "X-RateLimit-Reset", "RateLimit-Reset")
+        if reset is not None:
+            # Raindrop sends UTC epoch seconds; small values are relative seconds.
+            self.reset_at = float(reset) if reset > 1_000_000_000 else self._clock() + reset
+
+    def pre_request_delay(self) -> float:
+        if self.remaining is None or self.reset_at is None:
+            return 0.0
+        until_reset = self.reset_at - self._clock()
+        if until_reset <= 0:
+            self.remaining = None
+            self.reset_at = None
+            return 0.0
+        if self.remaining <= 0:
+            return min(until_reset, self.max_server_delay)
+        if self.remaining <= self.low_watermark:
+            return until_reset / (self.remaining + 1)
+        return 0.0
+
+    def retry_delay(
+        self,
+        attempt: int,
+        resp: Optional[httpx.Response] = None,
+        exc: Optional[BaseException] = None,
+    ) -> Optional[float]:
+        if attempt > self.max_retries:
+            return None
+        if resp is not None:
+            if resp.status_code not in RETRYABLE_STATUSES:
+                return None
+            server_delay = _retry_after(resp, self._clock)
+            if server_delay is None and resp.status_code == 429 and self.reset_at:
+                server_delay = self.reset_at - self._clock()
+            if server_delay is not None and server_delay >= 0:
+                return min(server_delay, self.max_server_delay)
+        elif not isinstance(exc, RETRYABLE_ERRORS):
+            return None
+        delay = min(self.backoff_base * (2 ** (attempt - 1)), self.max_backoff)
+        return min(delay + random.uniform(0, 0.25 * delay), self.max_backoff)
+
+    def record_sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            self.slept_seconds += seconds
+
+
+def _int_header(resp: httpx.Response, *names: str) -> Optional[int]:
+    for name in names:
+        value = resp.headers.get(name)
+        if value is None:
+            continue
+        try:
+            return int(float(value))
+        except ValueError:
+            continue
+    return None
+
+
+def _retry_after(resp: httpx.Response, clock: Callable[[], float]) -> Optional[float]:
+    """Parse `Retry-After` as delta-seconds or an HTTP date."""
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, when.timestamp() - clock())
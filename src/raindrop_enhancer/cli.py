@@ -2,17 +2,22 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
 import sys
 from contextlib import nullcontext
-from typing import TextIO
+from itertools import islice
+from typing import Optional, TextIO
 import logging
 
 import click
 
-from .api.raindrop_client import RaindropClient
+from .api.raindrop_client import AsyncRaindropClient, RaindropClient
+from .api.rate_limiter import AdaptiveRateController
 from .exporters.json_exporter import export_to_file
 from .models import Raindrop, Collection, filter_active_raindrops
+from .storage.compression import COMPRESSION_METHODS, DEFAULT_COMPRESSION
+from .storage.sqlite_store import DB_PROFILES, DEFAULT_DB_PROFILE
 from .sync.orchestrator import Orchestrator
 from pathlib import Path
 
@@ -28,6 +33,31 @@ if load_dotenv is not None and os.path.exists(".env") and "pytest" not in sys.mo
     load_dotenv()
 
 
+def _make_client(
+    token: str,
+    enforce_rate_limit: bool,
+    rate_limit: int,
+    concurrency: int,
+    max_retries: int,
+):
+    """Build the sequential client, or the async one when concurrency > 1."""
+    rate_controller = AdaptiveRateController(max_retries=max_retries)
+    if concurrency > 1:
+        return AsyncRaindropClient(
+            token=token,
+            enforce_rate_limit=enforce_rate_limit,
+            rate_limit_per_min=rate_limit,
+            max_concurrency=concurrency,
+            rate_controller=rate_controller,
+        )
+    return RaindropClient(
+        token=token,
+        enforce_rate_limit=enforce_rate_limit,
+        rate_limit_per_min=rate_limit,
+        rate_controller=rate_controller,
+    )
+
+
 def _open_output(path: str) -> TextIO:
     if path == "-":
         return sys.stdout
@@ -65,6 +95,19 @@ def _configure_logging(quiet: bool, verbose: bool) -> None:
     default=120,
     help="Requests per minute to honor when enforcing rate-limit",
 )
+@click.option(
+    "--concurrency",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Collections fetched in parallel (>1 uses the async client)",
+)
+@click.option(
+    "--max-retries",
+    default=6,
+    show_default=True,
+    type=click.IntRange(min=0),
+    help="Retries of a request answered with 429/5xx or timing out before the command fails",
+)
 def export(
     output: str,
     quiet: bool,
@@ -73,6 +116,8 @@ def export(
     pretty: bool,
     enforce_rate_limit: bool,
     rate_limit: int,
+    concurrency: int,
+    max_retries: int,
 ) -> None:
     """Export all active raindrops to JSON.
 
@@ -85,10 +130,8 @@ def export(
         click.echo("Missing RAINDROP_TOKEN in environment", err=True)
         sys.exit(2)
 
-    client = RaindropClient(
-        token=token,
-        enforce_rate_limit=enforce_rate_limit,
-        rate_limit_per_min=rate_limit,
+    client = _make_client(
+        token, enforce_rate_limit, rate_limit, concurrency, max_retries
     )
 
     # Configure logging based on flags
@@ -117,18 +160,21 @@ def export(
     client.on_request = on_request
 
     try:
-        collections = client.list_collections()
-        # The Raindrop 'Unsorted' collection uses id -1 and is not always
-        # returned by the /collections endpoint. Ensure we always fetch it
-        # so users don't miss those raindrops.
-        try:
-            has_unsorted = any((c.get("_id") == -1 or c.get("id") == -1) for c in collections)
-        except Exception:
-            has_unsorted = False
-        if not has_unsorted:
-            collections.append({"_id": -1})
         all_items = []
-        start = None
+        collections: list = []
+
+        def _with_unsorted(items: list) -> list:
+            # The Raindrop 'Unsorted' collection uses id -1 and is not always
+            # returned by the /collections endpoint. Ensure we always fetch it
+            # so users don't miss those raindrops.
+            try:
+                has_unsorted = any((c.get("_id") == -1 or c.get("id") == -1) for c in items)
+            except Exception:
+                has_unsorted = False
+            if not has_unsorted:
+                items.append({"_id": -1})
+            return items
+
         try:
             from rich.progress import (
                 Progress,
@@ -145,28 +191,31 @@ def export(
         import time
 
         start = time.time()
+        progress = None
         if use_rich and not quiet:
-            with Progress(
+            progress = Progress(
                 SpinnerColumn(),
                 TextColumn("{task.description}"),
                 BarColumn(),
                 TimeElapsedColumn(),
-            ) as progress:
-                task = progress.add_task("Fetching collections and raindrops", total=len(collections) or None)
+            )
+
+        with progress if progress is not None else nullcontext():
+            if isinstance(client, AsyncRaindropClient):
+                collections = asyncio.run(_export_concurrently(client, _with_unsorted, all_items, progress))
+            else:
+                collections = _with_unsorted(client.list_collections())
+                task = None
+                if progress is not None:
+                    task = progress.add_task("Fetching collections and raindrops", total=len(collections) or None)
                 for c in collections:
                     cid = c.get("_id") or c.get("id")
                     if cid is None:
                         continue
                     for item in client.list_raindrops(int(cid)):
                         all_items.append(item)
-                    progress.advance(task)
-        else:
-            for c in collections:
-                cid = c.get("_id") or c.get("id")
-                if cid is None:
-                    continue
-                for item in client.list_raindrops(int(cid)):
-                    all_items.append(item)
+                    if task is not None:
+                        progress.advance(task)
 
         elapsed = time.time() - start if start is not None else 0.0
 
@@ -193,12 +242,39 @@ def export(
             click.echo(f"Requests made: {requests_made}; Retries: {len(retries)}; Elapsed: {elapsed:.2f}s")
 
     finally:
-        client.close()
+        if not isinstance(client, AsyncRaindropClient):
+            client.close()
+
+
+async def _export_concurrently(client, with_unsorted, all_items: list, progress) -> list:
+    """Fetch every collection through an `AsyncRaindropClient`.
+
+    Items are appended to `all_items` per collection; returns the collection list.
+    """
+    try:
+        collections = with_unsorted(list(await client.list_collections()))
+        task = None
+        if progress is not None:
+            task = progress.add_task("Fetching collections and raindrops", total=len(collections) or None)
+
+        async def _worker(c: dict) -> None:
+            cid = int(c.get("_id") or c.get("id"))
+            items = [item async for item in client.list_raindrops(cid, count=c.get("count"))]
+            all_items.extend(items)
+            if task is not None:
+                progress.advance(task)
+
+        await client.map_collections(
+            [c for c in collections if (c.get("_id") or c.get("id")) is not None], _worker
+        )
+        return collections
+    finally:
+        await client.aclose()
 
 
 @click.command()
 @click.option("--db-path", default=None, help="Path to SQLite DB file")
-@click.option("--full-refresh", is_flag=True, help="Perform a full refresh (backup & rebuild)")
+@click.option("--full-refresh", is_flag=True, help="Perform a full refresh (rebuild and swap in, keeping captured content)")
 @click.option("--dry-run", is_flag=True, help="Run without writing to DB")
 @click.option("--json", "as_json", is_flag=True, help="Emit JSON summary to stdout")
 @click.option("--quiet", is_flag=True, help="Suppress non-error output")
@@ -213,6 +289,42 @@ def export(
     default=120,
     help="Requests per minute to honor when enforcing rate-limit",
 )
+@click.option(
+    "--concurrency",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Collections fetched in parallel (>1 uses the async client)",
+)
+@click.option(
+    "--max-retries",
+    default=6,
+    show_default=True,
+    type=click.IntRange(min=0),
+    help="Retries of a request answered with 429/5xx or timing out before the command fails",
+)
+@click.option(
+    "--pipeline/--no-pipeline",
+    default=False,
+    help="Overlap API fetching with SQLite writes (producer/consumer)",
+)
+@click.option(
+    "--queue-size",
+    default=8,
+    type=click.IntRange(min=1),
+    help="Max fetched batches buffered between stages when pipelining",
+)
+@click.option(
+    "--track-changes/--no-track-changes",
+    default=False,
+    help="Apply edits and deletions incrementally (walk by lastUpdate)",
+)
+@click.option(
+    "--db-profile",
+    type=click.Choice(sorted(DB_PROFILES)),
+    default=DEFAULT_DB_PROFILE,
+    show_default=True,
+    help="SQLite durability/speed profile (bulk skips fsync; safe fsyncs every commit)",
+)
 def sync(
     db_path: str,
     full_refresh: bool,
@@ -222,6 +334,12 @@ def sync(
     verbose: bool,
     enforce_rate_limit: bool,
     rate_limit: int,
+    concurrency: int,
+    max_retries: int,
+    pipeline: bool,
+    queue_size: int,
+    track_changes: bool,
+    db_profile: str,
 ) -> None:
     """Synchronize Raindrop archive into a local SQLite database."""
     # .env is loaded at module import (unless running under pytest)
@@ -232,10 +350,8 @@ def sync(
         click.echo("Missing RAINDROP_TOKEN in environment", err=True)
         sys.exit(2)
 
-    client = RaindropClient(
-        token=token,
-        enforce_rate_limit=enforce_rate_limit,
-        rate_limit_per_min=rate_limit,
+    client = _make_client(
+        token, enforce_rate_limit, rate_limit, concurrency, max_retries
     )
     # metrics
     requests_made = 0
@@ -262,6 +378,10 @@ def sync(
 
     dbp = Path(db_path) if db_path else default_db_path()
     orchestrator = Orchestrator(dbp, client)
+    orchestrator.pipeline = pipeline
+    orchestrator.queue_size = queue_size
+    orchestrator.track_changes = track_changes
+    orchestrator.db_profile = db_profile
     try:
         outcome = orchestrator.run(full_refresh=full_refresh, dry_run=dry_run)
     except Exception as e:
@@ -289,13 +409,27 @@ def sync(
                     "db_path": str(outcome.db_path),
                     "requests_made": outcome.requests_count,
                     "retries": outcome.retries_count,
+                    "resumed": getattr(outcome, "resumed", False),
+                    "collections_skipped": getattr(outcome, "collections_skipped", 0),
+                    "updated_links": getattr(outcome, "updated_links", 0),
+                    "deleted_links": getattr(outcome, "deleted_links", 0),
+                    "sleep_seconds": round(getattr(outcome, "sleep_seconds", 0.0), 3),
+                    "stage_seconds": {
+                        "fetch": round(getattr(outcome, "fetch_seconds", 0.0), 3),
+                        "write": round(getattr(outcome, "write_seconds", 0.0), 3),
+                        "fetch_blocked": round(getattr(outcome, "fetch_blocked_seconds", 0.0), 3),
+                        "write_wait": round(getattr(outcome, "write_wait_seconds", 0.0), 3),
+                    },
                 }
             )
         )
     else:
         if not quiet:
             click.echo(f"Synced {outcome.total_links} total links (+{outcome.new_links} new)")
-            click.echo(f"Requests made: {outcome.requests_count}; Retries: {outcome.retries_count}")
+            click.echo(
+                f"Requests made: {outcome.requests_count}; Retries: {outcome.retries_count}; "
+                f"Slept: {getattr(outcome, 'sleep_seconds', 0.0):.2f}s"
+            )
 
 
 @click.command()
@@ -307,6 +441,127 @@ def sync(
 @click.option("--timeout", default=10.0, type=float, help="Per-link fetch timeout (s)")
 @click.option("--quiet", is_flag=True, help="Suppress non-error output")
 @click.option("--verbose", is_flag=True, help="Verbose output")
+@click.option(
+    "--db-profile",
+    type=click.Choice(sorted(DB_PROFILES)),
+    default=DEFAULT_DB_PROFILE,
+    show_default=True,
+    help="SQLite durability/speed profile (bulk skips fsync; safe fsyncs every commit)",
+)
+@click.option(
+    "--compression",
+    type=click.Choice(COMPRESSION_METHODS),
+    default=DEFAULT_COMPRESSION,
+    show_default=True,
+    help="Codec for stored content (auto: zstd when installed, else zlib)",
+)
+@click.option(
+    "--batch-size",
+    default=50,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Captured links written per transaction",
+)
+@click.option(
+    "--flush-seconds",
+    default=5.0,
+    show_default=True,
+    type=float,
+    help="Write captured content at least this often",
+)
+@click.option(
+    "--concurrency",
+    default=8,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Links fetched in parallel",
+)
+@click.option(
+    "--per-host",
+    default=2,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Parallel fetches allowed to one host",
+)
+@click.option(
+    "--host-delay",
+    default=1.0,
+    show_default=True,
+    type=click.FloatRange(min=0),
+    help="Minimum seconds between fetch starts to one host",
+)
+@click.option(
+    "--extract-workers",
+    default=0,
+    show_default=True,
+    type=click.IntRange(min=0),
+    help="Processes extracting downloaded HTML (0 extracts in the download threads)",
+)
+@click.option(
+    "--html-cache/--no-html-cache",
+    default=False,
+    help="Keep downloaded HTML on disk for later --reextract",
+)
+@click.option(
+    "--html-cache-dir",
+    default=None,
+    help="HTML cache directory (default: html-cache/ next to the DB)",
+)
+@click.option(
+    "--html-cache-mb",
+    default=1024,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="HTML cache size limit; least recently used pages are evicted",
+)
+@click.option(
+    "--reextract",
+    is_flag=True,
+    help="Re-run extraction for all links from the HTML cache, without downloading",
+)
+@click.option(
+    "--stale",
+    is_flag=True,
+    help="Recapture captured links, stalest first (age, change history, failures)",
+)
+@click.option(
+    "--min-age-days",
+    default=1.0,
+    show_default=True,
+    type=click.FloatRange(min=0),
+    help="With --stale, skip links checked more recently than this",
+)
+@click.option(
+    "--max-seconds",
+    default=None,
+    type=click.FloatRange(min=0),
+    help="Time budget: stop starting new links after this many seconds",
+)
+@click.option(
+    "--retry-failed",
+    is_flag=True,
+    help="Also retry links that are backing off after failures or quarantined",
+)
+@click.option(
+    "--circuit-failures",
+    default=5,
+    show_default=True,
+    type=click.IntRange(min=0),
+    help="Skip a host's remaining links after this many consecutive failures (0 disables)",
+)
+@click.option(
+    "--adaptive-timeout/--no-adaptive-timeout",
+    default=True,
+    show_default=True,
+    help="Shorten a host's timeout to a multiple of its observed p95 latency",
+)
+@click.option(
+    "--max-download-mb",
+    default=10,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Skip pages larger than this; downloads stop at the limit",
+)
 def capture_content(
     db_path: str,
     limit: int,
@@ -316,10 +571,30 @@ def capture_content(
     timeout: float,
     quiet: bool,
     verbose: bool,
+    db_profile: str,
+    compression: str,
+    batch_size: int,
+    flush_seconds: float,
+    concurrency: int,
+    per_host: int,
+    host_delay: float,
+    extract_workers: int,
+    html_cache: bool,
+    html_cache_dir: Optional[str],
+    html_cache_mb: int,
+    reextract: bool,
+    stale: bool,
+    min_age_days: float,
+    max_seconds: Optional[float],
+    retry_failed: bool,
+    circuit_failures: int,
+    adaptive_timeout: bool,
+    max_download_mb: int,
 ):
     """Capture Markdown content for saved links using Trafilatura.
 
-    Dry-run by default; will be wired to the full runner once implemented.
+    Fetches up to 8 links at once by default (--concurrency), at most 2 per
+    host (--per-host) and 1 second apart (--host-delay).
     """
     from .content.capture_runner import CaptureRunner
 
@@ -327,6 +602,7 @@ def capture_content(
     from .storage.sqlite_store import SQLiteStore
     from .sync.orchestrator import default_db_path
     from .content.fetcher import TrafilaturaFetcher
+    from .content.html_cache import HtmlCache, default_cache_dir
 
     if quiet:
         logging.basicConfig(level=logging.WARNING)
@@ -336,13 +612,53 @@ def capture_content(
         logging.basicConfig(level=logging.INFO)
 
     dbp = Path(db_path) if db_path else default_db_path()
-    store = SQLiteStore(dbp)
+    try:
+        store = SQLiteStore(dbp, profile=db_profile, compression=compression)
+    except ValueError as exc:
+        raise click.BadParameter(str(exc), param_hint="--compression")
     store.connect()
 
-    fetcher = TrafilaturaFetcher(timeout=timeout)
-    runner = CaptureRunner(store=store, fetcher=fetcher)
+    cache = None
+    if html_cache or reextract:
+        cache_dir = Path(html_cache_dir) if html_cache_dir else default_cache_dir(dbp)
+        cache = HtmlCache(cache_dir, max_bytes=html_cache_mb * 1024 * 1024)
+
+    fetcher = TrafilaturaFetcher(
+        timeout=timeout, max_bytes=max_download_mb * 1024 * 1024
+    )
+    runner = CaptureRunner(
+        store=store,
+        fetcher=fetcher,
+        batch_size=batch_size,
+        flush_seconds=flush_seconds,
+        concurrency=concurrency,
+        per_host=per_host,
+        host_delay=host_delay,
+        extract_workers=extract_workers,
+        html_cache=cache,
+        circuit_failures=circuit_failures,
+        adaptive_timeouts=adaptive_timeout,
+    )
+
+    try:
+        summary = runner.run(
+            limit=limit,
+            dry_run=dry_run,
+            refresh=refresh,
+            reextract=reextract,
+            stale=stale,
+            min_age_days=min_age_days,
+            time_budget=max_seconds,
+            retry_failed=retry_failed,
+        )
+    finally:
+        if cache is not None:
+            cache.close()
 
-    summary = runner.run(limit=limit, dry_run=dry_run, refresh=refresh)
+    if not dry_run:
+        store.prune_capture_attempts()
+    waiting, quarantined = store.capture_backoff_counts()
+    tripped = getattr(summary, "tripped_hosts", []) or []
 
     attempts = getattr(summary, "attempts", []) or []
     succeeded = sum(1 for a in attempts if a.status == "success")
@@ -352,6 +668,18 @@ def capture_content(
         click.echo(f"Processed: {processed} links (dry_run={dry_run})")
         for a in attempts[:20]:
             click.echo(f" - [{a.status}] {a.url}")
+        if getattr(summary, "budget_exhausted", False):
+            click.echo("Time budget reached; remaining links are left for the next run")
+        if (waiting or quarantined) and not retry_failed:
+            click.echo(
+                f"{waiting} links waiting for retry, {quarantined} quarantined "
+                "(use --retry-failed to include them)"
+            )
+        for h in tripped:
+            click.echo(
+                f"Circuit opened for {h.host} after {h.failures} failures: "
+                f"skipped {h.skipped} links, saving ~{h.seconds_saved:.0f}s"
+            )
     else:
         import json
 
@@ -361,7 +689,10 @@ def capture_content(
                     "session": {
                         "started_at": summary.started_at.isoformat(),
                         "completed_at": summary.completed_at.isoformat() if summary.completed_at else None,
+                        "budget_exhausted": getattr(summary, "budget_exhausted", False),
                     },
+                    "backoff": {"waiting": waiting, "quarantined": quarantined},
+                    "tripped_hosts": [h.__dict__ for h in tripped],
                     "attempts": [a.__dict__ for a in attempts],
                 }
             )
@@ -384,6 +715,13 @@ def capture_content(
     is_flag=True,
     help="Exit non-zero if any individual link generation failed",
 )
+@click.option(
+    "--db-profile",
+    type=click.Choice(sorted(DB_PROFILES)),
+    default=DEFAULT_DB_PROFILE,
+    show_default=True,
+    help="SQLite durability/speed profile (bulk skips fsync; safe fsyncs every commit)",
+)
 def tags_generate(
     db_path: str,
     limit: int,
@@ -392,6 +730,7 @@ def tags_generate(
     quiet: bool,
     verbose: bool,
     fail_on_error: bool,
+    db_profile: str,
 ):
     """Generate auto-tags for untagged links"""
     from .sync.orchestrator import default_db_path
@@ -415,7 +754,7 @@ def tags_generate(
     )
 
     dbp = Path(db_path) if db_path else default_db_path()
-    store = SQLiteStore(dbp)
+    store = SQLiteStore(dbp, profile=db_profile)
     store.connect()
 
     # prepare predictor: try to configure DSPy, otherwise use a deterministic fake
@@ -439,17 +778,24 @@ def tags_generate(
 
     runner = TagGenerationRunner(predictor, model_name=model_name, batch_size=5)
 
-    items = store.fetch_untagged_links(limit=limit)
-    logger.debug("Fetched %s untagged links from DB", len(items))
+    # Stream untagged links page by page; results are persisted per chunk so
+    # neither markdown bodies nor results accumulate over the whole archive.
+    items = store.iter_untagged_links(limit=limit)
+    total = store.count_untagged_links()
+    if limit:
+        total = min(total, limit)
+    logger.debug("Streaming %s untagged links from DB", total)
 
     # Prepare progress reporting and result collection
-    total = len(items)
-    collected: list[dict] = []
+    pending: list[dict] = []
+    samples: list[dict] = []
     counters = {"processed": 0, "generated": 0, "failed": 0}
 
     def _on_result(entry: dict) -> None:
         # entry: {"raindrop_id", "tags_json", "meta_json"}
-        collected.append(entry)
+        pending.append(entry)
+        if len(samples) < 10:
+            samples.append(entry)
         counters["processed"] += 1
         if entry.get("tags_json") and entry.get("tags_json") != "[]":
             counters["generated"] += 1
@@ -483,19 +829,10 @@ def tags_generate(
                 _on_result(e)
                 progress.update(task, advance=1)
 
-            runner.run_batch(items, on_result=on_result_with_advance)
+            _tag_in_chunks(runner, store, items, on_result_with_advance, pending, dry_run)
     else:
         # No rich available or quiet requested: run without progress
-        runner.run_batch(items, on_result=_on_result)
-
-    # Persist if not dry-run
-    if not dry_run and collected:
-        tuples = [(c["raindrop_id"], c["tags_json"], c["meta_json"]) for c in collected]
-        try:
-            store.write_auto_tags_batch(tuples)
-        except Exception as exc:
-            click.echo(f"Failed to persist auto-tags: {exc}", err=True)
-            raise SystemExit(3)
+        _tag_in_chunks(runner, store, items, _on_result, pending, dry_run)
 
     summary = {
         "processed": counters["processed"],
@@ -520,9 +857,9 @@ def tags_generate(
         )
         click.echo(f"Model: {summary['model']} DB: {summary['db']}")
         # show up to 10 sample items
-        if collected:
+        if samples:
             click.echo("Sample results:")
-            for c in collected[:10]:
+            for c in samples:
                 tags = c.get("tags_json") or "[]"
                 click.echo(f" - [{c['raindrop_id']}] tags={tags}")
 
@@ -530,6 +867,171 @@ def tags_generate(
         raise SystemExit(4)
 
 
+def _tag_in_chunks(
+    runner, store, items, on_result, pending: list, dry_run: bool, chunk_size: int = 100
+) -> None:
+    """Run `runner` over `items` chunk by chunk, persisting each chunk's results.
+
+    `on_result` appends to `pending`, which is written (unless dry-run) and
+    cleared after every chunk. Exits with code 3 when persisting fails.
+    """
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, chunk_size))
+        if not chunk:
+            break
+        runner.run_batch(chunk, on_result=on_result)
+        if not dry_run and pending:
+            tuples = [(c["raindrop_id"], c["tags_json"], c["meta_json"]) for c in pending]
+            try:
+                store.write_auto_tags_batch(tuples)
+            except Exception as exc:
+                click.echo(f"Failed to persist auto-tags: {exc}", err=True)
+                raise SystemExit(3)
+        pending.clear()
+
+
+@click.command()
+@click.option("--db-path", default=None, help="Path to SQLite DB file")
+@click.option(
+    "--compression",
+    type=click.Choice(COMPRESSION_METHODS),
+    default="auto",
+    show_default=True,
+    help="Target codec for stored content (none decompresses everything)",
+)
+@click.option(
+    "--train-dict/--no-train-dict",
+    default=True,
+    show_default=True,
+    help="Train a dictionary from the stored content before recompressing",
+)
+@click.option("--vacuum", is_flag=True, help="VACUUM afterwards to shrink the DB file")
+@click.option("--json", "as_json", is_flag=True, help="Emit JSON summary to stdout")
+@click.option("--quiet", is_flag=True, help="Suppress non-error output")
+@click.option("--verbose", is_flag=True, help="Verbose output")
+@click.option(
+    "--db-profile",
+    type=click.Choice(sorted(DB_PROFILES)),
+    default=DEFAULT_DB_PROFILE,
+    show_default=True,
+    help="SQLite durability/speed profile (bulk skips fsync; safe fsyncs every commit)",
+)
+def recompress(
+    db_path: str,
+    compression: str,
+    train_dict: bool,
+    vacuum: bool,
+    as_json: bool,
+    quiet: bool,
+    verbose: bool,
+    db_profile: str,
+):
+    """Recompress captured content in an existing DB."""
+    from .storage.sqlite_store import SQLiteStore
+    from .sync.orchestrator import default_db_path
+
+    _configure_logging(quiet, verbose)
+
+    dbp = Path(db_path) if db_path else default_db_path()
+    try:
+        store = SQLiteStore(dbp, profile=db_profile, compression=compression)
+    except ValueError as exc:
+        raise click.BadParameter(str(exc), param_hint="--compression")
+    store.connect()
+    try:
+        dict_id = store.train_content_dictionary() if train_dict else None
+        stats = store.recompress_content()
+        if vacuum:
+            store.vacuum()
+    finally:
+        store.close()
+
+    before, after = stats["bytes_before"], stats["bytes_after"]
+    ratio = (before / after) if after else 1.0
+    if as_json:
+        import json
+
+        print(
+            json.dumps(
+                {
+                    "compression": store.compression,
+                    "dictionary_id": dict_id,
+                    **stats,
+                    "ratio": round(ratio, 3),
+                }
+            )
+        )
+    elif not quiet:
+        click.echo(
+            f"Recompressed {stats['rewritten']} of {stats['rows']} documents "
+            f"with {store.compression}: {before} -> {after} bytes ({ratio:.2f}x)"
+        )
+
+
+@click.command()
+@click.argument("query")
+@click.option("--db-path", default=None, help="Path to SQLite DB file")
+@click.option(
+    "--limit",
+    default=20,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Maximum results",
+)
+@click.option("--json", "as_json", is_flag=True, help="Emit JSON results to stdout")
+@click.option("--quiet", is_flag=True, help="Suppress non-error output")
+@click.option("--verbose", is_flag=True, help="Verbose output")
+@click.option(
+    "--db-profile",
+    type=click.Choice(sorted(DB_PROFILES)),
+    default=DEFAULT_DB_PROFILE,
+    show_default=True,
+    help="SQLite durability/speed profile (bulk skips fsync; safe fsyncs every commit)",
+)
+def search(
+    query: str,
+    db_path: str,
+    limit: int,
+    as_json: bool,
+    quiet: bool,
+    verbose: bool,
+    db_profile: str,
+):
+    """Full-text search over titles, URLs, tags and captured content.
+
+    QUERY accepts FTS5 syntax: "exact phrase", OR, NOT, prefix*, title:word.
+    """
+    from .storage.sqlite_store import SQLiteStore
+    from .sync.orchestrator import default_db_path
+
+    _configure_logging(quiet, verbose)
+
+    dbp = Path(db_path) if db_path else default_db_path()
+    store = SQLiteStore(dbp, profile=db_profile)
+    store.connect()
+    try:
+        hits = store.search(query, limit=limit)
+    finally:
+        store.close()
+
+    if as_json:
+        import json
+        from dataclasses import asdict
+
+        print(json.dumps({"query": query, "results": [asdict(h) for h in hits]}))
+        return
+
+    if not hits:
+        click.echo("No matches")
+        return
+    for i, h in enumerate(hits, start=1):
+        click.echo(f"{i}. {h.title} ({h.score:.2f})")
+        click.echo(f"   {h.url}")
+        if h.snippet:
+            click.echo(f"   {' '.join(h.snippet.split())}")
+
+
 @click.group()
 def cli():
     """Unified CLI entrypoint for raindrop-enhancer."""
@@ -542,6 +1044,8 @@ for cmd, name in [
     (sync, "sync"),
     (capture_content, "capture"),
     (tags_generate, "tag"),
+    (recompress, "recompress"),
+    (search, "search"),
 ]:
     try:
         cli.add_command(cmd, name=name)
@@ -2,11 +2,22 @@ from __future__ import annotations
 
 import dataclasses
 import datetime
+import hashlib
+import inspect
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import timezone
-from typing import Iterable, List, Optional
+from typing import Callable, List, Optional
 
+from raindrop_enhancer.models import ContentValidators, LinkCaptureAttempt
 from raindrop_enhancer.storage.sqlite_store import SQLiteStore
-from .fetcher import TrafilaturaFetcher, FetchResult
+from .fetcher import SKIP_ERRORS, TrafilaturaFetcher, FetchResult, extract_markdown
+from .host_health import HostHealth, TrippedHost
+from .host_limiter import HostLimiter, host_of
+from .html_cache import HtmlCache
 from .youtube_extractor import is_youtube_url, extract_metadata
 
 
@@ -17,8 +28,10 @@ class LinkAttemptSummary:
     Fields mirror the information useful for CLI output and tests.
     - link_id: internal DB id for the raindrop link row
     - url: the original link URL
-    - status: one of 'skipped', 'success', or 'failed'
-    - retry_count: reserved for future retry/backoff metrics
+    - status: one of 'skipped', 'success', 'unchanged' (refresh found the
+      page as captured), or 'failed'
+    - retry_count: failed attempts at this link in earlier runs (as logged
+      in capture_attempts); filled in when the attempt is recorded
     - error_type/error_message: textual error details on failure
     """
 
@@ -36,39 +49,155 @@ class SessionSummary:
 
     - started_at/completed_at: timezone-aware UTC datetimes
     - attempts: list of LinkAttemptSummary entries in processed order
+    - budget_exhausted: True when the time budget stopped the run early
+    - tripped_hosts: hosts whose circuit opened, with the links skipped
     """
 
     started_at: datetime.datetime
     completed_at: Optional[datetime.datetime] = None
     attempts: List[LinkAttemptSummary] = dataclasses.field(default_factory=list)
+    budget_exhausted: bool = False
+    tripped_hosts: List[TrippedHost] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass
+class _Outcome:
+    """What a worker hands back to the recording (calling) thread."""
+
+    markdown: Optional[str]
+    source: str
+    error: Optional[str] = None
+    validators: Optional[ContentValidators] = None
+    unchanged: bool = False
+    skipped: bool = False
+    # seconds spent fetching and extracting, excluding waits for a slot
+    duration: Optional[float] = None
+
+
+# error_type of links skipped because their host's circuit is open
+CIRCUIT_OPEN = "circuit_open"
+
+
+def _accepts_timeout(fn) -> bool:
+    try:
+        return "timeout" in inspect.signature(fn).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def _body_hash(html: str) -> str:
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
 
 
 class CaptureRunner:
     """Coordinates fetching content for a set of links and persists results.
 
     Responsibilities and behavior:
-    - Selects the set of links to process using `store.select_uncaptured` or
-      `store.select_all_links` when `refresh=True`.
+    - Streams the links to process from `store.iter_uncaptured` or
+      `store.iter_all_links` when `refresh=True`, one keyset page at a time,
+      so memory stays flat regardless of archive size.
     - Honors `dry_run=True` by not modifying the DB and recording `skipped`
       attempts for visibility.
-    - When `refresh=True`, clears existing content for the link before
-      attempting a new fetch (via `store.clear_content_for_link`).
-    - Uses `TrafilaturaFetcher.fetch` and writes successful markdown to the
-      DB through `store.update_content`.
+    - Uses `TrafilaturaFetcher.fetch` and buffers successful markdown,
+      flushing it through `store.update_content_batch` (one transaction)
+      every `batch_size` links or `flush_seconds`, whichever comes first, and
+      when the run ends or is interrupted. A crash loses at most the
+      unflushed batch, whose links stay uncaptured for the next run.
+    - When `refresh=True`, existing content is replaced only once new
+      content is in hand; a failed re-fetch keeps the previous capture.
+      Pages captured with an ETag / Last-Modified are revalidated with a
+      conditional GET; a 304, or a body whose hash matches the stored one,
+      only records the check ('unchanged') and skips extraction.
+    - `stale=True` recaptures already captured links in order of
+      `store.iter_stale_links` (age since the last check, observed change
+      rate, failed recaptures), so a fixed budget (`limit` links and/or
+      `time_budget` seconds) keeps a large archive reasonably fresh.
+    - Every attempt is logged to `capture_attempts` with its duration.
+      Links that fail are retried only after an exponentially growing
+      backoff and eventually quarantined, so repeat runs do not spend their
+      time on dead links.
+    - Within a session, `circuit_failures` consecutive failures from one
+      host (timeouts, connection errors, 5xx) open its circuit: its
+      remaining links are skipped. With `adaptive_timeouts`, a host's
+      timeout shrinks to a multiple of its observed p95 latency once it
+      has answered a few requests (see `HostHealth`).
+    - Up to `concurrency` fetches run at once on worker threads, at most
+      `per_host` at a time per host and `host_delay` seconds apart. Results
+      are consumed (and persisted) in link order; only the calling thread
+      touches the store.
+    - With `extract_workers > 0` and a fetcher offering `download`, worker
+      threads only download; HTML is handed to a pool of that many extractor
+      processes, so parsing uses all cores while downloads keep going. The
+      window of links in flight bounds how much HTML waits for extraction.
+    - With an `html_cache`, every downloaded page is kept on disk, and
+      `run(reextract=True)` re-runs extraction over all links from the cache
+      alone, without network access; links with no cached page are skipped.
+    - Links whose download was abandoned for its content type or size
+      (`fetcher.SKIP_ERRORS`) are recorded as skipped with that reason.
 
     Notes / extension points:
-    - Retries, concurrency, and rate-limiting are intentionally not part of
-      the MVP; these can be added here (or delegated to the fetcher) later.
+    - A failed link is not retried within the session. Failures are logged
+      and back the link off across runs (see
+      `SQLiteStore.record_capture_attempts`); `run(retry_failed=True)`
+      retries them early.
     - The runner intentionally returns a plain data structure (SessionSummary)
       to keep CLI and higher-level orchestration logic easy to test.
     """
 
-    def __init__(self, store: SQLiteStore, fetcher: TrafilaturaFetcher):
+    def __init__(
+        self,
+        store: SQLiteStore,
+        fetcher: TrafilaturaFetcher,
+        *,
+        batch_size: int = 50,
+        flush_seconds: float = 5.0,
+        concurrency: int = 1,
+        per_host: int = 2,
+        host_delay: float = 0.0,
+        extract_workers: int = 0,
+        html_cache: Optional[HtmlCache] = None,
+        circuit_failures: int = 5,
+        adaptive_timeouts: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ):
         self.store = store
         self.fetcher = fetcher
+        self.batch_size = max(1, int(batch_size))
+        self.flush_seconds = flush_seconds
+        self.concurrency = max(1, int(concurrency))
+        self.hosts = HostLimiter(per_host, host_delay)
+        # Global cap on fetches in flight. Workers waiting for a busy host
+        # do not hold one, so the pool is larger than the cap.
+        self._fetch_slots = threading.BoundedSemaphore(self.concurrency)
+        self.extract_workers = max(0, int(extract_workers))
+        # Started by the first extraction of a session that uses it.
+        self._extractors: Optional[Executor] = None
+        self._extractors_lock = threading.Lock()
+        self._pool_extraction = False
+        self.html_cache = html_cache
+        self.circuit_failures = max(0, int(circuit_failures))
+        # Per-call timeouts are only passed to fetchers that take them.
+        download = getattr(fetcher, "download", None)
+        self._download_timeout = download is not None and _accepts_timeout(download)
+        self._fetch_timeout = _accepts_timeout(getattr(fetcher, "fetch", None))
+        self._base_timeout = (
+            getattr(fetcher, "timeout", None)
+            if adaptive_timeouts and (self._download_timeout or self._fetch_timeout)
+            else None
+        )
+        self.health = HostHealth(self.circuit_failures, self._base_timeout)
+        self._clock = clock
 
     def run(
-        self, limit: Optional[int] = None, dry_run: bool = True, refresh: bool = False
+        self,
+        limit: Optional[int] = None,
+        dry_run: bool = True,
+        refresh: bool = False,
+        reextract: bool = False,
+        stale: bool = False,
+        min_age_days: float = 1.0,
+        time_budget: Optional[float] = None,
+        retry_failed: bool = False,
     ) -> SessionSummary:
         """Run a single capture session.
 
@@ -76,90 +205,336 @@ class CaptureRunner:
         - limit: optional maximum number of links to process
         - dry_run: if True, do not write changes to the DB; produce 'skipped'
           attempt entries for each considered link.
-        - refresh: if True, process all links (not only uncaptured), and
-          clear existing content before fetching.
+        - refresh: if True, process all links (not only uncaptured),
+          replacing existing content when the new fetch succeeds.
+        - reextract: like refresh, but extract from the HTML cache instead
+          of downloading (requires `html_cache`).
+        - stale: recapture captured links, stalest first, skipping those
+          checked within `min_age_days`.
+        - time_budget: stop starting new links after this many seconds;
+          links already in flight are still recorded.
+        - retry_failed: also capture links waiting out a failure backoff or
+          quarantined (see `SQLiteStore.record_capture_attempts`).
 
         Returns a SessionSummary describing timing and per-link outcomes.
         """
+        if reextract and self.html_cache is None:
+            raise ValueError("reextract requires an HTML cache")
         started = datetime.datetime.now(timezone.utc)
         attempts: List[LinkAttemptSummary] = []
 
         # Choose which links to process. Use `refresh` to re-fetch existing
         # captures (useful for backfilling or refreshing stale content).
-        if refresh:
-            links = self.store.select_all_links(limit=limit)
+        if reextract:
+            links = self.store.iter_all_links(limit=limit)
+        elif stale:
+            links = self.store.iter_stale_links(
+                limit=limit, min_age_days=min_age_days, include_backoff=retry_failed
+            )
+        elif refresh:
+            links = self.store.iter_refresh_links(limit=limit)
         else:
-            links = self.store.select_uncaptured(limit=limit)
+            links = self.store.iter_uncaptured(limit=limit, include_backoff=retry_failed)
+
+        # (raindrop_id, markdown, source, validators) captured but not yet
+        # written, and (raindrop_id, validators) found unchanged
+        pending: List[tuple] = []
+        unchanged: List[tuple] = []
+        # every recorded attempt with its summary entry, for the
+        # capture_attempts log and backoff
+        logged: List[tuple] = []
+        last_flush = self._clock()
+
+        def flush() -> None:
+            nonlocal last_flush
+            if pending:
+                self.store.update_content_batch(pending)
+                pending.clear()
+            if unchanged:
+                self.store.mark_unchanged_batch(unchanged)
+                unchanged.clear()
+            if logged:
+                retries = self.store.record_capture_attempts(a for a, _ in logged)
+                for (_, summary), count in zip(logged, retries):
+                    summary.retry_count = count
+                logged.clear()
+            last_flush = self._clock()
 
-        for link in links:
-            # Link rows are returned as simple tuples (id, url, ...). We keep
-            # this logic minimal here and let the storage layer govern shapes.
-            if dry_run:
-                # Do not mutate DB on dry runs; record intention instead.
+        def record(link: tuple, future) -> None:
+            if future is None:
+                # reextract: nothing cached for this link
+                outcome = _Outcome(None, "trafilatura", "not_cached", skipped=True)
+            else:
+                try:
+                    outcome = future.result()
+                except Exception as exc:
+                    # record the link as failed rather than end the run
+                    outcome = _Outcome(
+                        None, "trafilatura", str(exc) or type(exc).__name__
+                    )
+            error = outcome.error
+            if outcome.skipped:
+                status = "skipped"
+            elif outcome.unchanged:
+                status = "unchanged"
+                unchanged.append((link[0], outcome.validators))
+            elif outcome.markdown:
+                status = "success"
+                pending.append(
+                    (link[0], outcome.markdown, outcome.source, outcome.validators)
+                )
+            else:
+                status = "failed"
+            # On failure, keep the error text for debugging and CLI output.
+            summary = LinkAttemptSummary(
+                link_id=link[0],
+                url=link[1],
+                status=status,
+                error_type=error,
+                error_message=error if status == "failed" else None,
+            )
+            attempts.append(summary)
+            logged.append(
+                (
+                    LinkCaptureAttempt(
+                        link_id=link[0],
+                        attempted_at=datetime.datetime.now(timezone.utc),
+                        status=status,
+                        error_type=error,
+                        duration_ms=(
+                            round(outcome.duration * 1000)
+                            if outcome.duration is not None
+                            else None
+                        ),
+                    ),
+                    summary,
+                )
+            )
+            if (
+                len(logged) >= self.batch_size
+                or self._clock() - last_flush >= self.flush_seconds
+            ):
+                flush()
+
+        if dry_run:
+            # Do not mutate DB on dry runs; record intention instead.
+            for link in links:
                 attempts.append(
                     LinkAttemptSummary(link_id=link[0], url=link[1], status="skipped")
                 )
-                continue
-
-            if refresh:
-                # Clear existing content before re-capturing to ensure the
-                # runner writes fresh content regardless of previous state.
-                self.store.clear_content_for_link(link_id=link[0])
-
-            # If URL is a YouTube link, prefer the YouTube extractor which
-            # uses `yt-dlp` to fetch title/description without downloading video.
-            if is_youtube_url(link[1]):
-                meta = extract_metadata(link[1], timeout=30.0)
-                if meta.get("title") or meta.get("description"):
-                    # Format as Markdown per data-model: '# {title}\n\n{description}'
-                    title = meta.get("title") or ""
-                    desc = meta.get("description") or ""
-                    markdown = f"# {title}\n\n{desc}".strip()
-                    self.store.update_content(
-                        link_id=link[0], markdown=markdown, source="yt-dlp"
-                    )
-                    attempts.append(
-                        LinkAttemptSummary(
-                            link_id=link[0], url=link[1], status="success"
-                        )
-                    )
-                else:
-                    # Map extractor errors to failed attempt entries with short codes
-                    attempts.append(
-                        LinkAttemptSummary(
-                            link_id=link[0],
-                            url=link[1],
-                            status="failed",
-                            error_type=meta.get("error"),
-                            error_message=meta.get("error"),
-                        )
-                    )
-            else:
-                # Perform the fetch and persist successful results using Trafilatura.
-                result: FetchResult = self.fetcher.fetch(link[1])
-                if result.markdown:
-                    # Persist the captured markdown. The store layer is responsible
-                    # for updating timestamps and source metadata.
-                    self.store.update_content(link_id=link[0], markdown=result.markdown)
-                    attempts.append(
-                        LinkAttemptSummary(
-                            link_id=link[0], url=link[1], status="success"
-                        )
-                    )
+            return SessionSummary(
+                started_at=started,
+                completed_at=datetime.datetime.now(timezone.utc),
+                attempts=attempts,
+            )
+
+        # Submitted fetches in link order; a bounded window keeps fetches
+        # going while earlier (slower) links are still in flight, and one
+        # worker per window entry lets links to other hosts overtake those
+        # waiting on a busy host.
+        window = (self.concurrency + self.extract_workers) * 4
+        inflight: deque = deque()
+        pool = ThreadPoolExecutor(max_workers=window, thread_name_prefix="capture")
+        work = self._reextract if reextract else self._capture_politely
+        self._pool_extraction = bool(
+            self.extract_workers and (reextract or hasattr(self.fetcher, "download"))
+        )
+        # host health is tracked per session
+        self.health = HostHealth(self.circuit_failures, self._base_timeout)
+        deadline = self._clock() + time_budget if time_budget is not None else None
+        budget_exhausted = False
+        try:
+            for link in links:
+                if deadline is not None and self._clock() >= deadline:
+                    budget_exhausted = True
+                    break
+                if reextract and link[1] not in self.html_cache:
+                    inflight.append((link, None))
                 else:
-                    # On failure, keep the error text for debugging and CLI output.
-                    attempts.append(
-                        LinkAttemptSummary(
-                            link_id=link[0],
-                            url=link[1],
-                            status="failed",
-                            error_type=result.error,
-                            error_message=result.error,
-                        )
-                    )
+                    inflight.append((link, pool.submit(work, link)))
+                if len(inflight) >= window:
+                    record(*inflight.popleft())
+            while inflight:
+                record(*inflight.popleft())
+        finally:
+            # On interruption, drop queued fetches; links whose results were
+            # not recorded stay uncaptured for the next run.
+            pool.shutdown(wait=True, cancel_futures=True)
+            self._pool_extraction = False
+            if self._extractors is not None:
+                self._extractors.shutdown(wait=True, cancel_futures=True)
+                self._extractors = None
+            flush()
 
         return SessionSummary(
             started_at=started,
             completed_at=datetime.datetime.now(timezone.utc),
             attempts=attempts,
+            budget_exhausted=budget_exhausted,
+            tripped_hosts=self.health.tripped(),
+        )
+
+    def _capture_politely(self, link: tuple) -> _Outcome:
+        """Worker entry point: `_capture` within the host and global limits.
+
+        The outcome's duration runs from acquiring the slots to the end of
+        extraction, so time spent queued behind politeness limits is not
+        counted.
+        """
+        started: List[float] = []
+        outcome = self._capture_link(link, started)
+        if started:
+            outcome.duration = time.monotonic() - started[0]
+        return outcome
+
+    def _capture_link(self, link: tuple, started: List[float]) -> _Outcome:
+        url = link[1]
+        host = host_of(url)
+        # refresh links carry the stored validators (None when uncaptured)
+        known: Optional[ContentValidators] = link[2] if len(link) > 2 else None
+        download = getattr(self.fetcher, "download", None)
+        if download is None or is_youtube_url(url):
+            outcome = self._request(host, url, started, lambda t: self._capture(url, t))
+            if outcome is None:
+                return self._circuit_open(host)
+            return outcome
+
+        def request(timeout: Optional[float]):
+            kwargs = {}
+            if timeout is not None and self._download_timeout:
+                kwargs["timeout"] = timeout
+            if known:
+                return download(url, known, **kwargs)
+            return download(url, **kwargs)
+
+        # Only the download holds the host and global slots; extraction
+        # (possibly queued on the process pool) does not block downloads.
+        downloaded = self._request(host, url, started, request)
+        if downloaded is None:
+            return self._circuit_open(host)
+        if downloaded.not_modified:
+            # a 304 may refresh the validators; keep the stored ones otherwise
+            fresh = downloaded.validators()
+            return _Outcome(
+                None,
+                "trafilatura",
+                validators=ContentValidators(
+                    etag=fresh.etag or known.etag,
+                    last_modified=fresh.last_modified or known.last_modified,
+                ),
+                unchanged=True,
+            )
+        if downloaded.html is None:
+            return _Outcome(
+                None,
+                "trafilatura",
+                downloaded.error,
+                skipped=getattr(downloaded, "skipped", False),
+            )
+        validators = downloaded.validators(_body_hash(downloaded.html))
+        if self.html_cache is not None:
+            self.html_cache.put(
+                url, downloaded.html, downloaded.status, downloaded.headers
+            )
+        if known and known.body_hash == validators.body_hash:
+            return _Outcome(None, "trafilatura", validators=validators, unchanged=True)
+        return self._extract(downloaded.html, validators)
+
+    def _request(self, host: str, url: str, started: List[float], request):
+        """Run `request(timeout)` within the host and global limits.
+
+        Returns its result, or None when the host's circuit is open (or
+        opens while waiting for a slot). YouTube links bypass host health:
+        yt-dlp failures say little about the host.
+        """
+        health = None if is_youtube_url(url) else self.health
+        cancel = (lambda: health.is_open(host)) if health is not None else None
+        with self.hosts.slot(host, cancel) as acquired:
+            if not acquired:
+                return None
+            with self._fetch_slots:
+                if cancel is not None and cancel():
+                    return None
+                started.append(time.monotonic())
+                if health is None:
+                    return request(None)
+                result = request(health.timeout_for(host))
+                # recorded while the host slot is held, so waiters woken by
+                # its release see a circuit that just opened
+                health.record(
+                    host, getattr(result, "error", None), time.monotonic() - started[0]
+                )
+                return result
+
+    def _circuit_open(self, host: str) -> _Outcome:
+        self.health.skip(host)
+        return _Outcome(None, "trafilatura", CIRCUIT_OPEN, skipped=True)
+
+    def _reextract(self, link: tuple) -> _Outcome:
+        """Worker entry point for `reextract`: extract the cached page."""
+        started = time.monotonic()
+        page = self.html_cache.get(link[1])
+        if page is None:
+            # evicted since the main thread checked
+            return _Outcome(None, "trafilatura", "not_cached", skipped=True)
+        validators = ContentValidators(
+            etag=page.headers.get("etag"),
+            last_modified=page.headers.get("last-modified"),
+            body_hash=page.digest,
+        )
+        outcome = self._extract(page.html, validators)
+        outcome.duration = time.monotonic() - started
+        return outcome
+
+    def _extractor_pool(self) -> Optional[Executor]:
+        """The session's extractor processes, or None to extract in this thread.
+
+        The pool is started on first use, so sessions that never extract
+        (dry runs, all links skipped) do not pay for spawning interpreters.
+        """
+        if not self._pool_extraction:
+            return None
+        with self._extractors_lock:
+            if self._extractors is None:
+                # spawn: forking a process that already runs threads is unsafe
+                self._extractors = ProcessPoolExecutor(
+                    max_workers=self.extract_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._extractors
+
+    def _extract(
+        self, html: str, validators: Optional[ContentValidators] = None
+    ) -> _Outcome:
+        try:
+            extractors = self._extractor_pool()
+            if extractors is None:
+                markdown = extract_markdown(html)
+            else:
+                markdown = extractors.submit(extract_markdown, html).result()
+        except Exception as exc:
+            return _Outcome(None, "trafilatura", str(exc) or type(exc).__name__)
+        return _Outcome(markdown or None, "trafilatura", validators=validators)
+
+    def _capture(self, url: str, timeout: Optional[float] = None) -> _Outcome:
+        """Fetch one link with `fetcher.fetch` (or yt-dlp for YouTube)."""
+        # If URL is a YouTube link, prefer the YouTube extractor which
+        # uses `yt-dlp` to fetch title/description without downloading video.
+        if is_youtube_url(url):
+            meta = extract_metadata(url, timeout=30.0)
+            if meta.get("title") or meta.get("description"):
+                # Format as Markdown per data-model: '# {title}\n\n{description}'
+                title = meta.get("title") or ""
+                desc = meta.get("description") or ""
+                return _Outcome(f"# {title}\n\n{desc}".strip(), "yt-dlp")
+            # Map extractor errors to failed attempt entries with short codes
+            return _Outcome(None, "yt-dlp", meta.get("error"))
+        # Perform the fetch using Trafilatura.
+        if timeout is not None and self._fetch_timeout:
+            result: FetchResult = self.fetcher.fetch(url, timeout=timeout)
+        else:
+            result = self.fetcher.fetch(url)
+        error = getattr(result, "error", None)
+        return _Outcome(
+            result.markdown or None, "trafilatura", error, skipped=error in SKIP_ERRORS
         )
@@ -1,11 +1,34 @@
 from __future__ import annotations
 
+import codecs
 import dataclasses
+import re
+import threading
 import time
 from typing import Optional
 
 import importlib
 
+import httpx
+
+from ..models import ContentValidators
+
+# Sent with every download.
+USER_AGENT = "Mozilla/5.0 (compatible; raindrop-enhancer)"
+
+# Media types handed to extraction; responses without a Content-Type are
+# tried as well.
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+
+# Errors of downloads abandoned because of what the URL points at; the
+# links are skipped rather than failed.
+UNSUPPORTED_TYPE = "unsupported_type"
+TOO_LARGE = "too_large"
+SKIP_ERRORS = (UNSUPPORTED_TYPE, TOO_LARGE)
+
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([A-Za-z0-9_.:-]+)""", re.I)
+
 
 class FetchError(Exception):
     """Domain-level fetch error for fetcher-specific failures.
@@ -23,58 +46,207 @@ class FetchResult:
     - url: the target URL
     - markdown: the extracted markdown string on success (None on failure)
     - error: textual error description when markdown is None
-    - retry_count: number of retries performed (reserved for future use)
     """
 
     url: str
     markdown: Optional[str]
     error: Optional[str]
-    retry_count: int = 0
+
+
+@dataclasses.dataclass
+class DownloadResult:
+    """Raw HTML from the I/O half of a fetch.
+
+    Fields:
+    - url: the target URL
+    - html: the downloaded document (None on failure)
+    - error: textual error description when html is None
+    - status/headers: HTTP status and response headers (lower-cased), when known
+    - not_modified: True when a conditional GET answered 304
+    - skipped: True when the response was abandoned unread (see SKIP_ERRORS)
+    """
+
+    url: str
+    html: Optional[str]
+    error: Optional[str]
+    status: Optional[int] = None
+    headers: dict = dataclasses.field(default_factory=dict)
+    not_modified: bool = False
+    skipped: bool = False
+
+    def validators(self, body_hash: Optional[str] = None) -> ContentValidators:
+        """Validators to store for this response."""
+        return ContentValidators(
+            etag=self.headers.get("etag"),
+            last_modified=self.headers.get("last-modified"),
+            body_hash=body_hash,
+        )
+
+
+def _charset(response: httpx.Response, body: bytes) -> str:
+    """Declared encoding of a response: header, then <meta>, else UTF-8."""
+    declared = response.charset_encoding
+    if not declared:
+        match = _META_CHARSET.search(body[:4096])
+        declared = match.group(1).decode("ascii") if match else None
+    try:
+        return codecs.lookup(declared).name if declared else "utf-8"
+    except LookupError:
+        return "utf-8"
+
+
+def extract_markdown(html: str) -> Optional[str]:
+    """CPU-bound half of a fetch: HTML to markdown via Trafilatura.
+
+    A module-level function so it can be submitted to a process pool.
+    """
+    trafilatura = importlib.import_module("trafilatura")
+    return trafilatura.extract(html, output_format="markdown")
 
 
 class TrafilaturaFetcher:
-    """Thin wrapper around Trafilatura's `fetch_url` + `extract`.
+    """Streaming download through a shared httpx client + Trafilatura's `extract`.
 
     Implementation notes / assumptions:
     - synchronous by design for the MVP which keeps interactions simple and
       easy to test.
     - imports `trafilatura` at call-time so unit tests can monkeypatch
       `sys.modules['trafilatura']` to provide fake behaviour.
-    - passes timeout positionally for compatibility with different
-      trafilatura function signatures (some variants accept timeout
-      as a positional argument).
     - All exceptions are captured and returned as `FetchResult.error` so
       the caller (CaptureRunner) can decide retry/skip semantics.
+    - `download` and `extract_markdown` are the I/O and CPU halves of
+      `fetch`, so callers can run them on threads and processes
+      respectively.
+    - Downloads are streamed so PDFs, archives, videos and huge pages are
+      abandoned after their headers (or at `max_bytes`) instead of being
+      read into memory and handed to extraction.
+    - `download` with stored validators sends a conditional GET; a 304
+      comes back as `not_modified`.
+    - `download` and `fetch` accept a per-call `timeout` overriding
+      `self.timeout` (CaptureRunner adapts it per host).
 
     Extension points:
-    - Add shared HTTP session reuse (e.g., session pooling) to improve perf.
-    - Implement retry/backoff logic here and populate `retry_count`.
+    - Failed fetches are not retried here; CaptureRunner backs failing
+      links off across runs.
     - Add logging hooks for observability on fetch start/finish/error.
     """
 
-    def __init__(self, timeout: float = 10.0):
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        content_types: tuple = HTML_CONTENT_TYPES,
+    ):
         # Per-link timeout in seconds (float)
         self.timeout = timeout
-
-    def fetch(self, url: str) -> FetchResult:
+        # Largest body downloaded; longer responses are abandoned
+        self.max_bytes = max_bytes
+        self.content_types = content_types
+        self._client: Optional[httpx.Client] = None
+        self._client_lock = threading.Lock()
+
+    def _http(self) -> httpx.Client:
+        # httpx clients are thread-safe; share one connection pool.
+        with self._client_lock:
+            if self._client is None:
+                self._client = httpx.Client(
+                    timeout=self.timeout,
+                    follow_redirects=True,
+                    headers={"User-Agent": USER_AGENT},
+                )
+            return self._client
+
+    def download(
+        self,
+        url: str,
+        validators: Optional[ContentValidators] = None,
+        timeout: Optional[float] = None,
+    ) -> DownloadResult:
+        """Download the URL without extracting it; errors map to `error`.
+
+        The response is streamed: its headers are checked before any of the
+        body is read, and the body is read only up to `max_bytes`. Responses
+        that are not HTML-like, or too large, come back `skipped` with error
+        UNSUPPORTED_TYPE or TOO_LARGE. With an ETag or Last-Modified in
+        `validators`, the request is conditional and an unchanged page
+        returns `not_modified=True`.
+        """
+        headers = {}
+        if validators is not None:
+            if validators.etag:
+                headers["If-None-Match"] = validators.etag
+            if validators.last_modified:
+                headers["If-Modified-Since"] = validators.last_modified
+        try:
+            with self._http().stream(
+                "GET",
+                url,
+                headers=headers,
+                timeout=self.timeout if timeout is None else timeout,
+            ) as response:
+                return self._read(url, response)
+        except Exception as exc:
+            # not only httpx.HTTPError: InvalidURL and StreamError are not
+            # subclasses of it, and one bad bookmark must not abort a run
+            return DownloadResult(url=url, html=None, error=str(exc) or type(exc).__name__)
+
+    def _read(self, url: str, response: httpx.Response) -> DownloadResult:
+        status = response.status_code
+        resp_headers = {k.lower(): v for k, v in response.headers.items()}
+
+        def failed(error: str, skipped: bool = False) -> DownloadResult:
+            return DownloadResult(
+                url=url,
+                html=None,
+                error=error,
+                status=status,
+                headers=resp_headers,
+                skipped=skipped,
+            )
+
+        if status == 304:
+            return DownloadResult(
+                url=url,
+                html=None,
+                error=None,
+                status=status,
+                headers=resp_headers,
+                not_modified=True,
+            )
+        if status != 200:
+            return failed(f"http_{status}")
+        media_type = resp_headers.get("content-type", "").split(";")[0].strip().lower()
+        if media_type and media_type not in self.content_types:
+            return failed(UNSUPPORTED_TYPE, skipped=True)
+        length = resp_headers.get("content-length", "")
+        if length.isdigit() and int(length) > self.max_bytes:
+            return failed(TOO_LARGE, skipped=True)
+        body = bytearray()
+        for chunk in response.iter_bytes():
+            body += chunk
+            if len(body) > self.max_bytes:
+                # lying or missing Content-Length: stop reading
+                return failed(TOO_LARGE, skipped=True)
+        if not body:
+            return failed("no_content")
+        html = bytes(body).decode(_charset(response, body), errors="replace")
+        return DownloadResult(
+            url=url, html=html, error=None, status=status, headers=resp_headers
+        )
+
+    def fetch(self, url: str, timeout: Optional[float] = None) -> FetchResult:
         """Fetch the URL and return markdown or an error description.
 
         The function intentionally swallows exceptions and maps them to a
         FetchResult so callers can remain synchronous and decide how to
         treat failures (retry vs skip vs abort).
         """
+        downloaded = self.download(url, timeout=timeout)
+        if downloaded.html is None:
+            return FetchResult(url=url, markdown=None, error=downloaded.error)
         try:
-            # Import trafilatura at call-time so tests can monkeypatch sys.modules prior to invocation.
-            trafilatura = importlib.import_module("trafilatura")
-            # Some implementations accept timeout positionally; pass it positionally for compatibility.
-            downloaded = trafilatura.fetch_url(url, self.timeout)
-            if not downloaded:
-                # Trafilatura may return empty content for pages it cannot parse
-                return FetchResult(
-                    url=url, markdown=None, error="no_content", retry_count=0
-                )
             # Extract markdown; `output_format="markdown"` chosen per spec
-            markdown = trafilatura.extract(downloaded, output_format="markdown")
+            markdown = extract_markdown(downloaded.html)
             return FetchResult(url=url, markdown=markdown, error=None)
         except (
             Exception
@@ -0,0 +1,166 @@
+"""Per-host health tracking for a capture session.
+
+`HostHealth` watches how each host responds while a session runs:
+
+- After `trip_after` consecutive failures that point at the host itself
+  (timeouts, refused connections, 5xx answers) its circuit opens and the
+  session skips the host's remaining links instead of waiting out the
+  timeout for each of them.
+- Once a host has answered a few requests, its timeout shrinks to a
+  multiple of its observed p95 latency (never above the configured
+  timeout), so a host that turns into a tarpit is given up on quickly.
+
+State lives for one session only; the next run gives every host a fresh
+start. It is shared by the capture worker threads.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import threading
+from collections import deque
+from typing import Optional
+
+from .fetcher import SKIP_ERRORS
+
+# Latency samples kept per host for the percentile.
+LATENCY_SAMPLES = 50
+# Samples needed before a host's timeout adapts.
+MIN_SAMPLES = 5
+TIMEOUT_FACTOR = 4.0
+MIN_TIMEOUT = 2.0
+
+
+def is_host_failure(error: Optional[str]) -> bool:
+    """Whether a fetch error says the host is unhealthy, not just the page.
+
+    4xx answers, pages without extractable content and downloads skipped
+    for their type or size prove the host is up; everything else (network
+    errors, timeouts, 5xx) counts against it.
+    """
+    if not error or error == "no_content" or error in SKIP_ERRORS:
+        return False
+    return not error.startswith("http_4")
+
+
+def percentile(samples, q: float) -> float:
+    """Nearest-rank `q` percentile (0-100) of a non-empty sample."""
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+@dataclasses.dataclass
+class TrippedHost:
+    """A host whose circuit opened during the session.
+
+    - host: the host name
+    - failures: consecutive failures that opened the circuit
+    - skipped: links to the host skipped afterwards
+    - seconds_saved: estimated fetch time avoided (skipped links times the
+      mean duration of the failures)
+    """
+
+    host: str
+    failures: int
+    skipped: int
+    seconds_saved: float
+
+
+@dataclasses.dataclass
+class _HostState:
+    latencies: deque = dataclasses.field(
+        default_factory=lambda: deque(maxlen=LATENCY_SAMPLES)
+    )
+    consecutive_failures: int = 0
+    failed_seconds: float = 0.0
+    tripped_after: int = 0
+    # mean duration of the failures that opened the circuit
+    failure_seconds: float = 0.0
+    skipped: int = 0
+
+
+class HostHealth:
+    """Circuit breaker and adaptive timeouts per host.
+
+    - trip_after: consecutive host failures that open a host's circuit;
+      0 disables the breaker.
+    - timeout: configured per-request timeout, the upper bound for
+      adapted timeouts; None disables adaptation.
+    """
+
+    def __init__(self, trip_after: int = 5, timeout: Optional[float] = None) -> None:
+        self.trip_after = max(0, int(trip_after))
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._hosts: dict[str, _HostState] = {}
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState()
+        return state
+
+    def is_open(self, host: str) -> bool:
+        """True when the host's circuit is open (its links are skipped)."""
+        with self._lock:
+            state = self._hosts.get(host)
+            return state is not None and state.tripped_after > 0
+
+    def skip(self, host: str) -> None:
+        """Count a link skipped because the host's circuit is open."""
+        with self._lock:
+            self._state(host).skipped += 1
+
+    def timeout_for(self, host: str) -> Optional[float]:
+        """Timeout for the next request to `host`, or None for the default.
+
+        A host under suspicion (its last request failed) gets the full
+        configured timeout before it can trip.
+        """
+        if self.timeout is None:
+            return None
+        with self._lock:
+            state = self._hosts.get(host)
+            if (
+                state is None
+                or state.consecutive_failures
+                or len(state.latencies) < MIN_SAMPLES
+            ):
+                return None
+            p95 = percentile(state.latencies, 95)
+        return min(self.timeout, max(MIN_TIMEOUT, p95 * TIMEOUT_FACTOR))
+
+    def record(self, host: str, error: Optional[str], elapsed: float) -> None:
+        """Record the outcome of one request to `host` taking `elapsed` seconds."""
+        with self._lock:
+            state = self._state(host)
+            if not is_host_failure(error):
+                state.latencies.append(elapsed)
+                state.consecutive_failures = 0
+                state.failed_seconds = 0.0
+                return
+            state.consecutive_failures += 1
+            state.failed_seconds += elapsed
+            if (
+                self.trip_after
+                and not state.tripped_after
+                and state.consecutive_failures >= self.trip_after
+            ):
+                state.tripped_after = state.consecutive_failures
+                state.failure_seconds = state.failed_seconds / state.consecutive_failures
+
+    def tripped(self) -> list[TrippedHost]:
+        """Hosts whose circuit opened, most links skipped first."""
+        with self._lock:
+            hosts = [
+                TrippedHost(
+                    host=host,
+                    failures=state.tripped_after,
+                    skipped=state.skipped,
+                    seconds_saved=state.skipped * state.failure_seconds,
+                )
+                for host, state in self._hosts.items()
+                if state.tripped_after
+            ]
+        return sorted(hosts, key=lambda h: (-h.skipped, h.host))
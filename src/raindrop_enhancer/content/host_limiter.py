@@ -0,0 +1,85 @@
+"""Per-host politeness for concurrent content capture.
+
+`HostLimiter` caps how many requests may be in flight to one host and how
+soon after the previous request to that host the next one may start. It is
+shared by the capture worker threads; the global concurrency cap is the
+size of the worker pool itself.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+from urllib.parse import urlsplit
+
+
+def host_of(url: str) -> str:
+    """Lower-cased host name of `url` ('' when it has none)."""
+    try:
+        return (urlsplit(url).hostname or "").lower()
+    except ValueError:
+        return ""
+
+
+class HostLimiter:
+    """Per-host concurrency limit and minimum delay between request starts.
+
+    - per_host: requests allowed in flight to one host at a time.
+    - min_delay: seconds between the starts of two requests to one host.
+    - clock: monotonic clock, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        per_host: int = 2,
+        min_delay: float = 0.0,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if per_host <= 0:
+            raise ValueError("per_host must be positive")
+        self.per_host = per_host
+        self.min_delay = max(0.0, float(min_delay))
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._active: dict[str, int] = {}
+        self._next_start: dict[str, float] = {}
+
+    @contextmanager
+    def slot(
+        self, host: str, cancel: Optional[Callable[[], bool]] = None
+    ) -> Iterator[bool]:
+        """Block until a request to `host` may start; release it on exit.
+
+        Yields True once the slot is held. If `cancel` returns True while
+        waiting, gives up without taking the slot and yields False.
+        """
+        with self._cond:
+            while True:
+                if cancel is not None and cancel():
+                    cancelled = True
+                    break
+                if self._active.get(host, 0) < self.per_host:
+                    wait = self._next_start.get(host, 0.0) - self._clock()
+                    if wait <= 0:
+                        cancelled = False
+                        break
+                    self._cond.wait(wait)
+                else:
+                    self._cond.wait()
+            if not cancelled:
+                self._active[host] = self._active.get(host, 0) + 1
+                self._next_start[host] = self._clock() + self.min_delay
+        if cancelled:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            with self._cond:
+                self._active[host] -= 1
+                if not self._active[host]:
+                    del self._active[host]
+                self._cond.notify_all()
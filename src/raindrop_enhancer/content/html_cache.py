@@ -0,0 +1,228 @@
+"""On-disk cache of raw downloaded HTML, for re-extraction without refetching.
+
+Pages are stored content-addressed: the zlib-compressed HTML lives in
+``<root>/<sha256[:2]>/<sha256>`` and a small SQLite index in
+``<root>/index.sqlite`` maps each URL to its blob plus the HTTP status,
+response headers and fetch time. URLs with identical HTML share one blob.
+
+The cache is size-bounded: once the compressed blobs exceed `max_bytes`,
+the least recently used blobs (and the URLs pointing at them) are evicted.
+It is safe to use from several threads; index access is serialized.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import datetime
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import zlib
+from datetime import timezone
+from pathlib import Path
+from typing import Optional
+
+Logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+# Evict down to this fraction of `max_bytes` so eviction does not run on
+# every insert once the cache is full.
+EVICT_TO = 0.9
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    last_used_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_blobs_last_used ON blobs(last_used_at);
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    digest TEXT NOT NULL REFERENCES blobs(digest),
+    status INTEGER,
+    headers_json TEXT NOT NULL DEFAULT '{}',
+    fetched_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pages_digest ON pages(digest);
+"""
+
+
+@dataclasses.dataclass
+class CachedPage:
+    """A cached download.
+
+    - url: the requested URL
+    - html: the raw document
+    - status/headers: HTTP status and response headers at fetch time
+    - fetched_at: ISO8601 UTC time of the download
+    - digest: sha256 of the HTML, naming its blob
+    """
+
+    url: str
+    html: str
+    status: Optional[int]
+    headers: dict
+    fetched_at: str
+    digest: str
+
+
+def default_cache_dir(db_path: Path) -> Path:
+    """Cache directory used alongside a database file."""
+    return db_path.parent / "html-cache"
+
+
+def _now() -> str:
+    return datetime.datetime.now(timezone.utc).isoformat()
+
+
+class HtmlCache:
+    """Content-addressed, LRU size-bounded store of raw HTML."""
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(
+            str(self.root / "index.sqlite"), check_same_thread=False
+        )
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(INDEX_SCHEMA)
+        self.conn.commit()
+        row = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()
+        self.total_bytes = int(row[0])
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def put(
+        self,
+        url: str,
+        html: str,
+        status: Optional[int] = None,
+        headers: Optional[dict] = None,
+        fetched_at: Optional[str] = None,
+    ) -> str:
+        """Store `html` for `url` (replacing any earlier copy); returns its digest."""
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        now = _now()
+        with self._lock:
+            known = self.conn.execute(
+                "SELECT 1 FROM blobs WHERE digest = ?", (digest,)
+            ).fetchone()
+            if not known or not path.exists():
+                blob = zlib.compress(data, 6)
+                path.parent.mkdir(exist_ok=True)
+                # write-then-rename so readers never see a partial blob
+                tmp = path.with_name(f"{digest}.{threading.get_ident()}.tmp")
+                tmp.write_bytes(blob)
+                os.replace(tmp, path)
+                if not known:
+                    self.total_bytes += len(blob)
+                self.conn.execute(
+                    "INSERT INTO blobs(digest, size, last_used_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(digest) DO UPDATE SET size = excluded.size, "
+                    "last_used_at = excluded.last_used_at",
+                    (digest, len(blob), now),
+                )
+            else:
+                self.conn.execute(
+                    "UPDATE blobs SET last_used_at = ? WHERE digest = ?", (now, digest)
+                )
+            previous = self.conn.execute(
+                "SELECT digest FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            self.conn.execute(
+                "INSERT INTO pages(url, digest, status, headers_json, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT(url) DO UPDATE SET "
+                "digest = excluded.digest, status = excluded.status, "
+                "headers_json = excluded.headers_json, fetched_at = excluded.fetched_at",
+                (url, digest, status, json.dumps(headers or {}), fetched_at or now),
+            )
+            if previous and previous[0] != digest:
+                self._drop_if_unused(previous[0])
+            if self.total_bytes > self.max_bytes:
+                self._evict(int(self.max_bytes * EVICT_TO))
+            self.conn.commit()
+        return digest
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Cached page for `url`, or None; marks its blob as recently used."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT digest, status, headers_json, fetched_at FROM pages WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            digest = row[0]
+            try:
+                blob = self._blob_path(digest).read_bytes()
+            except FileNotFoundError:
+                # removed behind our back: forget the entry
+                Logger.warning("HTML cache blob missing for %s", url)
+                self.conn.execute("DELETE FROM pages WHERE digest = ?", (digest,))
+                self._drop_if_unused(digest)
+                self.conn.commit()
+                return None
+            self.conn.execute(
+                "UPDATE blobs SET last_used_at = ? WHERE digest = ?", (_now(), digest)
+            )
+            self.conn.commit()
+        return CachedPage(
+            url=url,
+            html=zlib.decompress(blob).decode("utf-8"),
+            status=row[1],
+            headers=json.loads(row[2]),
+            fetched_at=row[3],
+            digest=digest,
+        )
+
+    def __contains__(self, url: str) -> bool:
+        with self._lock:
+            return (
+                self.conn.execute("SELECT 1 FROM pages WHERE url = ?", (url,)).fetchone()
+                is not None
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def _drop_if_unused(self, digest: str) -> None:
+        in_use = self.conn.execute(
+            "SELECT 1 FROM pages WHERE digest = ? LIMIT 1", (digest,)
+        ).fetchone()
+        if in_use:
+            return
+        row = self.conn.execute(
+            "DELETE FROM blobs WHERE digest = ? RETURNING size", (digest,)
+        ).fetchone()
+        if row:
+            self.total_bytes -= row[0]
+        self._blob_path(digest).unlink(missing_ok=True)
+
+    def _evict(self, target: int) -> None:
+        """Drop least recently used blobs until the cache holds <= `target` bytes."""
+        evicted = 0
+        for digest, size in self.conn.execute(
+            "SELECT digest, size FROM blobs ORDER BY last_used_at"
+        ).fetchall():
+            if self.total_bytes <= target:
+                break
+            self.conn.execute("DELETE FROM pages WHERE digest = ?", (digest,))
+            self.conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+            self._blob_path(digest).unlink(missing_ok=True)
+            self.total_bytes -= size
+            evicted += 1
+        Logger.debug("HTML cache evicted %d blobs (%d bytes kept)", evicted, self.total_bytes)
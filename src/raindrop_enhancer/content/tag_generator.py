@@ -91,7 +91,8 @@ class TagGenerationRunner:
     ) -> List[tuple]:
         """Process items and return list of (raindrop_id, tags_json_str, meta_json_str).
 
-        items: Iterable of (raindrop_id, title, url, content_markdown)
+        items: Iterable of (raindrop_id, title, url, content_markdown); consumed
+               lazily, so a store iterator can be passed directly
         on_result: optional callback called with a dict for each processed link
         """
         self.logger.debug("run_batch called")
@@ -171,9 +172,7 @@ class TagGenerationRunner:
                             cb_e,
                         )
 
-        self.logger.debug(
-            f"processing %s items with batch_size=%s", len(items), self.batch_size
-        )
+        self.logger.debug("processing items with batch_size=%s", self.batch_size)
         for item in items:
             batch.append(item)
             if len(batch) >= self.batch_size:
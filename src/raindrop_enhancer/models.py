@@ -29,11 +29,15 @@ class Collection:
 
         Expects fields like `_id`, `title`, `count`, `parent`, `color`, `created`, `lastUpdate`, `access`.
         """
+        parent = payload.get("parent")
+        if isinstance(parent, dict):
+            # API returns the parent as a reference object: {"$id": 123}
+            parent = parent.get("$id")
         return Collection(
             id=int(payload.get("_id", 0)),
             title=str(payload.get("title", "")),
             count=int(payload.get("count", 0)),
-            parent_id=payload.get("parent"),
+            parent_id=int(parent) if parent is not None else None,
             color=payload.get("color"),
             created_at=_parse_ts(payload.get("created")),
             last_updated_at=_parse_ts(payload.get("lastUpdate")),
@@ -95,6 +99,8 @@ class RaindropLink:
     # Auto-generated tagging fields
     auto_tags_json: Optional[str] = None
     auto_tags_meta_json: Optional[str] = None
+    # Raindrop's lastUpdate (ISO8601), used to detect edits incrementally
+    last_updated_at: Optional[str] = None
 
     @staticmethod
     def from_raindrop(r: "Raindrop", synced_at: datetime) -> "RaindropLink":
@@ -108,6 +114,7 @@ class RaindropLink:
             synced_at=synced_at.isoformat(),
             tags_json=json.dumps(sorted(r.tags)),
             raw_payload=json.dumps({"id": r.id, "title": r.title, "url": r.url}),
+            last_updated_at=r.last_updated_at.isoformat(),
         )
 
 
@@ -115,9 +122,10 @@ class RaindropLink:
 class LinkCaptureAttempt:
     link_id: int
     attempted_at: datetime
-    status: str  # success|skipped|failed
+    status: str  # success|unchanged|skipped|failed
     retry_count: int = 0
     error_type: Optional[str] = None
+    duration_ms: Optional[int] = None
 
 
 @dataclass
@@ -138,6 +146,25 @@ class SyncState:
     last_run_at: str
     db_version: int
     last_full_refresh: str
+    # High-water mark of raindrop lastUpdate values already applied locally
+    last_update_iso: str = ""
+
+
+@dataclass
+class SyncCheckpoint:
+    """Progress of one collection within a sync run (see `sync_checkpoints`).
+
+    `offset` is the number of items of the walk starting at `cursor_iso`
+    that have been committed; `completed` marks a fully walked collection.
+    """
+
+    collection_id: int
+    run_id: str
+    cursor_iso: Optional[str]
+    offset: int
+    max_created_iso: Optional[str]
+    completed: bool
+    updated_at: Optional[str] = None
 
 
 @dataclass
@@ -150,6 +177,45 @@ class SyncOutcome:
     db_path: Path
     requests_count: int = 0
     retries_count: int = 0
+    # Seconds spent sleeping for rate limits / retry backoff during the run
+    sleep_seconds: float = 0.0
+    # Per-stage timings: fetching (API + conversion) vs. writing to SQLite,
+    # plus how long each stage waited on the other when pipelined.
+    fetch_seconds: float = 0.0
+    write_seconds: float = 0.0
+    fetch_blocked_seconds: float = 0.0
+    write_wait_seconds: float = 0.0
+    # Collections skipped because their lastUpdate/count did not change
+    collections_skipped: int = 0
+    # True when the run continued an interrupted run from its checkpoints
+    resumed: bool = False
+    # Change tracking: existing links rewritten / removed during the run
+    updated_links: int = 0
+    deleted_links: int = 0
+
+
+@dataclass
+class SearchHit:
+    """One full-text search result; higher `score` ranks better (negated BM25)."""
+
+    raindrop_id: int
+    title: str
+    url: str
+    score: float
+    snippet: Optional[str] = None
+
+
+@dataclass
+class ContentValidators:
+    """What a refresh needs to tell whether a captured page changed.
+
+    `etag` / `last_modified` are the HTTP validators sent back in a
+    conditional GET; `body_hash` is the SHA-256 of the downloaded HTML.
+    """
+
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    body_hash: Optional[str] = None
 
 
 def _parse_ts(value) -> datetime:
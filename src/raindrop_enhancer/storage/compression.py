@@ -0,0 +1,150 @@
+"""Compression of captured content stored in `link_content`.
+
+Content is stored either as plain TEXT (codec NULL) or as a BLOB tagged with
+the codec that produced it: ``zlib`` or ``zstd``, suffixed with ``:<id>``
+when compressed against a trained dictionary from `compression_dicts`.
+
+zstd needs the optional `zstandard` package (``pip install
+raindrop-enhancer[compression]``); zlib from the standard library is the
+fallback, so databases written with zlib stay readable everywhere.
+"""
+
+from __future__ import annotations
+
+import zlib
+from collections import Counter
+from functools import lru_cache
+from typing import Iterable, Optional
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+
+COMPRESSION_METHODS = ("auto", "zstd", "zlib", "none")
+# Compression is opt-in (`capture --compression`, `recompress`): plain text
+# stays readable by any SQLite client.
+DEFAULT_COMPRESSION = "none"
+
+# Documents below this size are stored as plain text: headers would eat
+# most of the gain and reads skip a decompression call.
+MIN_COMPRESS_BYTES = 256
+
+ZLIB_LEVEL = 9
+ZSTD_LEVEL = 9
+# zlib only looks back 32 KiB, so a larger preset dictionary is wasted.
+ZLIB_DICT_SIZE = 32 * 1024
+ZSTD_DICT_SIZE = 112 * 1024
+
+
+def zstd_available() -> bool:
+    return zstandard is not None
+
+
+def resolve_method(method: str) -> str:
+    """Map a requested method to the codec actually used ("none" for plain)."""
+    if method not in COMPRESSION_METHODS:
+        raise ValueError(f"Unknown compression method: {method!r}")
+    if method == "auto":
+        return "zstd" if zstd_available() else "zlib"
+    if method == "zstd" and not zstd_available():
+        raise ValueError(
+            "zstd compression requires the 'zstandard' package "
+            "(pip install raindrop-enhancer[compression])"
+        )
+    return method
+
+
+def codec_tag(method: str, dict_id: Optional[int] = None) -> str:
+    return method if dict_id is None else f"{method}:{dict_id}"
+
+
+def parse_codec(tag: str) -> tuple[str, Optional[int]]:
+    """Split a codec tag into (method, dictionary id or None)."""
+    method, _, dict_id = tag.partition(":")
+    return method, int(dict_id) if dict_id else None
+
+
+# Loading a dictionary is far costlier than compressing one small document,
+# so zstd (de)compressors are built once per dictionary. Not thread-safe:
+# callers share them from the thread owning the store connection.
+@lru_cache(maxsize=8)
+def _zstd_compressor(zdict: Optional[bytes]):
+    d = zstandard.ZstdCompressionDict(zdict) if zdict is not None else None
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=d)
+
+
+@lru_cache(maxsize=8)
+def _zstd_decompressor(zdict: Optional[bytes]):
+    d = zstandard.ZstdCompressionDict(zdict) if zdict is not None else None
+    return zstandard.ZstdDecompressor(dict_data=d)
+
+
+def compress(data: bytes, method: str, zdict: Optional[bytes] = None) -> bytes:
+    if method == "zlib":
+        if zdict is None:
+            return zlib.compress(data, ZLIB_LEVEL)
+        c = zlib.compressobj(ZLIB_LEVEL, zdict=zdict)
+        return c.compress(data) + c.flush()
+    if method == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd compression requires the 'zstandard' package")
+        return _zstd_compressor(zdict).compress(data)
+    raise ValueError(f"Unknown compression method: {method!r}")
+
+
+def decompress(blob: bytes, method: str, zdict: Optional[bytes] = None) -> bytes:
+    if method == "zlib":
+        if zdict is None:
+            return zlib.decompress(blob)
+        d = zlib.decompressobj(zdict=zdict)
+        return d.decompress(blob) + d.flush()
+    if method == "zstd":
+        if zstandard is None:
+            raise ValueError(
+                "Content was stored with zstd; install the 'zstandard' package to read it"
+            )
+        return _zstd_decompressor(zdict).decompress(blob)
+    raise ValueError(f"Unknown compression method: {method!r}")
+
+
+def train_dictionary(
+    method: str, samples: Iterable[bytes], size: Optional[int] = None
+) -> Optional[bytes]:
+    """Build a dictionary for `method` from sample documents.
+
+    zstd uses its own trainer. For zlib the preset dictionary is made of
+    lines shared by several documents (boilerplate, navigation, markdown
+    scaffolding), most frequent last since zlib prefers close matches.
+    Returns None when the samples do not yield a useful dictionary.
+    """
+    samples = [s for s in samples if s]
+    if not samples:
+        return None
+    if method == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd compression requires the 'zstandard' package")
+        try:
+            trained = zstandard.train_dictionary(size or ZSTD_DICT_SIZE, samples)
+        except zstandard.ZstdError:
+            # too few / too small samples
+            return None
+        return trained.as_bytes()
+    if method == "zlib":
+        limit = size or ZLIB_DICT_SIZE
+        counts: Counter = Counter()
+        for s in samples:
+            counts.update(set(line for line in s.splitlines() if len(line) >= 8))
+        shared = [line for line, n in counts.most_common() if n > 1]
+        picked: list[bytes] = []
+        total = 0
+        for line in shared:
+            if total + len(line) + 1 > limit:
+                break
+            picked.append(line)
+            total += len(line) + 1
+        if not picked:
+            return None
+        return b"\n".join(reversed(picked)) + b"\n"
+    raise ValueError(f"Unknown compression method: {method!r}")
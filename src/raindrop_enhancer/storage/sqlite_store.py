@@ -6,14 +6,33 @@ and basic corruption checks via PRAGMA quick_check.
 
 from __future__ import annotations
 
+import hashlib
 import sqlite3
 from dataclasses import dataclass
 import logging
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Callable, Iterable, Iterator, List, Optional
 
-from ..models import RaindropLink, SyncState
+from ..models import (
+    Collection,
+    ContentValidators,
+    LinkCaptureAttempt,
+    RaindropLink,
+    SearchHit,
+    SyncCheckpoint,
+    SyncState,
+)
+from .compression import (
+    DEFAULT_COMPRESSION,
+    MIN_COMPRESS_BYTES,
+    codec_tag,
+    compress,
+    decompress,
+    parse_codec,
+    resolve_method,
+    train_dictionary,
+)
 
 
 DB_SCHEMA = """
@@ -38,189 +57,1510 @@ CREATE TABLE IF NOT EXISTS sync_state (
     db_version INTEGER NOT NULL,
     last_full_refresh TEXT NOT NULL
 );
-PRAGMA user_version = 1;
 """
 
+# Resumable sync progress: per-collection checkpoints and collection metadata.
+SYNC_PROGRESS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_checkpoints (
+    collection_id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    cursor_iso TEXT,
+    offset INTEGER NOT NULL DEFAULT 0,
+    max_created_iso TEXT,
+    completed INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS collections (
+    collection_id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    parent_id INTEGER,
+    color TEXT,
+    created_at TEXT NOT NULL,
+    last_updated_at TEXT NOT NULL,
+    access_level INTEGER NOT NULL,
+    synced_at TEXT NOT NULL
+);
+"""
+
+
+# Captured content lives outside raindrop_links so scans of the (hot) links
+# table do not page multi-kilobyte documents through the cache.
+LINK_CONTENT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS link_content (
+    raindrop_id INTEGER PRIMARY KEY,
+    content_markdown TEXT NOT NULL,
+    content_source TEXT NOT NULL DEFAULT 'trafilatura',
+    fetched_at TEXT NOT NULL,
+    byte_size INTEGER NOT NULL,
+    content_hash TEXT NOT NULL
+);
+"""
+
+# Dictionaries trained from stored content; link_content.codec refers to
+# them as "<method>:<id>".
+COMPRESSION_DICTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS compression_dicts (
+    id INTEGER PRIMARY KEY,
+    method TEXT NOT NULL,
+    dict BLOB NOT NULL,
+    sample_count INTEGER NOT NULL,
+    created_at TEXT NOT NULL
+);
+"""
+
+
+# The full refresh that owns the shadow links table, so only that run
+# (resumed under its run id) ever swaps it in.
+SHADOW_REFRESH_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shadow_refresh (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    run_id TEXT NOT NULL
+);
+"""
+
+
+# Every capture attempt, and the per-link retry state derived from failures:
+# links are retried after an exponentially growing delay and quarantined
+# (no longer retried unless asked) after CAPTURE_QUARANTINE_AFTER failures.
+CAPTURE_ATTEMPTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS capture_attempts (
+    id INTEGER PRIMARY KEY,
+    raindrop_id INTEGER NOT NULL,
+    attempted_at TEXT NOT NULL,
+    status TEXT NOT NULL,
+    error_type TEXT,
+    duration_ms INTEGER,
+    retry_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_capture_attempts_link ON capture_attempts(raindrop_id, attempted_at);
+CREATE INDEX IF NOT EXISTS idx_capture_attempts_time ON capture_attempts(attempted_at);
+CREATE TABLE IF NOT EXISTS capture_backoff (
+    raindrop_id INTEGER PRIMARY KEY,
+    failures INTEGER NOT NULL,
+    next_attempt_at TEXT NOT NULL,
+    quarantined INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT
+);
+"""
+CAPTURE_BACKOFF_BASE = timedelta(hours=6)
+CAPTURE_BACKOFF_MAX = timedelta(days=30)
+CAPTURE_QUARANTINE_AFTER = 8
+CAPTURE_ATTEMPTS_KEEP_DAYS = 90
+# Skip reasons that will not change on retry (see content.fetcher.SKIP_ERRORS):
+# such links are quarantined straight away.
+CAPTURE_UNCAPTURABLE = ("unsupported_type", "too_large")
+
+
+def capture_backoff_delay(failures: int) -> timedelta:
+    """Delay before retrying a link after `failures` consecutive failures."""
+    return min(CAPTURE_BACKOFF_BASE * (2 ** max(failures - 1, 0)), CAPTURE_BACKOFF_MAX)
+
+
+# Full-text search: an FTS5 index over link titles, URLs, tags and captured
+# content. The index is contentless: it holds only the inverted index, and
+# snippets are built from the stored rows at query time. Triggers use no
+# custom functions, so any SQLite client can write the tables; they queue a
+# changed link with the values it was indexed with in link_search_pending,
+# and SQLiteStore (which can decode content) re-indexes queued links in the
+# same transaction, or on connect after another client's writes.
+SEARCH_TOKENIZE = "tokenize='porter unicode61 remove_diacritics 2'"
+# Without contentless_delete (SQLite < 3.43), removing a link's terms needs
+# the values it was indexed with, which the queue keeps.
+CONTENTLESS_DELETE = sqlite3.sqlite_version_info >= (3, 43, 0)
+SEARCH_INDEX_SQL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS link_search USING fts5("
+    "title, url, tags, auto_tags, content, content='', "
+    + ("contentless_delete=1, " if CONTENTLESS_DELETE else "")
+    + SEARCH_TOKENIZE
+    + ")",
+    "CREATE TABLE IF NOT EXISTS link_search_pending ("
+    "raindrop_id INTEGER PRIMARY KEY, indexed INTEGER NOT NULL, title TEXT, url TEXT, "
+    "tags TEXT, auto_tags TEXT, content_markdown, codec TEXT)",
+)
+# Scratch index of the top hits' decoded rows, for their snippets
+SNIPPET_INDEX_SQL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS temp.link_snippet USING fts5("
+    f"title, url, tags, auto_tags, content, {SEARCH_TOKENIZE})"
+)
+# BM25 column weights: title, url, tags, auto_tags, content
+SEARCH_RANK = "bm25(link_search, 10.0, 2.0, 5.0, 3.0, 1.0)"
+# Messages of the OperationalErrors FTS5 raises for an invalid MATCH query
+# (syntax errors, unbalanced quotes, unknown column filters).
+FTS_QUERY_ERRORS = (
+    "fts5: syntax error",
+    "unterminated string",
+    "no such column",
+    "unknown special query",
+)
+
+# Queue a link with its indexed values; the first change since the link was
+# last indexed wins (INSERT OR IGNORE).
+_QUEUE_OLD_LINK = (
+    "INSERT OR IGNORE INTO link_search_pending SELECT OLD.raindrop_id, 1, OLD.title, "
+    "OLD.url, OLD.tags_json, OLD.auto_tags_json, c.content_markdown, c.codec "
+    "FROM (SELECT 1) LEFT JOIN link_content AS c ON c.raindrop_id = OLD.raindrop_id; END"
+)
+_QUEUE_OLD_CONTENT = (
+    "INSERT OR IGNORE INTO link_search_pending SELECT raindrop_id, 1, title, url, "
+    "tags_json, auto_tags_json, OLD.content_markdown, OLD.codec "
+    "FROM raindrop_links WHERE raindrop_id = OLD.raindrop_id; END"
+)
+# Triggers tied to raindrop_links and link_content; dropped and recreated
+# around the full-refresh table swap.
+SEARCH_SYNC_SQL = (
+    "CREATE TRIGGER IF NOT EXISTS link_search_links_ai AFTER INSERT ON raindrop_links BEGIN "
+    "INSERT OR IGNORE INTO link_search_pending (raindrop_id, indexed) "
+    "VALUES (NEW.raindrop_id, 0); END",
+    "CREATE TRIGGER IF NOT EXISTS link_search_links_ad AFTER DELETE ON raindrop_links BEGIN "
+    + _QUEUE_OLD_LINK,
+    "CREATE TRIGGER IF NOT EXISTS link_search_links_au "
+    "AFTER UPDATE OF title, url, tags_json, auto_tags_json ON raindrop_links "
+    "WHEN OLD.title IS NOT NEW.title OR OLD.url IS NOT NEW.url "
+    "OR OLD.tags_json IS NOT NEW.tags_json OR OLD.auto_tags_json IS NOT NEW.auto_tags_json BEGIN "
+    + _QUEUE_OLD_LINK,
+    "CREATE TRIGGER IF NOT EXISTS link_search_content_ai AFTER INSERT ON link_content BEGIN "
+    "INSERT OR IGNORE INTO link_search_pending SELECT raindrop_id, 1, title, url, "
+    "tags_json, auto_tags_json, NULL, NULL FROM raindrop_links "
+    "WHERE raindrop_id = NEW.raindrop_id; END",
+    "CREATE TRIGGER IF NOT EXISTS link_search_content_ad AFTER DELETE ON link_content BEGIN "
+    + _QUEUE_OLD_CONTENT,
+    "CREATE TRIGGER IF NOT EXISTS link_search_content_au "
+    "AFTER UPDATE OF content_markdown, codec ON link_content "
+    "WHEN OLD.content_markdown IS NOT NEW.content_markdown OR OLD.codec IS NOT NEW.codec BEGIN "
+    + _QUEUE_OLD_CONTENT,
+)
+SEARCH_SYNC_OBJECTS = (
+    ("trigger", "link_search_links_ai"),
+    ("trigger", "link_search_links_ad"),
+    ("trigger", "link_search_links_au"),
+    ("trigger", "link_search_content_ai"),
+    ("trigger", "link_search_content_ad"),
+    ("trigger", "link_search_content_au"),
+)
+# The view of the earlier index that read content through the
+# `decode_content` function.
+_LEGACY_SEARCH_OBJECTS = (("view", "link_search_source"),)
+
+
+# Ordered schema migrations: (user_version after the step, SQLiteStore method).
+# Steps must be idempotent: databases created before versioned migrations do
+# not carry a reliable user_version and replay every step once.
+MIGRATIONS = (
+    (1, "_ensure_schema"),
+    (2, "_ensure_content_columns"),
+    (3, "_ensure_tagging_columns"),
+    (4, "_ensure_sync_progress_tables"),
+    (5, "_ensure_change_tracking_columns"),
+    (6, "_move_content_to_link_content"),
+    (7, "_ensure_content_compression"),
+    (8, "_ensure_work_queue_indexes"),
+    (9, "_ensure_search_index"),
+    (10, "_ensure_revalidation_columns"),
+    (11, "_ensure_recapture_stats"),
+    (12, "_ensure_capture_attempts"),
+    (13, "_ensure_shadow_refresh_marker"),
+    (14, "_ensure_plain_search_index"),
+    (15, "_ensure_contentless_search_index"),
+)
+SCHEMA_VERSION = MIGRATIONS[-1][0]
 
 Logger = logging.getLogger(__name__)
 Logger.debug("Started logging in sqlite_store.py")
 
+# Recapture scheduling assumes one change per this many days for a page
+# with no observed history, so new captures are neither ignored nor
+# treated as hot until evidence accumulates.
+CHANGE_PRIOR_DAYS = 30.0
+
+# Full refreshes load into this table and swap it in when complete.
+SHADOW_LINKS_TABLE = "raindrop_links_new"
+
+# raindrop_links columns owned by sync; every other column (captured content,
+# auto tags, ...) is local work carried over by a full refresh.
+SYNC_LINK_COLUMNS = (
+    "raindrop_id",
+    "collection_id",
+    "collection_title",
+    "title",
+    "url",
+    "created_at",
+    "synced_at",
+    "tags_json",
+    "raw_payload",
+    "last_updated_at",
+)
+
+
+@dataclass(frozen=True)
+class ConnectionProfile:
+    """Connection-level PRAGMAs applied by `SQLiteStore.connect`."""
+
+    synchronous: str
+    cache_size_kib: int
+    mmap_size: int
+    temp_store: str
+    wal_autocheckpoint: int
+    busy_timeout_ms: int
+
+
+# - safe: SQLite defaults with fsync on every commit (synchronous=FULL).
+# - balanced: WAL with synchronous=NORMAL, which cannot corrupt the DB and
+#   only risks the last transactions on power loss; larger cache and mmap.
+# - bulk: for rebuildable loads (baseline sync, capture runs); no fsync,
+#   big cache and rarer checkpoints.
+DB_PROFILES = {
+    "safe": ConnectionProfile(
+        synchronous="FULL",
+        cache_size_kib=2_000,
+        mmap_size=0,
+        temp_store="DEFAULT",
+        wal_autocheckpoint=1000,
+        busy_timeout_ms=5000,
+    ),
+    "balanced": ConnectionProfile(
+        synchronous="NORMAL",
+        cache_size_kib=16_000,
+        mmap_size=64 * 1024 * 1024,
+        temp_store="MEMORY",
+        wal_autocheckpoint=1000,
+        busy_timeout_ms=5000,
+    ),
+    "bulk": ConnectionProfile(
+        synchronous="OFF",
+        cache_size_kib=64_000,
+        mmap_size=256 * 1024 * 1024,
+        temp_store="MEMORY",
+        wal_autocheckpoint=10_000,
+        busy_timeout_ms=10_000,
+    ),
+}
+DEFAULT_DB_PROFILE = "balanced"
+
+
+# Conflict clause updating Raindrop fields only when one of them changed.
+_UPSERT_CHANGED = (
+    " ON CONFLICT(raindrop_id) DO UPDATE SET"
+    " collection_id = excluded.collection_id,"
+    " collection_title = excluded.collection_title,"
+    " title = excluded.title,"
+    " url = excluded.url,"
+    " created_at = excluded.created_at,"
+    " synced_at = excluded.synced_at,"
+    " tags_json = excluded.tags_json,"
+    " raw_payload = excluded.raw_payload,"
+    " last_updated_at = excluded.last_updated_at"
+    " WHERE collection_id IS NOT excluded.collection_id"
+    " OR collection_title IS NOT excluded.collection_title"
+    " OR title IS NOT excluded.title"
+    " OR url IS NOT excluded.url"
+    " OR created_at IS NOT excluded.created_at"
+    " OR tags_json IS NOT excluded.tags_json"
+    " OR raw_payload IS NOT excluded.raw_payload"
+    " OR last_updated_at IS NOT excluded.last_updated_at"
+)
+
+
+def _has_auto_tags(tags_json: Optional[str]) -> int:
+    """1 when an auto_tags_json value holds tags; NULL, '' and '[]' count as untagged."""
+    return int(bool(tags_json and tags_json.strip() not in ("", "[]")))
+
+
+def _stored_size(value) -> int:
+    """Bytes taken by a link_content.content_markdown value."""
+    return len(value.encode("utf-8")) if isinstance(value, str) else len(value)
+
+
+def _content_stats(markdown: str) -> tuple[int, str]:
+    """Return (byte_size, sha256 hex digest) of the UTF-8 encoded content."""
+    data = markdown.encode("utf-8")
+    return len(data), hashlib.sha256(data).hexdigest()
+
+
+class SQLiteStore:
+    def __init__(
+        self,
+        path: Path | str,
+        profile: str = DEFAULT_DB_PROFILE,
+        compression: str = DEFAULT_COMPRESSION,
+    ):
+        if profile not in DB_PROFILES:
+            raise ValueError(f"Unknown DB profile: {profile!r}")
+        self.path = Path(path)
+        # Name of the DB_PROFILES entry applied at connect time
+        self.profile = profile
+        # Codec for newly written content ("none" stores plain text); reads
+        # decode whatever codec a row was written with.
+        self.compression = resolve_method(compression)
+        # compression_dicts cache: id -> (method, dictionary bytes)
+        self._dicts: dict[int, tuple[str, bytes]] = {}
+        self._write_dict_id: Optional[int] = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn: Optional[sqlite3.Connection] = None
+        # Table `insert_batch` writes to; the shadow table during a full refresh.
+        self.links_table = "raindrop_links"
+
+    def connect(self) -> None:
+        if self.conn is not None:
+            return
+        self.conn = sqlite3.connect(
+            str(self.path), detect_types=sqlite3.PARSE_DECLTYPES
+        )
+        self.conn.row_factory = sqlite3.Row
+        self._enable_wal()
+        self._apply_profile()
+        # Automatically apply schema evolutions so callers do not need
+        # a separate migration step when new features add columns.
+        self._migrate()
+        self._load_compression_dicts()
+        self._index_external_changes()
+
+    def close(self) -> None:
+        if self.conn:
+            try:
+                self.conn.close()
+            finally:
+                self.conn = None
+
+    def _enable_wal(self) -> None:
+        assert self.conn
+        cur = self.conn.cursor()
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.close()
+
+    def _apply_profile(self) -> None:
+        assert self.conn
+        p = DB_PROFILES[self.profile]
+        cur = self.conn.cursor()
+        try:
+            cur.execute(f"PRAGMA synchronous={p.synchronous}")
+            cur.execute(f"PRAGMA cache_size={-int(p.cache_size_kib)}")
+            cur.execute(f"PRAGMA mmap_size={int(p.mmap_size)}")
+            cur.execute(f"PRAGMA temp_store={p.temp_store}")
+            cur.execute(f"PRAGMA wal_autocheckpoint={int(p.wal_autocheckpoint)}")
+            cur.execute(f"PRAGMA busy_timeout={int(p.busy_timeout_ms)}")
+        finally:
+            cur.close()
+        Logger.debug("Applied DB profile %s", self.profile)
+
+    def _migrate(self) -> None:
+        """Run pending MIGRATIONS once; a no-op on an up-to-date database."""
+        assert self.conn
+        version = int(self.conn.execute("PRAGMA user_version").fetchone()[0])
+        if version >= SCHEMA_VERSION:
+            return
+        for target, step in MIGRATIONS:
+            if target <= version:
+                continue
+            Logger.info("Migrating database schema to version %d (%s)", target, step)
+            getattr(self, step)()
+            self.conn.execute(f"PRAGMA user_version = {target}")
+            self.conn.commit()
+
+    # --- Migration steps ---------------------------------------------------
+    def _ensure_schema(self) -> None:
+        assert self.conn
+        cur = self.conn.cursor()
+        cur.executescript(DB_SCHEMA)
+        self.conn.commit()
+        cur.close()
+
+    def _add_missing_columns(self, table: str, columns: dict) -> None:
+        """Add `columns` ({name: definition}) to `table` when absent."""
+        assert self.conn
+        cur = self.conn.cursor()
+        try:
+            cur.execute(f"PRAGMA table_info({table})")
+            existing = {r[1] for r in cur.fetchall()}
+            for name, definition in columns.items():
+                if name not in existing:
+                    cur.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+            self.conn.commit()
+        finally:
+            cur.close()
+
+    def _ensure_content_columns(self) -> None:
+        """Ensure new columns for content capture exist; add them if missing."""
+        self._add_missing_columns(
+            "raindrop_links",
+            {
+                "content_markdown": "TEXT DEFAULT NULL",
+                "content_fetched_at": "TEXT DEFAULT NULL",
+                "content_source": "TEXT DEFAULT 'trafilatura'",
+            },
+        )
+
+    def _ensure_tagging_columns(self) -> None:
+        """Ensure columns for auto-generated tags exist on raindrop_links.
+
+        Adds `auto_tags_json` and `auto_tags_meta_json` as nullable TEXT columns.
+        """
+        self._add_missing_columns(
+            "raindrop_links",
+            {
+                "auto_tags_json": "TEXT DEFAULT NULL",
+                "auto_tags_meta_json": "TEXT DEFAULT NULL",
+            },
+        )
+
+    def _ensure_sync_progress_tables(self) -> None:
+        assert self.conn
+        cur = self.conn.cursor()
+        cur.executescript(SYNC_PROGRESS_SCHEMA)
+        self.conn.commit()
+        cur.close()
+
+    def _ensure_change_tracking_columns(self) -> None:
+        """Ensure columns used to track raindrop edits exist.
+
+        Adds `raindrop_links.last_updated_at` and `sync_state.last_update_iso`
+        (the lastUpdate high-water mark).
+        """
+        self._add_missing_columns(
+            "raindrop_links", {"last_updated_at": "TEXT DEFAULT NULL"}
+        )
+        self._add_missing_columns("sync_state", {"last_update_iso": "TEXT DEFAULT NULL"})
+
+    def _move_content_to_link_content(self) -> None:
+        """Create link_content and move inline content_* columns into it."""
+        assert self.conn
+        cur = self.conn.cursor()
+        try:
+            cur.executescript(LINK_CONTENT_SCHEMA)
+            cur.execute("PRAGMA table_info(raindrop_links)")
+            cols = {r[1] for r in cur.fetchall()}
+            inline = [
+                c
+                for c in ("content_markdown", "content_fetched_at", "content_source")
+                if c in cols
+            ]
+            if not inline:
+                return
+            cur.execute("BEGIN")
+            if "content_markdown" in inline:
+                fetched = "content_fetched_at" if "content_fetched_at" in inline else "NULL"
+                source = "content_source" if "content_source" in inline else "NULL"
+                rows = cur.execute(
+                    f"SELECT raindrop_id, content_markdown, {source}, {fetched} "
+                    "FROM raindrop_links WHERE content_markdown IS NOT NULL"
+                ).fetchall()
+                now_iso = datetime.now(timezone.utc).isoformat()
+                cur.executemany(
+                    "INSERT OR REPLACE INTO link_content (raindrop_id, content_markdown, content_source, fetched_at, byte_size, content_hash) VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (r[0], r[1], r[2] or "trafilatura", r[3] or now_iso)
+                        + _content_stats(r[1])
+                        for r in rows
+                    ],
+                )
+            for column in inline:
+                cur.execute(f"ALTER TABLE raindrop_links DROP COLUMN {column}")
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cur.close()
+
+    def _ensure_content_compression(self) -> None:
+        """Add link_content.codec and the compression_dicts table."""
+        assert self.conn
+        cur = self.conn.cursor()
+        cur.executescript(COMPRESSION_DICTS_SCHEMA)
+        self.conn.commit()
+        cur.close()
+        self._add_missing_columns("link_content", {"codec": "TEXT DEFAULT NULL"})
+
+    def _ensure_revalidation_columns(self) -> None:
+        """Add HTTP validators and body hash used to revalidate on refresh."""
+        self._add_missing_columns(
+            "link_content",
+            {
+                "etag": "TEXT DEFAULT NULL",
+                "last_modified": "TEXT DEFAULT NULL",
+                "body_hash": "TEXT DEFAULT NULL",
+                "checked_at": "TEXT DEFAULT NULL",
+            },
+        )
+
+    def _ensure_recapture_stats(self) -> None:
+        """Add the change history used to schedule recaptures."""
+        self._add_missing_columns(
+            "link_content",
+            {
+                "captured_since": "TEXT DEFAULT NULL",
+                "change_count": "INTEGER NOT NULL DEFAULT 0",
+            },
+        )
+        assert self.conn
+        cur = self.conn.cursor()
+        try:
+            cur.execute("BEGIN")
+            cur.execute(
+                "UPDATE link_content SET captured_since = fetched_at "
+                "WHERE captured_since IS NULL"
+            )
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cur.close()
+
+    def _ensure_capture_attempts(self) -> None:
+        """Create the capture attempt log and per-link backoff tables."""
+        assert self.conn
+        cur = self.conn.cursor()
+        try:
+            cur.executescript(CAPTURE_ATTEMPTS_SCHEMA)
+            self.conn.commit()
+        finally:
+            cur.close()
+
+    def _ensure_shadow_refresh_marker(self) -> None:
+        """Create the table recording which run owns the shadow links table."""
+        assert self.conn
+        cur = self.conn.cursor()
+        try:
+            cur.executescript(SHADOW_REFRESH_SCHEMA)
+            self.conn.commit()
+        finally:
+            cur.close()
+
+    def _ensure_work_queue_indexes(self) -> None:
+        """Add indexed has_content / has_auto_tags flags for the work queues.
+
+        Partial indexes on synced_at cover only pending links, so the
+        capture and tag queues read O(pending) rows instead of scanning and
+        sorting the whole table.
+        """
+        self._add_missing_columns(
+            "raindrop_links",
+            {
+                "has_content": "INTEGER NOT NULL DEFAULT 0",
+                "has_auto_tags": "INTEGER NOT NULL DEFAULT 0",
+            },
+        )
+        assert self.conn
+        cur = self.conn.cursor()
+        try:
+            cur.execute("BEGIN")
+            cur.execute(
+                "UPDATE raindrop_links SET "
+                "has_content = EXISTS (SELECT 1 FROM link_content AS c WHERE c.raindrop_id = raindrop_links.raindrop_id), "
+                "has_auto_tags = NOT (auto_tags_json IS NULL OR trim(auto_tags_json) IN ('', '[]'))"
+            )
+            cur.execute(
+                "CREATE INDEX IF NOT EXISTS idx_links_uncaptured ON raindrop_links(synced_at) WHERE has_content = 0"
+            )
+            cur.execute(
+                "CREATE INDEX IF NOT EXISTS idx_links_untagged ON raindrop_links(synced_at) WHERE has_auto_tags = 0"
+            )
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cur.close()
+
+    def _ensure_search_index(self) -> None:
+        """Create the link_search FTS5 index and index existing links."""
+        assert self.conn
+        cur = self.conn.cursor()
+        try:
+            cur.execute("BEGIN")
+            for stmt in SEARCH_INDEX_SQL + SEARCH_SYNC_SQL:
+                cur.execute(stmt)
+            self._index_all_links(cur)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cur.close()
+
+    def _ensure_plain_search_index(self) -> None:
+        """Replace a view-backed link_search index with the current one."""
+        self._replace_search_index(lambda sql: "link_search_source" in sql)
+
+    def _ensure_contentless_search_index(self) -> None:
+        """Replace a link_search index holding its own text with a contentless one.
+
+        The space the old copy took is reused by later writes; `recompress
+        --vacuum` hands it back to the OS.
+        """
+        self._replace_search_index(lambda sql: "content=''" not in sql)
+
+    def _replace_search_index(self, outdated: Callable[[str], bool]) -> None:
+        """Recreate link_search and its triggers if `outdated(create_sql)`."""
+        assert self.conn
+        row = self.conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'link_search'"
+        ).fetchone()
+        if row is None or not outdated(row[0]):
+            return
+        cur = self.conn.cursor()
+        try:
+            cur.execute("BEGIN")
+            for kind, name in SEARCH_SYNC_OBJECTS + _LEGACY_SEARCH_OBJECTS:
+                cur.execute(f"DROP {kind.upper()} IF EXISTS {name}")
+            cur.execute("DROP TABLE link_search")
+            for stmt in SEARCH_INDEX_SQL + SEARCH_SYNC_SQL:
+                cur.execute(stmt)
+            self._index_all_links(cur)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cur.close()
+
+    def _index_all_links(self, cur: sqlite3.Cursor) -> None:
+        """Re-index every link and its decoded content inside the open transaction."""
+        assert self.conn
+        self._load_compression_dicts()
+        cur.execute("INSERT INTO link_search(link_search) VALUES ('delete-all')")
+        cur.execute("DELETE FROM link_search_pending")
+        read = self.conn.cursor()
+        try:
+            read.execute(
+                "SELECT l.raindrop_id, l.title, l.url, l.tags_json, l.auto_tags_json, "
+                "c.content_markdown, c.codec "
+                "FROM raindrop_links AS l LEFT JOIN link_content AS c ON c.raindrop_id = l.raindrop_id"
+            )
+            while True:
+                rows = read.fetchmany(500)
+                if not rows:
+                    break
+                cur.executemany(
+                    "INSERT INTO link_search(rowid, title, url, tags, auto_tags, content) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(*r[:5], self._decode_content(r[5], r[6])) for r in rows],
+                )
+        finally:
+            read.close()
+
+    def _index_external_changes(self) -> None:
+        """Index links that other SQLite clients changed since the last connect."""
+        assert self.conn
+        cur = self.conn.cursor()
+        try:
+            cur.execute("SELECT 1 FROM link_search_pending LIMIT 1")
+            if cur.fetchone() is None:
+                return
+            cur.execute("BEGIN")
+            self._index_pending_links(cur)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cur.close()
+
+    def _index_pending_links(self, cur: sqlite3.Cursor) -> None:
+        """Re-index the links queued in link_search_pending inside the open transaction.
+
+        A queued link's old terms are removed (by rowid with contentless_delete,
+        else with FTS5's 'delete' command and the queued values) and its
+        current row, if any, is indexed. Only queued links are decoded.
+        """
+        assert self.conn
+        cur.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'link_search'"
+        )
+        by_rowid = "contentless_delete" in cur.fetchone()[0]
+        read = self.conn.cursor()
+        try:
+            read.execute(
+                "SELECT p.raindrop_id, p.indexed, p.title, p.url, p.tags, p.auto_tags, "
+                "p.content_markdown, p.codec, l.raindrop_id, l.title, l.url, l.tags_json, "
+                "l.auto_tags_json, c.content_markdown, c.codec FROM link_search_pending AS p "
+                "LEFT JOIN raindrop_links AS l ON l.raindrop_id = p.raindrop_id "
+                "LEFT JOIN link_content AS c ON c.raindrop_id = l.raindrop_id"
+            )
+            while True:
+                rows = read.fetchmany(500)
+                if not rows:
+                    break
+                indexed = [r for r in rows if r[1]]
+                if by_rowid:
+                    cur.executemany(
+                        "DELETE FROM link_search WHERE rowid = ?",
+                        [(r[0],) for r in indexed],
+                    )
+                else:
+                    cur.executemany(
+                        "INSERT INTO link_search(link_search, rowid, title, url, tags, auto_tags, content) "
+                        "VALUES ('delete', ?, ?, ?, ?, ?, ?)",
+                        [
+                            (r[0], *r[2:6], self._decode_content(r[6], r[7]))
+                            for r in indexed
+                        ],
+                    )
+                cur.executemany(
+                    "INSERT INTO link_search(rowid, title, url, tags, auto_tags, content) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (*r[8:13], self._decode_content(r[13], r[14]))
+                        for r in rows
+                        if r[8] is not None
+                    ],
+                )
+        finally:
+            read.close()
+        cur.execute("DELETE FROM link_search_pending")
+
+    # --- Content compression -----------------------------------------------
+    def _load_compression_dicts(self) -> None:
+        """Cache stored dictionaries; the newest one for our codec is used for writes."""
+        assert self.conn
+        cur = self.conn.cursor()
+        try:
+            cur.execute("SELECT id, method, dict FROM compression_dicts ORDER BY id")
+            self._dicts = {int(r[0]): (r[1], bytes(r[2])) for r in cur.fetchall()}
+        finally:
+            cur.close()
+        self._write_dict_id = None
+        for dict_id, (method, _) in self._dicts.items():
+            if method == self.compression:
+                self._write_dict_id = dict_id
+
+    def _encode_content(self, markdown: str) -> tuple[str | bytes, Optional[str]]:
+        """Return (stored value, codec) for markdown under the current settings."""
+        data = markdown.encode("utf-8")
+        if self.compression == "none" or len(data) < MIN_COMPRESS_BYTES:
+            return markdown, None
+        zdict = None
+        if self._write_dict_id is not None:
+            zdict = self._dicts[self._write_dict_id][1]
+        blob = compress(data, self.compression, zdict)
+        if len(blob) >= len(data):
+            return markdown, None
+        return blob, codec_tag(self.compression, self._write_dict_id)
+
+    def _decode_content(self, value, codec: Optional[str]) -> Optional[str]:
+        if value is None or codec is None:
+            return value
+        method, dict_id = parse_codec(codec)
+        zdict = None
+        if dict_id is not None:
+            if dict_id not in self._dicts:
+                raise ValueError(f"Missing compression dictionary {dict_id}")
+            zdict = self._dicts[dict_id][1]
+        return decompress(bytes(value), method, zdict).decode("utf-8")
+
+    def train_content_dictionary(
+        self, sample_limit: int = 2000, size: Optional[int] = None
+    ) -> Optional[int]:
+        """Train a dictionary for the current codec from stored content.
+
+        Samples the most recently fetched documents and stores the result in
+        compression_dicts; later writes use it. Returns the dictionary id, or
+        None when compression is off or the samples were not sufficient.
+        """
+        assert self.conn
+        if self.compression == "none":
+            return None
+        cur = self.conn.cursor()
+        try:
+            cur.execute(
+                "SELECT content_markdown, codec FROM link_content ORDER BY fetched_at DESC LIMIT ?",
+                (sample_limit,),
+            )
+            samples = [
+                self._decode_content(r[0], r[1]).encode("utf-8") for r in cur.fetchall()
+            ]
+            zdict = train_dictionary(self.compression, samples, size)
+            if not zdict:
+                Logger.info("Not enough content to train a %s dictionary", self.compression)
+                return None
+            cur.execute(
+                "INSERT INTO compression_dicts (method, dict, sample_count, created_at) VALUES (?, ?, ?, ?)",
+                (
+                    self.compression,
+                    zdict,
+                    len(samples),
+                    datetime.now(timezone.utc).isoformat(),
+                ),
+            )
+            dict_id = int(cur.lastrowid)
+            self.conn.commit()
+        finally:
+            cur.close()
+        self._dicts[dict_id] = (self.compression, zdict)
+        self._write_dict_id = dict_id
+        return dict_id
+
+    def recompress_content(self, batch_size: int = 500) -> dict:
+        """Rewrite stored content with the current codec and dictionary.
+
+        Walks link_content in raindrop_id order, one transaction per batch,
+        and drops dictionaries no row refers to anymore. Returns counts of
+        rows seen and rewritten and the stored bytes before and after.
+        """
+        assert self.conn
+        stats = {"rows": 0, "rewritten": 0, "bytes_before": 0, "bytes_after": 0}
+        last_id = None
+        cur = self.conn.cursor()
+        try:
+            while True:
+                if last_id is None:
+                    cur.execute(
+                        "SELECT raindrop_id, content_markdown, codec FROM link_content ORDER BY raindrop_id LIMIT ?",
+                        (batch_size,),
+                    )
+                else:
+                    cur.execute(
+                        "SELECT raindrop_id, content_markdown, codec FROM link_content WHERE raindrop_id > ? ORDER BY raindrop_id LIMIT ?",
+                        (last_id, batch_size),
+                    )
+                rows = cur.fetchall()
+                if not rows:
+                    break
+                last_id = int(rows[-1][0])
+                updates = []
+                for rid, value, codec in rows:
+                    before = _stored_size(value)
+                    new_value, new_codec = self._encode_content(
+                        self._decode_content(value, codec)
+                    )
+                    after = _stored_size(new_value)
+                    stats["rows"] += 1
+                    stats["bytes_before"] += before
+                    stats["bytes_after"] += after if new_codec != codec else before
+                    if new_codec != codec:
+                        updates.append((new_value, new_codec, rid))
+                if updates:
+                    cur.execute("BEGIN")
+                    cur.executemany(
+                        "UPDATE link_content SET content_markdown = ?, codec = ? WHERE raindrop_id = ?",
+                        updates,
+                    )
+                    self._index_pending_links(cur)
+                    self.conn.commit()
+                    stats["rewritten"] += len(updates)
+            cur.execute("SELECT DISTINCT codec FROM link_content WHERE codec LIKE '%:%'")
+            used = {parse_codec(r[0])[1] for r in cur.fetchall()}
+            unused = [
+                i for i in self._dicts if i not in used and i != self._write_dict_id
+            ]
+            if unused:
+                cur.execute("BEGIN")
+                cur.executemany(
+                    "DELETE FROM compression_dicts WHERE id = ?", [(i,) for i in unused]
+                )
+                self.conn.commit()
+                for i in unused:
+                    del self._dicts[i]
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cur.close()
+        return stats
+
+    def vacuum(self) -> None:
+        """Rebuild the DB file to hand space freed by recompression back to the OS."""
+        assert self.conn
+        self.conn.execute("VACUUM")
+
+    # --- Full refresh into a shadow table ----------------------------------
+    def begin_shadow_refresh(self, run_id: str, resume: bool = False) -> None:
+        """Direct `insert_batch` to an empty copy of raindrop_links.
+
+        The shadow table is recorded as owned by `run_id`. With `resume=True`
+        a shadow table left by an interrupted refresh of the same run is
+        reused; otherwise it is recreated. `raindrop_links` stays untouched
+        and readable until `finish_shadow_refresh`.
+        """
+        assert self.conn
+        cur = self.conn.cursor()
+        try:
+            if not (resume and self.shadow_refresh_pending(run_id)):
+                cur.execute(
+                    "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'raindrop_links'"
+                )
+                create_sql = cur.fetchone()[0]
+                cur.execute("BEGIN")
+                cur.execute(f"DROP TABLE IF EXISTS {SHADOW_LINKS_TABLE}")
+                cur.execute(
+                    create_sql.replace("raindrop_links", SHADOW_LINKS_TABLE, 1)
+                )
+                cur.execute(
+                    "INSERT OR REPLACE INTO shadow_refresh (id, run_id) VALUES (1, ?)",
+                    (run_id,),
+                )
+                self.conn.commit()
+            self.links_table = SHADOW_LINKS_TABLE
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cur.close()
+
+    def shadow_refresh_pending(self, run_id: Optional[str] = None) -> bool:
+        """True when a shadow table exists (and belongs to `run_id`, if given)."""
+        assert self.conn
+        cur = self.conn.cursor()
+        try:
+            cur.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                (SHADOW_LINKS_TABLE,),
+            )
+            if cur.fetchone() is None:
+                return False
+            if run_id is None:
+                return True
+            cur.execute("SELECT run_id FROM shadow_refresh WHERE id = 1")
+            row = cur.fetchone()
+            return row is not None and row[0] == run_id
+        finally:
+            cur.close()
+
+    def discard_shadow_refresh(self) -> None:
+        """Drop the shadow table of an abandoned refresh; the live table is kept."""
+        assert self.conn
+        cur = self.conn.cursor()
+        try:
+            cur.execute("BEGIN")
+            cur.execute(f"DROP TABLE IF EXISTS {SHADOW_LINKS_TABLE}")
+            cur.execute("DELETE FROM shadow_refresh")
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cur.close()
+            self.links_table = "raindrop_links"
+
+    def finish_shadow_refresh(self) -> None:
+        """Carry local columns over and swap the shadow table in atomically.
+
+        Content and tag columns of raindrops that still exist are copied from
+        the old table; raindrops missing from the refresh are dropped along
+        with their content, capture attempts and backoff state.
+        """
+        assert self.conn
+        cur = self.conn.cursor()
+        try:
+            cur.execute("PRAGMA table_info(raindrop_links)")
+            old_cols = [r[1] for r in cur.fetchall()]
+            cur.execute(f"PRAGMA table_info({SHADOW_LINKS_TABLE})")
+            new_cols = {r[1] for r in cur.fetchall()}
+            carried = [
+                c for c in old_cols if c not in SYNC_LINK_COLUMNS and c in new_cols
+            ]
+            cur.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'raindrop_links' AND sql IS NOT NULL"
+            )
+            index_sql = [r[0] for r in cur.fetchall()]
+
+            cur.execute("BEGIN")
+            # the search triggers reference raindrop_links by name; links
+            # are queued for re-indexing below instead
+            for kind, name in SEARCH_SYNC_OBJECTS:
+                cur.execute(f"DROP {kind.upper()} IF EXISTS {name}")
+            if carried:
+                assignments = ", ".join(f"{c} = old.{c}" for c in carried)
+                cur.execute(
+                    f"UPDATE {SHADOW_LINKS_TABLE} SET {assignments} FROM raindrop_links AS old "
+                    f"WHERE old.raindrop_id = {SHADOW_LINKS_TABLE}.raindrop_id"
+                )
+            # re-index only links that are new, gone or have changed indexed
+            # columns; the others (and their content) keep their entries
+            cur.execute(
+                "INSERT OR IGNORE INTO link_search_pending SELECT old.raindrop_id, 1, "
+                "old.title, old.url, old.tags_json, old.auto_tags_json, c.content_markdown, c.codec "
+                f"FROM raindrop_links AS old LEFT JOIN {SHADOW_LINKS_TABLE} AS new "
+                "ON new.raindrop_id = old.raindrop_id "
+                "LEFT JOIN link_content AS c ON c.raindrop_id = old.raindrop_id "
+                "WHERE new.raindrop_id IS NULL OR old.title IS NOT new.title "
+                "OR old.url IS NOT new.url OR old.tags_json IS NOT new.tags_json "
+                "OR old.auto_tags_json IS NOT new.auto_tags_json"
+            )
+            cur.execute(
+                "INSERT OR IGNORE INTO link_search_pending (raindrop_id, indexed) "
+                f"SELECT raindrop_id, 0 FROM {SHADOW_LINKS_TABLE} "
+                "WHERE raindrop_id NOT IN (SELECT raindrop_id FROM raindrop_links)"
+            )
+            cur.execute("DROP TABLE raindrop_links")
+            cur.execute(f"ALTER TABLE {SHADOW_LINKS_TABLE} RENAME TO raindrop_links")
+            cur.execute("DELETE FROM shadow_refresh")
+            for stmt in index_sql:
+                cur.execute(stmt)
+            # content and capture history of raindrops that no longer exist
+            # go with them
+            for table in ("link_content", "capture_backoff", "capture_attempts"):
+                cur.execute(
+                    f"DELETE FROM {table} WHERE raindrop_id NOT IN (SELECT raindrop_id FROM raindrop_links)"
+                )
+            for stmt in SEARCH_SYNC_SQL:
+                cur.execute(stmt)
+            self._index_pending_links(cur)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cur.close()
+            self.links_table = "raindrop_links"
+
+    def reset_sync_progress(self) -> None:
+        """Forget checkpoints and collection metadata before a full refresh."""
+        assert self.conn
+        cur = self.conn.cursor()
+        try:
+            cur.execute("BEGIN")
+            cur.execute("DELETE FROM sync_checkpoints")
+            cur.execute("DELETE FROM collections")
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cur.close()
+
+    def quick_check(self) -> bool:
+        """Run PRAGMA quick_check and return True if OK."""
+        assert self.conn
+        cur = self.conn.cursor()
+        try:
+            cur.execute("PRAGMA quick_check")
+            rows = cur.fetchall()
+            return all(r[0] == "ok" for r in rows)
+        finally:
+            cur.close()
+
+    # --- Content selection / update helpers -------------------------------
+    def _iter_keyset(
+        self,
+        select: str,
+        where: str,
+        keys: tuple[str, ...],
+        convert: Callable[[sqlite3.Row], tuple],
+        limit: Optional[int],
+        page_size: int,
+        params: Optional[dict] = None,
+    ) -> Iterator[tuple]:
+        """Yield `convert(row)` page by page, resuming after the last `keys`.
+
+        `select` must end with the `keys` columns. `select` and `where` may
+        use named parameters (`:name`) bound from `params`. Each page is a
+        separate query whose cursor is closed before rows are yielded, so
+        callers may write to the DB while iterating; rows leaving the `where`
+        set (e.g. captured links) never shift later pages.
+        """
+        assert self.conn
+        order = ", ".join(keys)
+        after_names = [f"_after_{i}" for i in range(len(keys))]
+        after = f" AND ({order}) > ({', '.join(':' + n for n in after_names)})"
+        last: Optional[tuple] = None
+        remaining = limit or None
+        while True:
+            size = min(page_size, remaining) if remaining else page_size
+            bound = {**(params or {}), "_page_size": size}
+            cur = self.conn.cursor()
+            try:
+                if last is None:
+                    cur.execute(
+                        f"{select} WHERE {where} ORDER BY {order} LIMIT :_page_size",
+                        bound,
+                    )
+                else:
+                    cur.execute(
+                        f"{select} WHERE {where}{after} ORDER BY {order} LIMIT :_page_size",
+                        {**bound, **dict(zip(after_names, last))},
+                    )
+                rows = cur.fetchall()
+            finally:
+                cur.close()
+            if not rows:
+                return
+            last = tuple(rows[-1][-len(keys) :])
+            for r in rows:
+                yield convert(r)
+            if remaining:
+                remaining -= len(rows)
+                if remaining <= 0:
+                    return
+            if len(rows) < size:
+                return
+
+    def iter_uncaptured(
+        self,
+        limit: Optional[int] = None,
+        page_size: int = 500,
+        include_backoff: bool = False,
+    ) -> Iterator[tuple]:
+        """Yield (raindrop_id, url) for links without captured content.
+
+        Ordered by synced_at ascending to pick oldest first; each page is a
+        range read on the idx_links_uncaptured partial index. Links waiting
+        out a failure backoff, or quarantined, are left out unless
+        `include_backoff` is set.
+        """
+        where = "l.has_content = 0"
+        params = {}
+        if not include_backoff:
+            where += (
+                " AND NOT EXISTS (SELECT 1 FROM capture_backoff AS b "
+                "WHERE b.raindrop_id = l.raindrop_id "
+                "AND (b.quarantined = 1 OR b.next_attempt_at > :now))"
+            )
+            params["now"] = datetime.now(timezone.utc).isoformat()
+        return self._iter_keyset(
+            "SELECT l.raindrop_id, l.url, l.synced_at, l.raindrop_id FROM raindrop_links AS l",
+            where,
+            ("l.synced_at", "l.raindrop_id"),
+            lambda r: (int(r[0]), r[1]),
+            limit,
+            page_size,
+            params,
+        )
+
+    def iter_all_links(
+        self, limit: Optional[int] = None, page_size: int = 500
+    ) -> Iterator[tuple]:
+        """Yield (raindrop_id, url) for all links in raindrop_id order."""
+        return self._iter_keyset(
+            "SELECT l.raindrop_id, l.url, l.raindrop_id FROM raindrop_links AS l",
+            "1",
+            ("l.raindrop_id",),
+            lambda r: (int(r[0]), r[1]),
+            limit,
+            page_size,
+        )
+
+    def iter_refresh_links(
+        self, limit: Optional[int] = None, page_size: int = 500
+    ) -> Iterator[tuple]:
+        """Yield (raindrop_id, url, ContentValidators or None) for all links.
+
+        Validators are None for links without captured content.
+        """
+
+        def convert(r) -> tuple:
+            if r[2] is None:
+                return (int(r[0]), r[1], None)
+            return (int(r[0]), r[1], ContentValidators(r[3], r[4], r[5]))
+
+        return self._iter_keyset(
+            "SELECT l.raindrop_id, l.url, c.raindrop_id, c.etag, c.last_modified, "
+            "c.body_hash, l.raindrop_id FROM raindrop_links AS l "
+            "LEFT JOIN link_content AS c ON c.raindrop_id = l.raindrop_id",
+            "1",
+            ("l.raindrop_id",),
+            convert,
+            limit,
+            page_size,
+        )
+
+    def iter_stale_links(
+        self,
+        limit: Optional[int] = None,
+        min_age_days: float = 1.0,
+        page_size: int = 1000,
+        now: Optional[datetime] = None,
+        include_backoff: bool = False,
+    ) -> Iterator[tuple]:
+        """Yield (raindrop_id, url, ContentValidators) of captured links, stalest first.
+
+        A link's staleness is its estimated number of unseen changes: the
+        days since it was last fetched or checked, times its observed change
+        rate (changes per day since first capture, smoothed with
+        CHANGE_PRIOR_DAYS), halved for each consecutive capture failure
+        recorded in capture_backoff. Links checked within `min_age_days`,
+        and (unless `include_backoff` is set) links waiting out a failure
+        backoff or quarantined, are left out. Scores are fixed at `now`, and
+        links checked or failing while iterating leave the set, so the
+        keyset pages stay stable.
+        """
+        now = now or datetime.now(timezone.utc)
+        last = "COALESCE(c.checked_at, c.fetched_at)"
+        rate = (
+            "(c.change_count + 1.0) / (:jd - julianday(COALESCE(c.captured_since, "
+            "c.fetched_at)) + :prior_days)"
+        )
+        # negated so the ascending keyset yields the stalest first
+        score = (
+            f"(-{rate} * (:jd - julianday({last})) "
+            "/ (1 << MIN(COALESCE(b.failures, 0), 10)))"
+        )
+        where = f"{last} < :cutoff"
+        if not include_backoff:
+            where += (
+                " AND (b.raindrop_id IS NULL OR "
+                "(b.quarantined = 0 AND b.next_attempt_at <= :now))"
+            )
+        return self._iter_keyset(
+            f"SELECT l.raindrop_id, l.url, c.etag, c.last_modified, c.body_hash, "
+            f"{score}, l.raindrop_id FROM link_content AS c "
+            "JOIN raindrop_links AS l ON l.raindrop_id = c.raindrop_id "
+            "LEFT JOIN capture_backoff AS b ON b.raindrop_id = c.raindrop_id",
+            where,
+            (score, "l.raindrop_id"),
+            lambda r: (int(r[0]), r[1], ContentValidators(r[2], r[3], r[4])),
+            limit,
+            page_size,
+            {
+                "jd": now.timestamp() / 86400.0 + 2440587.5,
+                "prior_days": CHANGE_PRIOR_DAYS,
+                "cutoff": (now - timedelta(days=min_age_days)).isoformat(),
+                "now": now.isoformat(),
+            },
+        )
+
+    def select_uncaptured(self, limit: Optional[int] = None) -> List[tuple]:
+        """Return list of (raindrop_id, url) for links without captured content."""
+        return list(self.iter_uncaptured(limit))
 
-class SQLiteStore:
-    def __init__(self, path: Path | str):
-        self.path = Path(path)
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        self.conn: Optional[sqlite3.Connection] = None
+    def select_all_links(self, limit: Optional[int] = None) -> List[tuple]:
+        """Return list of (raindrop_id, url) for all links in raindrop_id order."""
+        return list(self.iter_all_links(limit))
 
-    def connect(self) -> None:
-        if self.conn is not None:
-            return
-        self.conn = sqlite3.connect(
-            str(self.path), detect_types=sqlite3.PARSE_DECLTYPES
-        )
-        self.conn.row_factory = sqlite3.Row
-        self._enable_wal()
-        self._ensure_schema()
-        # Automatically apply schema evolutions so callers do not need
-        # a separate migration step when new features add columns.
-        self._ensure_content_columns()
-        self._ensure_tagging_columns()
+    def update_content(
+        self, link_id: int, markdown: str, source: str = "trafilatura"
+    ) -> None:
+        """Store captured markdown for an existing link (replacing any previous).
 
-    def close(self) -> None:
-        if self.conn:
-            try:
-                self.conn.close()
-            finally:
-                self.conn = None
+        The markdown is compressed with the store's codec; `byte_size` and
+        `content_hash` always describe the uncompressed text.
+        """
+        self.update_content_batch([(link_id, markdown, source)])
 
-    def _enable_wal(self) -> None:
-        assert self.conn
-        cur = self.conn.cursor()
-        cur.execute("PRAGMA journal_mode=WAL")
-        cur.close()
+    def update_content_batch(self, entries: Iterable[tuple]) -> int:
+        """Store captured markdown for many links in one transaction.
 
-    def _ensure_schema(self) -> None:
+        entries: (raindrop_id, markdown, source) tuples, optionally with the
+        page's ContentValidators as a fourth element (missing validators are
+        stored as NULL). Links that do not exist are skipped. Returns the
+        number of links written.
+        """
         assert self.conn
+        fetched_at = datetime.now(timezone.utc).isoformat()
+        rows = []
+        for link_id, markdown, source, *rest in entries:
+            value, codec = self._encode_content(markdown)
+            v = (rest[0] if rest else None) or ContentValidators()
+            rows.append(
+                (
+                    value,
+                    codec,
+                    source,
+                    fetched_at,
+                    *_content_stats(markdown),
+                    v.etag,
+                    v.last_modified,
+                    v.body_hash,
+                    fetched_at,
+                    fetched_at,
+                    link_id,
+                )
+            )
+        if not rows:
+            return 0
         cur = self.conn.cursor()
-        cur.executescript(DB_SCHEMA)
-        self.conn.commit()
-        cur.close()
+        try:
+            cur.execute("BEGIN")
+            cur.executemany(
+                "INSERT INTO link_content (raindrop_id, content_markdown, codec, content_source, fetched_at, byte_size, content_hash, "
+                "etag, last_modified, body_hash, checked_at, captured_since) "
+                "SELECT raindrop_id, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ? FROM raindrop_links WHERE raindrop_id = ? "
+                "ON CONFLICT(raindrop_id) DO UPDATE SET content_markdown = excluded.content_markdown, "
+                "codec = excluded.codec, content_source = excluded.content_source, fetched_at = excluded.fetched_at, "
+                "byte_size = excluded.byte_size, content_hash = excluded.content_hash, etag = excluded.etag, "
+                "last_modified = excluded.last_modified, body_hash = excluded.body_hash, checked_at = excluded.checked_at, "
+                # a page counts as changed only when both downloads were hashed
+                "change_count = change_count + (excluded.body_hash IS NOT NULL AND body_hash IS NOT NULL "
+                "AND excluded.body_hash <> body_hash)",
+                rows,
+            )
+            written = max(cur.rowcount, 0)
+            cur.executemany(
+                "UPDATE raindrop_links SET has_content = 1 WHERE raindrop_id = ?",
+                [(r[-1],) for r in rows],
+            )
+            self._index_pending_links(cur)
+            self.conn.commit()
+            return written
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cur.close()
 
-    # --- Migration helpers -------------------------------------------------
-    def _ensure_content_columns(self) -> None:
-        """Ensure new columns for content capture exist; add them if missing.
+    def mark_unchanged_batch(self, entries: Iterable[tuple]) -> int:
+        """Record that refreshed links did not change, without touching content.
 
-        This method is idempotent and safe to call on every connect.
+        entries: (raindrop_id, ContentValidators) tuples; validators a 304
+        did not repeat keep their stored value. Returns the links updated.
         """
         assert self.conn
+        checked_at = datetime.now(timezone.utc).isoformat()
+        rows = [
+            (v.etag, v.last_modified, v.body_hash, checked_at, link_id)
+            for link_id, v in entries
+        ]
+        if not rows:
+            return 0
         cur = self.conn.cursor()
         try:
-            cur.execute("PRAGMA table_info(raindrop_links)")
-            cols = {r[1] for r in cur.fetchall()}
-            to_add = []
-            if "content_markdown" not in cols:
-                to_add.append(
-                    "ALTER TABLE raindrop_links ADD COLUMN content_markdown TEXT DEFAULT NULL"
-                )
-            if "content_fetched_at" not in cols:
-                to_add.append(
-                    "ALTER TABLE raindrop_links ADD COLUMN content_fetched_at TEXT DEFAULT NULL"
-                )
-            if "content_source" not in cols:
-                to_add.append(
-                    "ALTER TABLE raindrop_links ADD COLUMN content_source TEXT DEFAULT 'trafilatura'"
-                )
-
-            for stmt in to_add:
-                cur.execute(stmt)
-            if to_add:
-                # bump user_version to indicate migration
-                cur.execute("PRAGMA user_version = 2")
-                self.conn.commit()
+            cur.execute("BEGIN")
+            cur.executemany(
+                "UPDATE link_content SET etag = COALESCE(?, etag), "
+                "last_modified = COALESCE(?, last_modified), "
+                "body_hash = COALESCE(?, body_hash), checked_at = ? "
+                "WHERE raindrop_id = ?",
+                rows,
+            )
+            updated = max(cur.rowcount, 0)
+            self.conn.commit()
+            return updated
+        except Exception:
+            self.conn.rollback()
+            raise
         finally:
             cur.close()
 
-    def _ensure_tagging_columns(self) -> None:
-        """Ensure columns for auto-generated tags exist on raindrop_links.
+    def record_capture_attempts(
+        self, attempts: Iterable[LinkCaptureAttempt]
+    ) -> List[int]:
+        """Log capture attempts and update each link's failure backoff.
 
-        Adds `auto_tags_json` and `auto_tags_meta_json` as nullable TEXT columns.
-        This method is idempotent and will bump PRAGMA user_version to 3 when applied.
+        A failure pushes the link's next attempt back by
+        `capture_backoff_delay` (quarantining it after
+        CAPTURE_QUARANTINE_AFTER consecutive failures); a success or an
+        unchanged revalidation clears it. Skips leave the backoff alone,
+        except for CAPTURE_UNCAPTURABLE reasons, which quarantine the link.
+        The logged `retry_count` is the number of failures before the attempt;
+        those counts are returned in the order of `attempts`.
         """
         assert self.conn
+        attempts = list(attempts)
+        if not attempts:
+            return []
         cur = self.conn.cursor()
         try:
-            cur.execute("PRAGMA table_info(raindrop_links)")
-            cols = {r[1] for r in cur.fetchall()}
-            to_add = []
-            if "auto_tags_json" not in cols:
-                to_add.append(
-                    "ALTER TABLE raindrop_links ADD COLUMN auto_tags_json TEXT DEFAULT NULL"
+            cur.execute("BEGIN")
+            ids = sorted({a.link_id for a in attempts})
+            failures = dict(
+                cur.execute(
+                    f"SELECT raindrop_id, failures FROM capture_backoff "
+                    f"WHERE raindrop_id IN ({', '.join('?' * len(ids))})",
+                    ids,
+                ).fetchall()
+            )
+            log = []
+            for a in attempts:
+                before = failures.get(a.link_id, 0)
+                log.append(
+                    (
+                        a.link_id,
+                        a.attempted_at.isoformat(),
+                        a.status,
+                        a.error_type,
+                        a.duration_ms,
+                        before,
+                    )
                 )
-            if "auto_tags_meta_json" not in cols:
-                to_add.append(
-                    "ALTER TABLE raindrop_links ADD COLUMN auto_tags_meta_json TEXT DEFAULT NULL"
+                uncapturable = (
+                    a.status == "skipped" and a.error_type in CAPTURE_UNCAPTURABLE
                 )
-
-            for stmt in to_add:
-                cur.execute(stmt)
-            if to_add:
-                # bump user_version to indicate migration applied
-                cur.execute("PRAGMA user_version = 3")
-                self.conn.commit()
+                if a.status == "failed" or uncapturable:
+                    count = before + 1
+                    failures[a.link_id] = count
+                    cur.execute(
+                        "INSERT INTO capture_backoff (raindrop_id, failures, next_attempt_at, quarantined, last_error) "
+                        "VALUES (?, ?, ?, ?, ?) ON CONFLICT(raindrop_id) DO UPDATE SET "
+                        "failures = excluded.failures, next_attempt_at = excluded.next_attempt_at, "
+                        "quarantined = excluded.quarantined, last_error = excluded.last_error",
+                        (
+                            a.link_id,
+                            count,
+                            (a.attempted_at + capture_backoff_delay(count)).isoformat(),
+                            int(uncapturable or count >= CAPTURE_QUARANTINE_AFTER),
+                            a.error_type,
+                        ),
+                    )
+                elif a.status in ("success", "unchanged"):
+                    failures.pop(a.link_id, None)
+                    cur.execute(
+                        "DELETE FROM capture_backoff WHERE raindrop_id = ?", (a.link_id,)
+                    )
+            cur.executemany(
+                "INSERT INTO capture_attempts (raindrop_id, attempted_at, status, error_type, duration_ms, retry_count) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                log,
+            )
+            self.conn.commit()
+            return [row[-1] for row in log]
+        except Exception:
+            self.conn.rollback()
+            raise
         finally:
             cur.close()
 
-    def quick_check(self) -> bool:
-        """Run PRAGMA quick_check and return True if OK."""
+    def capture_backoff_counts(self) -> tuple[int, int]:
+        """(links waiting out a backoff, quarantined links) among uncaptured links."""
         assert self.conn
+        now = datetime.now(timezone.utc).isoformat()
         cur = self.conn.cursor()
         try:
-            cur.execute("PRAGMA quick_check")
-            rows = cur.fetchall()
-            return all(r[0] == "ok" for r in rows)
+            cur.execute(
+                "SELECT COALESCE(SUM(b.quarantined = 0 AND b.next_attempt_at > ?), 0), "
+                "COALESCE(SUM(b.quarantined), 0) FROM capture_backoff AS b "
+                "JOIN raindrop_links AS l ON l.raindrop_id = b.raindrop_id "
+                "WHERE l.has_content = 0",
+                (now,),
+            )
+            waiting, quarantined = cur.fetchone()
+            return int(waiting), int(quarantined)
         finally:
             cur.close()
 
-    # --- Content selection / update helpers -------------------------------
-    def select_uncaptured(self, limit: Optional[int] = None) -> List[tuple]:
-        """Return list of (raindrop_id, url) for links without content_markdown.
-
-        Ordered by synced_at ascending to pick oldest first.
-        """
+    def prune_capture_attempts(self, keep_days: int = CAPTURE_ATTEMPTS_KEEP_DAYS) -> int:
+        """Delete attempt log rows older than `keep_days`; returns rows removed."""
         assert self.conn
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=keep_days)).isoformat()
         cur = self.conn.cursor()
         try:
-            q = "SELECT raindrop_id, url FROM raindrop_links WHERE content_markdown IS NULL ORDER BY synced_at"
-            try:
-                if limit:
-                    q = q + " LIMIT ?"
-                    cur.execute(q, (limit,))
-                else:
-                    cur.execute(q)
-            except sqlite3.OperationalError as e:
-                # Fallback for databases that don't have the content_* columns yet
-                msg = str(e).lower()
-                if "no such column" in msg:
-                    q2 = (
-                        "SELECT raindrop_id, url FROM raindrop_links ORDER BY synced_at"
-                    )
-                    if limit:
-                        q2 = q2 + " LIMIT ?"
-                        cur.execute(q2, (limit,))
-                    else:
-                        cur.execute(q2)
-                else:
-                    raise
-            return [(int(r[0]), r[1]) for r in cur.fetchall()]
+            cur.execute("BEGIN")
+            cur.execute("DELETE FROM capture_attempts WHERE attempted_at < ?", (cutoff,))
+            removed = max(cur.rowcount, 0)
+            self.conn.commit()
+            return removed
+        except Exception:
+            self.conn.rollback()
+            raise
         finally:
             cur.close()
 
-    def select_all_links(self, limit: Optional[int] = None) -> List[tuple]:
-        """Return list of (raindrop_id, url) for all links ordered by synced_at."""
+    def get_validators(self, link_id: int) -> Optional[ContentValidators]:
+        """Stored validators of a captured link, or None when not captured."""
         assert self.conn
         cur = self.conn.cursor()
         try:
-            q = "SELECT raindrop_id, url FROM raindrop_links ORDER BY synced_at"
-            if limit:
-                q = q + " LIMIT ?"
-                cur.execute(q, (limit,))
-            else:
-                cur.execute(q)
-            return [(int(r[0]), r[1]) for r in cur.fetchall()]
+            cur.execute(
+                "SELECT etag, last_modified, body_hash FROM link_content WHERE raindrop_id = ?",
+                (link_id,),
+            )
+            row = cur.fetchone()
+            return ContentValidators(*row) if row else None
         finally:
             cur.close()
 
-    def update_content(
-        self, link_id: int, markdown: str, source: str = "trafilatura"
-    ) -> None:
+    def get_content(self, link_id: int) -> Optional[str]:
+        """Return the captured markdown of a link, or None when not captured."""
         assert self.conn
         cur = self.conn.cursor()
         try:
             cur.execute(
-                "UPDATE raindrop_links SET content_markdown = ?, content_fetched_at = ?, content_source = ? WHERE raindrop_id = ?",
-                (markdown, datetime.now(timezone.utc).isoformat(), source, link_id),
+                "SELECT content_markdown, codec FROM link_content WHERE raindrop_id = ?",
+                (link_id,),
             )
-            self.conn.commit()
+            row = cur.fetchone()
+            return self._decode_content(row[0], row[1]) if row else None
         finally:
             cur.close()
 
@@ -228,18 +1568,51 @@ class SQLiteStore:
         assert self.conn
         cur = self.conn.cursor()
         try:
+            cur.execute("DELETE FROM link_content WHERE raindrop_id = ?", (link_id,))
             cur.execute(
-                "UPDATE raindrop_links SET content_markdown = NULL, content_fetched_at = NULL WHERE raindrop_id = ?",
+                "UPDATE raindrop_links SET has_content = 0 WHERE raindrop_id = ?",
                 (link_id,),
             )
+            self._index_pending_links(cur)
             self.conn.commit()
         finally:
             cur.close()
 
-    def insert_batch(self, links: Iterable[RaindropLink]) -> int:
-        """Insert multiple RaindropLink records atomically. Returns number inserted."""
+    def insert_batch(
+        self,
+        links: Iterable[RaindropLink],
+        checkpoints: Iterable[SyncCheckpoint] = (),
+        collections: Iterable[Collection] = (),
+    ) -> int:
+        """Insert or update multiple RaindropLink records atomically.
+
+        Returns the number of newly inserted links; see `upsert_batch` for
+        the number of updated ones.
+        """
+        inserted, _ = self.upsert_batch(
+            links, checkpoints=checkpoints, collections=collections
+        )
+        return inserted
+
+    def upsert_batch(
+        self,
+        links: Iterable[RaindropLink],
+        checkpoints: Iterable[SyncCheckpoint] = (),
+        collections: Iterable[Collection] = (),
+    ) -> tuple[int, int]:
+        """Insert new links and update the Raindrop fields of changed ones.
+
+        Captured content and auto tags are kept, and rows whose fields are
+        unchanged are not rewritten. `checkpoints` and fully synced
+        `collections` are saved in the same transaction, so neither claims
+        progress whose links were not committed.
+
+        Counts come from the statements' row counts (which, unlike
+        `total_changes`, exclude search-index trigger writes), so the cost
+        per batch does not grow with the table. Returns (inserted, updated).
+        """
         assert self.conn
-        to_insert = [
+        rows = [
             (
                 l.raindrop_id,
                 l.collection_id,
@@ -250,59 +1623,192 @@ class SQLiteStore:
                 l.synced_at,
                 l.tags_json,
                 l.raw_payload,
+                l.last_updated_at,
             )
             for l in links
         ]
-        if not to_insert:
-            return 0
+        checkpoints = list(checkpoints)
+        collections = list(collections)
+        if not rows and not checkpoints and not collections:
+            return 0, 0
+        insert = (
+            f"INSERT INTO {self.links_table} (raindrop_id, collection_id, collection_title, title, url, created_at, synced_at, tags_json, raw_payload, last_updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+        )
         cur = self.conn.cursor()
         try:
-            # Determine which raindrop_ids already exist to provide deterministic
-            # inserted count and helpful debug information.
-            ids = [int(t[0]) for t in to_insert]
-            # Prepare a safe parameter list for IN clause
-            placeholders = ",".join(["?" for _ in ids]) if ids else ""
-            existing_ids = set()
-            if ids:
-                cur.execute(
-                    f"SELECT raindrop_id FROM raindrop_links WHERE raindrop_id IN ({placeholders})",
-                    ids,
-                )
-                rows = cur.fetchall()
-                existing_ids = {int(r[0]) for r in rows}
-
-            new_ids = [i for i in ids if i not in existing_ids]
+            cur.execute("BEGIN")
+            cur.executemany(insert + " ON CONFLICT(raindrop_id) DO NOTHING", rows)
+            inserted = max(cur.rowcount, 0)
+            if inserted < len(rows):
+                # Rows inserted above match exactly, so the WHERE clause only
+                # lets genuinely changed existing rows through.
+                cur.executemany(insert + _UPSERT_CHANGED, rows)
+                updated = max(cur.rowcount, 0)
+            else:
+                updated = 0
             Logger.debug(
-                "Inserting batch: total=%d, existing=%d, new=%d",
-                len(ids),
-                len(existing_ids),
-                len(new_ids),
+                "Upserted batch: total=%d, inserted=%d, updated=%d",
+                len(rows),
+                inserted,
+                updated,
             )
+            self._save_checkpoints(cur, checkpoints)
+            self._save_collections(cur, collections)
+            self._index_pending_links(cur)
+            self.conn.commit()
+            return inserted, updated
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cur.close()
 
+    def delete_links(self, ids: Iterable[int]) -> int:
+        """Delete links by raindrop id. Returns the number of rows removed."""
+        assert self.conn
+        ids = [(int(i),) for i in ids]
+        if not ids:
+            return 0
+        cur = self.conn.cursor()
+        try:
             cur.execute("BEGIN")
-            cur.executemany(
-                "INSERT OR IGNORE INTO raindrop_links (raindrop_id, collection_id, collection_title, title, url, created_at, synced_at, tags_json, raw_payload) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                to_insert,
-            )
-            # count after (within same transaction)
-            cur.execute("SELECT COUNT(*) FROM raindrop_links")
-            after = int(cur.fetchone()[0])
-            # count before is after - number inserted by this exec
-            inserted = len(new_ids)
+            cur.executemany("DELETE FROM raindrop_links WHERE raindrop_id = ?", ids)
+            removed = max(cur.rowcount, 0)
+            cur.executemany("DELETE FROM link_content WHERE raindrop_id = ?", ids)
+            cur.executemany("DELETE FROM capture_backoff WHERE raindrop_id = ?", ids)
+            cur.executemany("DELETE FROM capture_attempts WHERE raindrop_id = ?", ids)
+            self._index_pending_links(cur)
             self.conn.commit()
-            return inserted
+            return removed
         except Exception:
             self.conn.rollback()
             raise
         finally:
             cur.close()
 
+    def count_links_by_collection(self) -> dict[int, int]:
+        assert self.conn
+        cur = self.conn.cursor()
+        try:
+            cur.execute(
+                "SELECT collection_id, COUNT(*) FROM raindrop_links GROUP BY collection_id"
+            )
+            return {int(r[0]): int(r[1]) for r in cur.fetchall()}
+        finally:
+            cur.close()
+
+    def link_ids_in_collection(self, collection_id: int) -> set[int]:
+        assert self.conn
+        cur = self.conn.cursor()
+        try:
+            cur.execute(
+                "SELECT raindrop_id FROM raindrop_links WHERE collection_id = ?",
+                (collection_id,),
+            )
+            return {int(r[0]) for r in cur.fetchall()}
+        finally:
+            cur.close()
+
+    def _save_checkpoints(
+        self, cur: sqlite3.Cursor, checkpoints: list[SyncCheckpoint]
+    ) -> None:
+        if not checkpoints:
+            return
+        now_iso = datetime.now(timezone.utc).isoformat()
+        cur.executemany(
+            "INSERT OR REPLACE INTO sync_checkpoints (collection_id, run_id, cursor_iso, offset, max_created_iso, completed, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    cp.collection_id,
+                    cp.run_id,
+                    cp.cursor_iso,
+                    cp.offset,
+                    cp.max_created_iso,
+                    1 if cp.completed else 0,
+                    now_iso,
+                )
+                for cp in checkpoints
+            ],
+        )
+
+    def _save_collections(
+        self, cur: sqlite3.Cursor, collections: list[Collection]
+    ) -> None:
+        if not collections:
+            return
+        now_iso = datetime.now(timezone.utc).isoformat()
+        cur.executemany(
+            "INSERT OR REPLACE INTO collections (collection_id, title, count, parent_id, color, created_at, last_updated_at, access_level, synced_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    c.id,
+                    c.title,
+                    c.count,
+                    c.parent_id,
+                    c.color,
+                    c.created_at.isoformat(),
+                    c.last_updated_at.isoformat(),
+                    c.access_level,
+                    now_iso,
+                )
+                for c in collections
+            ],
+        )
+
+    def get_collections(self) -> dict[int, Collection]:
+        """Return the collection metadata recorded by the last sync, keyed by id."""
+        assert self.conn
+        cur = self.conn.cursor()
+        try:
+            cur.execute(
+                "SELECT collection_id, title, count, parent_id, color, created_at, last_updated_at, access_level FROM collections"
+            )
+            return {
+                int(row[0]): Collection(
+                    id=int(row[0]),
+                    title=row[1],
+                    count=int(row[2]),
+                    parent_id=row[3],
+                    color=row[4],
+                    created_at=datetime.fromisoformat(row[5]),
+                    last_updated_at=datetime.fromisoformat(row[6]),
+                    access_level=int(row[7]),
+                )
+                for row in cur.fetchall()
+            }
+        finally:
+            cur.close()
+
+    def get_checkpoints(self) -> dict[int, SyncCheckpoint]:
+        """Return the sync checkpoint of every collection, keyed by collection id."""
+        assert self.conn
+        cur = self.conn.cursor()
+        try:
+            cur.execute(
+                "SELECT collection_id, run_id, cursor_iso, offset, max_created_iso, completed, updated_at FROM sync_checkpoints"
+            )
+            return {
+                int(row[0]): SyncCheckpoint(
+                    collection_id=int(row[0]),
+                    run_id=row[1],
+                    cursor_iso=row[2],
+                    offset=int(row[3]),
+                    max_created_iso=row[4],
+                    completed=bool(row[5]),
+                    updated_at=row[6],
+                )
+                for row in cur.fetchall()
+            }
+        finally:
+            cur.close()
+
     def get_sync_state(self) -> Optional[SyncState]:
         assert self.conn
         cur = self.conn.cursor()
         try:
             cur.execute(
-                "SELECT last_cursor_iso, last_run_at, db_version, last_full_refresh FROM sync_state WHERE id = 1"
+                "SELECT last_cursor_iso, last_run_at, db_version, last_full_refresh, last_update_iso FROM sync_state WHERE id = 1"
             )
             row = cur.fetchone()
             if not row:
@@ -312,6 +1818,7 @@ class SQLiteStore:
                 last_run_at=row[1],
                 db_version=int(row[2]),
                 last_full_refresh=row[3],
+                last_update_iso=row[4] or "",
             )
         finally:
             cur.close()
@@ -321,12 +1828,13 @@ class SQLiteStore:
         cur = self.conn.cursor()
         try:
             cur.execute(
-                "INSERT OR REPLACE INTO sync_state (id, last_cursor_iso, last_run_at, db_version, last_full_refresh) VALUES (1, ?, ?, ?, ?)",
+                "INSERT OR REPLACE INTO sync_state (id, last_cursor_iso, last_run_at, db_version, last_full_refresh, last_update_iso) VALUES (1, ?, ?, ?, ?, ?)",
                 (
                     state.last_cursor_iso,
                     state.last_run_at,
                     state.db_version,
                     state.last_full_refresh,
+                    state.last_update_iso or None,
                 ),
             )
             self.conn.commit()
@@ -359,49 +1867,127 @@ class SQLiteStore:
         finally:
             cur.close()
 
-    # --- Tagging helpers -------------------------------------------------
-    def fetch_untagged_links(self, limit: Optional[int] = None) -> List[tuple]:
-        """Return list of (raindrop_id, title, url, content_markdown) for links with no auto_tags_json.
+    # --- Full-text search ------------------------------------------------
+    def search(self, query: str, limit: int = 20) -> List[SearchHit]:
+        """Rank links matching `query` over title, URL, tags and content (BM25).
 
-        Ordered by synced_at ascending.
+        `query` uses FTS5 syntax (phrases, OR/NOT, prefix*, column filters);
+        input that is not valid syntax is searched as plain words instead.
         """
         assert self.conn
+        sql = (
+            f"SELECT s.rowid, l.title, l.url, {SEARCH_RANK} AS score "
+            "FROM link_search AS s JOIN raindrop_links AS l ON l.raindrop_id = s.rowid "
+            "WHERE link_search MATCH ? ORDER BY score LIMIT ?"
+        )
         cur = self.conn.cursor()
         try:
-            # Inspect columns to handle older DBs without migration columns
-            cur.execute("PRAGMA table_info(raindrop_links)")
-            cols = {r[1] for r in cur.fetchall()}
-
-            select_fields = ["raindrop_id", "title", "url"]
-            if "content_markdown" in cols:
-                select_fields.append("content_markdown")
-            else:
-                select_fields.append("NULL as content_markdown")
-
-            # If auto_tags_json doesn't exist, treat all rows as untagged.
-            # If the column exists, consider rows untagged when the column is NULL,
-            # empty, or contains an empty list literal '[]'. This handles cases
-            # where tags were written as an empty JSON array or an empty string.
-            if "auto_tags_json" in cols:
-                where = "(auto_tags_json IS NULL OR trim(auto_tags_json) = '' OR trim(auto_tags_json) = '[]')"
-            else:
-                where = "1=1"
+            try:
+                cur.execute(sql, (query, limit))
+            except sqlite3.OperationalError as exc:
+                if not str(exc).startswith(FTS_QUERY_ERRORS):
+                    raise
+                query = " ".join('"' + w.replace('"', '""') + '"' for w in query.split())
+                if not query:
+                    return []
+                cur.execute(sql, (query, limit))
+            rows = cur.fetchall()
+            # Only the top `limit` rows get snippets.
+            snippets = self._snippets(cur, query, [int(r[0]) for r in rows])
+            return [
+                SearchHit(
+                    raindrop_id=int(r[0]),
+                    title=r[1],
+                    url=r[2],
+                    score=round(-float(r[3]), 4),
+                    snippet=snippets.get(int(r[0])),
+                )
+                for r in rows
+            ]
+        finally:
+            cur.close()
 
-            q = f"SELECT {', '.join(select_fields)} FROM raindrop_links WHERE {where} ORDER BY synced_at"
-            if limit:
-                q = q + " LIMIT ?"
-                cur.execute(q, (limit,))
-            else:
-                cur.execute(q)
+    def _snippets(self, cur: sqlite3.Cursor, query: str, ids: List[int]) -> dict[int, str]:
+        """Highlighted snippets of links `ids` for `query`, by raindrop id.
 
-            rows = cur.fetchall()
-            Logger.debug(
-                "fetch_untagged_links: query=%s limit=%r returned=%d rows",
-                q,
-                limit,
-                len(rows),
+        The contentless index keeps no text, so the links' decoded rows are
+        indexed in a temporary table with the same tokenizer and the
+        snippets taken from there.
+        """
+        assert self.conn
+        if not ids:
+            return {}
+        cur.execute(
+            "SELECT l.raindrop_id, l.title, l.url, l.tags_json, l.auto_tags_json, "
+            "c.content_markdown, c.codec FROM raindrop_links AS l "
+            "LEFT JOIN link_content AS c ON c.raindrop_id = l.raindrop_id "
+            f"WHERE l.raindrop_id IN ({', '.join('?' * len(ids))})",
+            ids,
+        )
+        rows = [(*r[:5], self._decode_content(r[5], r[6])) for r in cur.fetchall()]
+        cur.execute(SNIPPET_INDEX_SQL)
+        try:
+            cur.executemany(
+                "INSERT INTO temp.link_snippet(rowid, title, url, tags, auto_tags, content) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            cur.execute(
+                "SELECT rowid, snippet(link_snippet, -1, '[', ']', '…', 16) "
+                "FROM temp.link_snippet WHERE link_snippet MATCH ?",
+                (query,),
             )
-            return [(int(r[0]), r[1], r[2], r[3]) for r in rows]
+            return {int(r[0]): r[1] for r in cur.fetchall()}
+        finally:
+            cur.execute("DELETE FROM temp.link_snippet")
+            self.conn.commit()
+
+    def rebuild_search_index(self) -> None:
+        """Re-index every link from scratch (repair after external edits)."""
+        assert self.conn
+        cur = self.conn.cursor()
+        try:
+            cur.execute("BEGIN")
+            self._index_all_links(cur)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cur.close()
+
+    # --- Tagging helpers -------------------------------------------------
+    def iter_untagged_links(
+        self, limit: Optional[int] = None, page_size: int = 100
+    ) -> Iterator[tuple]:
+        """Yield (raindrop_id, title, url, content_markdown) for links with no auto_tags_json.
+
+        Ordered by synced_at ascending; each page is a range read on the
+        idx_links_untagged partial index, so only `page_size` markdown
+        bodies are held at a time.
+        """
+        # has_auto_tags is 0 when auto_tags_json is NULL, empty, or
+        # contains an empty list literal '[]'.
+        return self._iter_keyset(
+            "SELECT l.raindrop_id, l.title, l.url, c.content_markdown, c.codec, l.synced_at, l.raindrop_id "
+            "FROM raindrop_links AS l LEFT JOIN link_content AS c ON c.raindrop_id = l.raindrop_id",
+            "l.has_auto_tags = 0",
+            ("l.synced_at", "l.raindrop_id"),
+            lambda r: (int(r[0]), r[1], r[2], self._decode_content(r[3], r[4])),
+            limit,
+            page_size,
+        )
+
+    def fetch_untagged_links(self, limit: Optional[int] = None) -> List[tuple]:
+        """Return list of (raindrop_id, title, url, content_markdown) for untagged links."""
+        return list(self.iter_untagged_links(limit))
+
+    def count_untagged_links(self) -> int:
+        assert self.conn
+        cur = self.conn.cursor()
+        try:
+            cur.execute("SELECT COUNT(*) FROM raindrop_links WHERE has_auto_tags = 0")
+            return int(cur.fetchone()[0])
         finally:
             cur.close()
 
@@ -413,26 +1999,12 @@ class SQLiteStore:
         assert self.conn
         cur = self.conn.cursor()
         try:
-            # Ensure tagging columns exist (safe to call multiple times)
-            cur.execute("PRAGMA table_info(raindrop_links)")
-            cols = {r[1] for r in cur.fetchall()}
-            to_add = []
-            if "auto_tags_json" not in cols:
-                to_add.append(
-                    "ALTER TABLE raindrop_links ADD COLUMN auto_tags_json TEXT DEFAULT NULL"
-                )
-            if "auto_tags_meta_json" not in cols:
-                to_add.append(
-                    "ALTER TABLE raindrop_links ADD COLUMN auto_tags_meta_json TEXT DEFAULT NULL"
-                )
-            for stmt in to_add:
-                cur.execute(stmt)
-
             cur.execute("BEGIN")
             cur.executemany(
-                "UPDATE raindrop_links SET auto_tags_json = ?, auto_tags_meta_json = ? WHERE raindrop_id = ?",
-                [(e[1], e[2], e[0]) for e in entries],
+                "UPDATE raindrop_links SET auto_tags_json = ?, auto_tags_meta_json = ?, has_auto_tags = ? WHERE raindrop_id = ?",
+                [(e[1], e[2], _has_auto_tags(e[1]), e[0]) for e in entries],
             )
+            self._index_pending_links(cur)
             self.conn.commit()
         except Exception:
             self.conn.rollback()
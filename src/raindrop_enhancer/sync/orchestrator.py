@@ -2,12 +2,29 @@
 
 from __future__ import annotations
 
+import asyncio
+import inspect
+import queue
+import threading
+import time
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable
+from typing import Callable
 
-from ..api.raindrop_client import RaindropClient
-from ..models import Raindrop, RaindropLink, SyncOutcome, SyncState
+from ..api.raindrop_client import (
+    SINCE_PER_PAGE,
+    AsyncRaindropClient,
+    RaindropClient,
+)
+from ..models import (
+    Collection,
+    Raindrop,
+    RaindropLink,
+    SyncCheckpoint,
+    SyncOutcome,
+    SyncState,
+)
 from ..storage.sqlite_store import SQLiteStore
 from typing import Optional
 import logging
@@ -16,6 +33,9 @@ import logging
 Logger = logging.getLogger(__name__)
 Logger.debug("Started logging in orchestrator.py")
 
+# Number of links converted before they are written in one upsert_batch call.
+BATCH_SIZE = 100
+
 
 def default_db_path() -> Path:
     # Platform-specific default paths per spec (minimal mapping)
@@ -31,16 +51,177 @@ def default_db_path() -> Path:
     return base / "raindrops.db"
 
 
+def _collection_id(coll: dict) -> Optional[int]:
+    cid = coll.get("_id") or coll.get("id")
+    return int(cid) if cid is not None else None
+
+
+def _with_unsorted(collections: list) -> list:
+    """Ensure the special 'Unsorted' collection (-1) is part of the list.
+
+    Only applied when the client returned at least one collection.
+    """
+    if collections:
+        try:
+            has_unsorted = any(
+                (c.get("_id") == -1 or c.get("id") == -1) for c in collections
+            )
+        except Exception:
+            has_unsorted = False
+        if not has_unsorted:
+            collections.append({"_id": -1})
+    return collections
+
+
+def _unchanged(coll: dict, known: Optional[Collection]) -> bool:
+    """True when `coll` (API payload) matches the metadata of its last full sync.
+
+    Payloads without `lastUpdate` (e.g. the synthetic Unsorted entry) are
+    always treated as changed.
+    """
+    if known is None or not coll.get("lastUpdate"):
+        return False
+    current = Collection.from_api(coll)
+    return (
+        current.last_updated_at == known.last_updated_at
+        and current.count == known.count
+    )
+
+
+def _as_utc(value: str | datetime) -> Optional[datetime]:
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _later_iso(
+    current: Optional[str], candidate: Optional[str | datetime]
+) -> Optional[str]:
+    """Return the later of two timestamps as ISO8601 (either may be missing)."""
+    cand = _as_utc(candidate) if candidate else None
+    cur = _as_utc(current) if current else None
+    if cand is None:
+        return current
+    if cur is None or cand > cur:
+        return cand.isoformat()
+    return current
+
+
 def _now_iso() -> str:
     # timezone-aware ISO8601 UTC with 'Z' suffix
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
 
+class _PipelineStopped(Exception):
+    """Raised inside the producer when the writer has stopped consuming."""
+
+
+@dataclass
+class _EndOfStream:
+    error: Optional[BaseException] = None
+
+
+@dataclass
+class _Batch:
+    """Converted links plus the checkpoint to commit in the same transaction."""
+
+    links: list
+    checkpoint: SyncCheckpoint
+    # set on the final batch of a walk, recorded as synced with it
+    collection: Optional[Collection] = None
+
+
+class _CollectionWalk:
+    """Progress of one collection walk: batching, offsets and checkpoints.
+
+    `offset` counts the items of this walk (same cursor, same ordering)
+    handed out in batches so far. Pages have a fixed size, so a resumed walk
+    restarts at page `offset // per_page` and drops the first
+    `offset % per_page` items of that page.
+    """
+
+    def __init__(
+        self,
+        coll: dict,
+        cid: int,
+        run_id: str,
+        convert: Callable[[dict, dict], RaindropLink],
+        *,
+        cursor: Optional[str],
+        offset: int = 0,
+        max_created_iso: Optional[str] = None,
+        per_page: int = SINCE_PER_PAGE,
+    ) -> None:
+        self.coll = coll
+        self.cid = cid
+        self.run_id = run_id
+        self.cursor = cursor
+        self.offset = offset
+        self.max_created_iso = max_created_iso
+        self.start_page = offset // per_page
+        self._skip = offset % per_page
+        self._convert = convert
+        self._links: list = []
+
+    def resume_kwargs(self) -> dict:
+        # Only pass start_page when resuming so simple clients keep working.
+        return {"start_page": self.start_page} if self.start_page else {}
+
+    def feed(self, item: dict) -> Optional[_Batch]:
+        if self._skip > 0:
+            self._skip -= 1
+            return None
+        link = self._convert(self.coll, item)
+        self.offset += 1
+        if self.max_created_iso is None or link.created_at > self.max_created_iso:
+            self.max_created_iso = link.created_at
+        self._links.append(link)
+        if len(self._links) >= BATCH_SIZE:
+            return self._batch(completed=False)
+        return None
+
+    def finish(self) -> _Batch:
+        batch = self._batch(completed=True)
+        batch.collection = Collection.from_api(self.coll)
+        return batch
+
+    def _batch(self, completed: bool) -> _Batch:
+        links, self._links = self._links, []
+        return _Batch(
+            links,
+            SyncCheckpoint(
+                collection_id=self.cid,
+                run_id=self.run_id,
+                cursor_iso=self.cursor,
+                offset=self.offset,
+                max_created_iso=self.max_created_iso,
+                completed=completed,
+            ),
+        )
+
+
 class Orchestrator:
-    def __init__(self, db_path: Path | str, client: RaindropClient):
+    def __init__(
+        self, db_path: Path | str, client: RaindropClient | AsyncRaindropClient
+    ):
         self.db_path = Path(db_path)
         self.client = client
         self.store = SQLiteStore(self.db_path)
+        # Pipelined mode: fetch on a producer thread while this thread writes.
+        self.pipeline = False
+        # Max converted batches (of BATCH_SIZE links) buffered between stages.
+        self.queue_size = 8
+        # Links accumulated by the writer before committing one transaction.
+        self.commit_every = 1000
+        # Incremental runs walk by lastUpdate and apply edits and deletions.
+        self.track_changes = False
+        # SQLite connection profile (see storage.sqlite_store.DB_PROFILES).
+        self.db_profile = self.store.profile
 
     def run(self, full_refresh: bool = False, dry_run: bool = False) -> SyncOutcome:
         started = datetime.now(timezone.utc)
@@ -50,35 +231,59 @@ class Orchestrator:
         # ensures commands like `--dry-run --full-refresh` do not produce a
         # side-effect of creating the DB on disk.
         state = None
+        checkpoints: dict = {}
+        known_collections: dict = {}
         if not dry_run:
+            # applied when the connection is opened
+            self.store.profile = self.db_profile
             self.store.connect()
 
             if not self.store.quick_check():
                 raise RuntimeError("Database integrity check failed")
             state = self.store.get_sync_state()
+            checkpoints = self.store.get_checkpoints()
+            known_collections = self.store.get_collections()
 
-        was_full = False
-        if full_refresh or state is None:
-            # baseline: no state or full refresh requested
-            was_full = True
-            if not dry_run:
-                # create a backup first
-                _ = self.store.backup_db()
-                # recreate db file (store.backup_db closes the connection)
-                if self.db_path.exists():
-                    try:
-                        self.db_path.unlink()
-                    except Exception:
-                        pass
-                self.store = SQLiteStore(self.db_path)
-                self.store.connect()
+        # An interrupted run leaves incomplete checkpoints behind; resume it
+        # (under its original run id) instead of starting over.
+        run_id = started.isoformat()
+        interrupted = [cp for cp in checkpoints.values() if not cp.completed]
+        resumed = bool(interrupted) and not full_refresh
+        if resumed:
+            run_id = interrupted[0].run_id
+            Logger.info("Resuming interrupted sync run %s", run_id)
+
+        was_full = full_refresh or state is None
+        shadow = False
+        if not dry_run:
+            if resumed and self.store.shadow_refresh_pending(run_id):
+                # continue the interrupted full refresh where it stopped
+                was_full = shadow = True
+                self.store.begin_shadow_refresh(run_id, resume=True)
+            elif was_full and not resumed:
+                self.store.reset_sync_progress()
+                checkpoints = {}
+                known_collections = {}
+                if self.store.count_links() > 0:
+                    # Rebuild next to the live table so captured content and
+                    # tags survive and readers are not disrupted.
+                    shadow = True
+                    self.store.begin_shadow_refresh(run_id)
+            if not shadow and self.store.shadow_refresh_pending():
+                # left by a refresh this run does not continue; never swap
+                # it in later
+                self.store.discard_shadow_refresh()
 
         # metrics and tracking
         total_inserted = 0
         total_seen = 0
+        write_seconds = 0.0
         requests_count = 0
         retries_count = 0
         max_created_iso: Optional[str] = None
+        max_updated_iso: Optional[str] = None
+        collections_skipped = 0
+        changes = {"updated": 0, "deleted": 0}
 
         # wrap client's callbacks to count requests/retries without clobbering existing handlers
         orig_on_request = getattr(self.client, "on_request", None)
@@ -104,68 +309,143 @@ class Orchestrator:
 
         self.client.on_request = _on_request
         self.client.on_retry = _on_retry
+        slept_before = float(getattr(self.client, "slept_seconds", 0.0) or 0.0)
+
+        # A full refresh rebuilds from scratch, so it must not reuse the old cursor.
+        cursor = state.last_cursor_iso if (state and not was_full) else None
 
-        # Fetch collections once and ensure the special 'Unsorted' collection (-1)
-        # is always included so those raindrops aren't missed.
-        collections = list(self.client.list_collections())
-        # If the client returned at least one collection, ensure the special
-        # 'Unsorted' collection (-1) is present so those raindrops aren't missed.
-        if collections:
+        def _convert(coll: dict, item: dict) -> RaindropLink:
+            nonlocal total_seen, max_created_iso, max_updated_iso
+            total_seen += 1
+            r = Raindrop.from_api(item, collection_title=coll.get("title", ""))
+            if item.get("lastUpdate"):
+                max_updated_iso = _later_iso(max_updated_iso, r.last_updated_at)
+            # track max created timestamp seen
             try:
-                has_unsorted = any(
-                    (c.get("_id") == -1 or c.get("id") == -1) for c in collections
-                )
+                created_iso = r.created_at.isoformat()
             except Exception:
-                has_unsorted = False
-            if not has_unsorted:
-                collections.append({"_id": -1})
+                created_iso = None
+            if created_iso:
+                if max_created_iso is None or created_iso > max_created_iso:
+                    max_created_iso = created_iso
+            return RaindropLink.from_raindrop(r, synced_at=datetime.now(timezone.utc))
 
-        for coll in collections:
-            cid = coll.get("_id") or coll.get("id")
+        def _start_walk(coll: dict) -> Optional[_CollectionWalk]:
+            """Plan the walk for one collection, or None when it can be skipped."""
+            nonlocal collections_skipped
+            cid = _collection_id(coll)
             if cid is None:
-                continue
+                return None
+            cp = checkpoints.get(cid)
+            if cp is not None and cp.run_id == run_id and cp.completed:
+                Logger.info("Collection %s already synced in this run", cid)
+                return None
+            if not was_full and _unchanged(coll, known_collections.get(cid)):
+                Logger.info("Skipping unchanged collection: id=%s", cid)
+                collections_skipped += 1
+                return None
             Logger.info(
                 "Syncing collection: id=%s title=%s", cid, coll.get("title", "")
             )
-            iterator = self.client.list_raindrops_since(
-                int(cid), state.last_cursor_iso if state else None
+            if cp is not None and cp.run_id == run_id:
+                # resume exactly after the last committed item of this walk
+                return _CollectionWalk(
+                    coll,
+                    cid,
+                    run_id,
+                    _convert,
+                    cursor=cp.cursor_iso,
+                    offset=cp.offset,
+                    max_created_iso=cp.max_created_iso,
+                )
+            coll_cursor = None
+            if not was_full:
+                coll_cursor = (cp.max_created_iso if cp else None) or cursor
+            return _CollectionWalk(
+                coll,
+                cid,
+                run_id,
+                _convert,
+                cursor=coll_cursor,
             )
-            batch = []
-            for item in iterator:
-                total_seen += 1
-                r = Raindrop.from_api(item, collection_title=coll.get("title", ""))
-                # track max created timestamp seen
-                try:
-                    created_iso = r.created_at.isoformat()
-                except Exception:
-                    created_iso = None
-                if created_iso:
-                    if max_created_iso is None or created_iso > max_created_iso:
-                        max_created_iso = created_iso
-                link = RaindropLink.from_raindrop(
-                    r, synced_at=datetime.now(timezone.utc)
+
+        def _write(batches: list) -> None:
+            nonlocal total_inserted, write_seconds
+            if not batches or dry_run:
+                return
+            links = [link for b in batches for link in b.links]
+            # keep only the newest checkpoint per collection
+            latest = {b.checkpoint.collection_id: b.checkpoint for b in batches}
+            synced = [b.collection for b in batches if b.collection is not None]
+            t0 = time.perf_counter()
+            inserted, updated = self.store.upsert_batch(
+                links, checkpoints=latest.values(), collections=synced
+            )
+            write_seconds += time.perf_counter() - t0
+            Logger.debug(
+                "Inserted batch: batch_size=%d, inserted=%d, updated=%d",
+                len(links),
+                inserted,
+                updated,
+            )
+            total_inserted += inserted
+            changes["updated"] += updated
+
+        def _fetch_all(emit: Callable[[_Batch], None]) -> None:
+            """Fetch every collection, handing off checkpointed batches to `emit`."""
+            if isinstance(self.client, AsyncRaindropClient):
+                asyncio.run(self._fetch_concurrently(_start_walk, emit))
+                return
+            # Fetch collections once and ensure the special 'Unsorted'
+            # collection (-1) is included so those raindrops aren't missed.
+            collections = _with_unsorted(list(self.client.list_collections()))
+            for coll in collections:
+                walk = _start_walk(coll)
+                if walk is None:
+                    continue
+                items = self.client.list_raindrops_since(
+                    walk.cid, walk.cursor, **walk.resume_kwargs()
                 )
-                batch.append(link)
-                if len(batch) >= 100:
-                    if not dry_run:
-                        inserted = self.store.insert_batch(batch)
-                        Logger.debug(
-                            "Inserted batch: batch_size=%d, inserted=%d",
-                            len(batch),
-                            inserted,
-                        )
-                        total_inserted += inserted
-                    batch = []
-            if batch:
-                if not dry_run:
-                    inserted = self.store.insert_batch(batch)
-                    Logger.debug(
-                        "Inserted final batch: batch_size=%d, inserted=%d",
-                        len(batch),
-                        inserted,
-                    )
-                    total_inserted += inserted
-        Logger.debug("Total seen: %d, total inserted: %d", total_seen, total_inserted)
+                for item in items:
+                    batch = walk.feed(item)
+                    if batch is not None:
+                        emit(batch)
+                emit(walk.finish())
+
+        # Change tracking needs a previous run to compare against; baselines
+        # and resumed runs use the created-order walk.
+        track_changes = (
+            self.track_changes and not was_full and not resumed and not dry_run
+        )
+
+        loop_started = time.perf_counter()
+        stages = {"fetch_blocked": 0.0, "write_wait": 0.0}
+        try:
+            if track_changes:
+                since = state.last_update_iso or None
+                if since is None:
+                    Logger.info("No lastUpdate high-water mark yet; walking all raindrops")
+                changes = asyncio.run(self._sync_changes(since, _convert))
+                total_inserted = changes["inserted"]
+                write_seconds = changes["write_seconds"]
+                fetch_seconds = time.perf_counter() - loop_started - write_seconds
+            elif self.pipeline and not dry_run:
+                stages = self._run_pipelined(_fetch_all, _write)
+                fetch_seconds = stages["fetch"]
+            else:
+                _fetch_all(lambda batch: _write([batch]))
+                fetch_seconds = time.perf_counter() - loop_started - write_seconds
+            Logger.debug("Total seen: %d, total inserted: %d", total_seen, total_inserted)
+            if shadow:
+                self.store.finish_shadow_refresh()
+        except Exception:
+            if shadow and not any(
+                cp.run_id == run_id for cp in self.store.get_checkpoints().values()
+            ):
+                # nothing of this refresh was committed, so there is nothing
+                # to resume; keep only the live table
+                self.store.discard_shadow_refresh()
+            raise
 
         # compute total_links
         total_links = 0
@@ -175,13 +455,24 @@ class Orchestrator:
         # update sync state
         now_iso = _now_iso()
         if not dry_run:
-            # set last_cursor_iso to observed max_created_iso if available, otherwise now
-            cursor = max_created_iso or _now_iso()
+            # set last_cursor_iso to the max created seen (including by the
+            # interrupted part of a resumed run), otherwise now
+            seen = [max_created_iso] + [
+                cp.max_created_iso for cp in self.store.get_checkpoints().values()
+            ]
+            seen = [s for s in seen if s]
+            cursor = max(seen) if seen else _now_iso()
+            # The lastUpdate high-water mark only advances when every change
+            # was seen: on baselines and change-tracking runs.
+            last_update_iso = state.last_update_iso if state else ""
+            if was_full or track_changes:
+                last_update_iso = _later_iso(last_update_iso, max_updated_iso) or ""
             new_state = SyncState(
                 last_cursor_iso=cursor,
                 last_run_at=now_iso,
                 db_version=1,
                 last_full_refresh=now_iso if was_full else "",
+                last_update_iso=last_update_iso,
             )
             self.store.upsert_sync_state(new_state)
 
@@ -196,4 +487,239 @@ class Orchestrator:
         )
         outcome.requests_count = requests_count
         outcome.retries_count = retries_count
+        outcome.collections_skipped = collections_skipped
+        outcome.resumed = resumed
+        outcome.updated_links = changes["updated"]
+        outcome.deleted_links = changes["deleted"]
+        outcome.fetch_seconds = fetch_seconds
+        outcome.write_seconds = write_seconds
+        outcome.fetch_blocked_seconds = stages["fetch_blocked"]
+        outcome.write_wait_seconds = stages["write_wait"]
+        outcome.sleep_seconds = (
+            float(getattr(self.client, "slept_seconds", 0.0) or 0.0) - slept_before
+        )
         return outcome
+
+    def _run_pipelined(
+        self,
+        fetch_all: Callable[[Callable[["_Batch"], None]], None],
+        write: Callable[[list], None],
+    ) -> dict:
+        """Run `fetch_all` on a producer thread and `write` on this thread.
+
+        Batches flow through a queue bounded by `queue_size`, which caps how
+        many fetched-but-unwritten links are held in memory. The writer
+        commits every `commit_every` links in one transaction. The SQLite
+        connection is only ever used from the calling thread.
+
+        Returns stage timings in seconds: `fetch` (producer wall time),
+        `fetch_blocked` (producer waiting on a full queue, i.e. the writer is
+        the bottleneck) and `write_wait` (writer waiting on an empty queue,
+        i.e. fetching is the bottleneck).
+        """
+        q: queue.Queue = queue.Queue(maxsize=max(1, self.queue_size))
+        stop = threading.Event()
+        stats = {"fetch": 0.0, "fetch_blocked": 0.0, "write_wait": 0.0}
+
+        def _put(item) -> None:
+            t0 = time.perf_counter()
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            stats["fetch_blocked"] += time.perf_counter() - t0
+            if stop.is_set():
+                raise _PipelineStopped()
+
+        def _producer() -> None:
+            t0 = time.perf_counter()
+            error: Optional[BaseException] = None
+            try:
+                fetch_all(_put)
+            except _PipelineStopped:
+                return
+            except BaseException as exc:
+                error = exc
+            finally:
+                stats["fetch"] = time.perf_counter() - t0
+            try:
+                _put(_EndOfStream(error))
+            except _PipelineStopped:
+                pass
+
+        producer = threading.Thread(
+            target=_producer, name="raindrop-sync-fetch", daemon=True
+        )
+        producer.start()
+        pending: list = []
+        pending_links = 0
+        try:
+            while True:
+                t0 = time.perf_counter()
+                item = q.get()
+                stats["write_wait"] += time.perf_counter() - t0
+                if isinstance(item, _EndOfStream):
+                    write(pending)
+                    if item.error is not None:
+                        raise item.error
+                    break
+                pending.append(item)
+                pending_links += len(item.links)
+                if pending_links >= self.commit_every:
+                    write(pending)
+                    pending = []
+                    pending_links = 0
+        finally:
+            stop.set()
+            producer.join()
+        Logger.debug(
+            "Pipeline stages: fetch=%.3fs fetch_blocked=%.3fs write_wait=%.3fs",
+            stats["fetch"],
+            stats["fetch_blocked"],
+            stats["write_wait"],
+        )
+        return stats
+
+    async def _fetch_concurrently(
+        self,
+        start_walk: Callable[[dict], Optional["_CollectionWalk"]],
+        emit: Callable[["_Batch"], None],
+    ) -> None:
+        """Fetch all collections concurrently through an `AsyncRaindropClient`.
+
+        `start_walk`/`emit` are called on the event loop thread, which is the
+        caller's thread unless the run is pipelined (then it is the producer).
+        """
+        client = self.client
+        try:
+            collections = _with_unsorted(list(await client.list_collections()))
+
+            async def _worker(coll: dict) -> None:
+                walk = start_walk(coll)
+                if walk is None:
+                    return
+                items = client.list_raindrops_since(
+                    walk.cid,
+                    walk.cursor,
+                    count=coll.get("count"),
+                    **walk.resume_kwargs(),
+                )
+                async for item in items:
+                    batch = walk.feed(item)
+                    if batch is not None:
+                        emit(batch)
+                emit(walk.finish())
+
+            await client.map_collections(collections, _worker)
+        finally:
+            await client.aclose()
+
+    async def _sync_changes(
+        self,
+        since_iso: Optional[str],
+        convert: Callable[[dict, dict], RaindropLink],
+    ) -> dict:
+        """Apply raindrops created, edited or deleted since `since_iso`.
+
+        - Walks all raindrops (collection 0) by descending `lastUpdate` until
+          the high-water mark and upserts them in BATCH_SIZE chunks as they
+          arrive.
+        - Deletes raindrops moved to the trash (-99) since then.
+        - Reconciles remaining drift (e.g. raindrops removed permanently) by
+          comparing each collection's `count` with the local row count and
+          re-walking only collections that differ.
+
+        Works with both client flavours; returns inserted/updated/deleted
+        counts and the time spent writing.
+        """
+        client = self.client
+        stats = {"inserted": 0, "updated": 0, "deleted": 0, "write_seconds": 0.0}
+
+        async def _iterate(name: str, *args):
+            """Yield the items of a client listing as they arrive."""
+            result = getattr(client, name)(*args)
+            if hasattr(result, "__aiter__"):
+                async for it in result:
+                    yield it
+                return
+            if inspect.isawaitable(result):
+                result = await result
+            for it in result:
+                yield it
+
+        async def _fetch(name: str, *args) -> list:
+            return [it async for it in _iterate(name, *args)]
+
+        async def _chunks(items):
+            # apply the feed in upsert_batch-sized chunks instead of loading
+            # every change first
+            chunk = []
+            async for it in items:
+                chunk.append(it)
+                if len(chunk) >= BATCH_SIZE:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+
+        async def _upsert(collection_titles: dict, items) -> set:
+            ids = set()
+            async for chunk in _chunks(items):
+                links = []
+                for item in chunk:
+                    cid = int(item.get("collectionId", item.get("collection_id", 0)))
+                    coll = {"title": collection_titles.get(cid, "")}
+                    links.append(convert(coll, item))
+                t0 = time.perf_counter()
+                inserted, updated = self.store.upsert_batch(links)
+                stats["write_seconds"] += time.perf_counter() - t0
+                stats["inserted"] += inserted
+                stats["updated"] += updated
+                ids.update(link.raindrop_id for link in links)
+            return ids
+
+        def _delete(ids) -> None:
+            t0 = time.perf_counter()
+            stats["deleted"] += self.store.delete_links(ids)
+            stats["write_seconds"] += time.perf_counter() - t0
+
+        try:
+            collections = _with_unsorted(await _fetch("list_collections"))
+            titles = {_collection_id(c): c.get("title", "") for c in collections}
+
+            await _upsert(titles, _iterate("list_raindrops_changed_since", 0, since_iso))
+            trashed = _iterate("list_raindrops_changed_since", -99, since_iso)
+            async for chunk in _chunks(trashed):
+                _delete(int(it["_id"]) for it in chunk if "_id" in it)
+
+            expected = {
+                _collection_id(c): int(c["count"])
+                for c in collections
+                if c.get("count") is not None and _collection_id(c) is not None
+            }
+            if hasattr(client, "get_user_stats"):
+                for item in await _fetch("get_user_stats"):
+                    if item.get("_id") == -1 and item.get("count") is not None:
+                        expected[-1] = int(item["count"])
+            local = self.store.count_links_by_collection()
+            for cid, count in expected.items():
+                if local.get(cid, 0) == count:
+                    continue
+                Logger.info(
+                    "Reconciling collection %s: remote=%d local=%d",
+                    cid,
+                    count,
+                    local.get(cid, 0),
+                )
+                remote_ids = await _upsert(titles, _iterate("list_raindrops_since", cid))
+                _delete(self.store.link_ids_in_collection(cid) - remote_ids)
+
+            # record collection metadata so created-order runs can skip them
+            synced = [Collection.from_api(c) for c in collections if c.get("lastUpdate")]
+            self.store.insert_batch([], collections=synced)
+        finally:
+            if isinstance(client, AsyncRaindropClient):
+                await client.aclose()
+        return stats
@@ -89,7 +89,7 @@ def test_capture_json_schema(monkeypatch):
             def __init__(self, *args, **kwargs):
                 pass
 
-            def run(self, limit=None, dry_run=False, refresh=False):
+            def run(self, limit=None, dry_run=False, refresh=False, **kwargs):
                 class S:
                     started_at = datetime.now(timezone.utc)
 
@@ -144,3 +144,79 @@ def test_tag_json_schema(monkeypatch):
     assert result.exit_code == 0
     data = json.loads(result.output)
     assert "processed" in data
+
+
+def test_recompress_json_schema(tmp_path):
+    from raindrop_enhancer.models import RaindropLink
+    from raindrop_enhancer.storage.sqlite_store import SQLiteStore
+
+    entry = _get_entry()
+    if entry is None:
+        return
+    db = tmp_path / "recompress.db"
+    store = SQLiteStore(db, compression="none")
+    store.connect()
+    store.insert_batch(
+        [
+            RaindropLink(
+                raindrop_id=1,
+                collection_id=0,
+                collection_title="",
+                title="t",
+                url="https://example.org/1",
+                created_at="2025-01-01T00:00:00Z",
+                synced_at="2025-01-01T00:00:00Z",
+                tags_json="[]",
+                raw_payload="{}",
+            )
+        ]
+    )
+    store.update_content(1, "compressible markdown line\n" * 50)
+    store.close()
+
+    result = CliRunner().invoke(
+        entry,
+        ["recompress", "--db-path", str(db), "--compression", "zlib", "--no-train-dict", "--json"],
+    )
+    assert result.exit_code == 0, result.output
+    data = json.loads(result.output.strip().splitlines()[-1])
+    assert data["compression"] == "zlib"
+    assert data["rows"] == data["rewritten"] == 1
+    assert data["bytes_after"] < data["bytes_before"]
+    assert data["ratio"] > 1
+
+
+def test_search_json_schema(tmp_path):
+    from raindrop_enhancer.models import RaindropLink
+    from raindrop_enhancer.storage.sqlite_store import SQLiteStore
+
+    entry = _get_entry()
+    if entry is None:
+        return
+    db = tmp_path / "search.db"
+    store = SQLiteStore(db)
+    store.connect()
+    store.insert_batch(
+        [
+            RaindropLink(
+                raindrop_id=1,
+                collection_id=0,
+                collection_title="",
+                title="Full-text search with SQLite",
+                url="https://example.org/fts",
+                created_at="2025-01-01T00:00:00Z",
+                synced_at="2025-01-01T00:00:00Z",
+                tags_json="[]",
+                raw_payload="{}",
+            )
+        ]
+    )
+    store.close()
+
+    result = CliRunner().invoke(entry, ["search", "sqlite", "--db-path", str(db), "--json"])
+    assert result.exit_code == 0, result.output
+    data = json.loads(result.output.strip().splitlines()[-1])
+    assert data["query"] == "sqlite"
+    hit = data["results"][0]
+    assert hit["raindrop_id"] == 1
+    assert {"title", "url", "score", "snippet"} <= set(hit)
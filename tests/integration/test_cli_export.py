@@ -35,3 +35,28 @@ def test_export_success_writes_json(monkeypatch, httpx_mock):
     result = runner.invoke(export, ["--dry-run"])
     assert result.exit_code == 0
     assert "Dry run: collected" in result.output
+
+
+def test_export_concurrent_uses_async_client(monkeypatch, httpx_mock):
+    monkeypatch.setenv("RAINDROP_TOKEN", "x")
+    httpx_mock.add_response(
+        method="GET",
+        url="https://api.raindrop.io/rest/v1/collections",
+        json={"items": [{"_id": 1}, {"_id": 2}]},
+    )
+    for cid in (1, 2):
+        httpx_mock.add_response(
+            method="GET",
+            url=f"https://api.raindrop.io/rest/v1/raindrops/{cid}?page=0&perpage=50",
+            json={"items": [{"_id": cid, "link": f"https://a/{cid}"}]},
+        )
+    httpx_mock.add_response(
+        method="GET",
+        url="https://api.raindrop.io/rest/v1/raindrops/-1?page=0&perpage=50",
+        json={"items": []},
+    )
+
+    runner = CliRunner()
+    result = runner.invoke(export, ["--dry-run", "--concurrency", "3"])
+    assert result.exit_code == 0
+    assert "Dry run: collected 2 active raindrops" in result.output
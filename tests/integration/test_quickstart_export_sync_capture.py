@@ -102,7 +102,7 @@ def test_capture_integration(monkeypatch):
         def __init__(self, *args, **kwargs):
             pass
 
-        def run(self, limit=None, dry_run=False, refresh=False):
+        def run(self, limit=None, dry_run=False, refresh=False, **kwargs):
             return FakeSummary()
 
     monkeypatch.setattr(capture_runner, "CaptureRunner", FakeRunner)
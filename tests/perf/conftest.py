@@ -0,0 +1,16 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def perf_utils():
+    """tests/perf/utils.py, imported by file path (tests/ is not a package)."""
+    utils_path = Path(__file__).resolve().parent / "utils.py"
+    spec = importlib.util.spec_from_file_location("perf_utils", str(utils_path))
+    if spec is None or spec.loader is None:
+        pytest.skip("Could not load perf utils")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)  # type: ignore
+    return module
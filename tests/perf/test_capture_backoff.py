@@ -0,0 +1,103 @@
+import os
+import pytest
+
+
+def test_perf_repeat_capture_skips_dead_links(perf_utils, tmp_path):
+    """Re-run capture on an archive with dead links, with and without backoff."""
+    # Skip perf tests by default; enable by setting ENABLE_PERF=1 in environment
+    if not (os.environ.get("ENABLE_PERF") == "1"):
+        pytest.skip("Perf tests disabled by default")
+    import threading
+    import time
+    import urllib.request
+    from datetime import datetime, timezone
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    from raindrop_enhancer.content.capture_runner import CaptureRunner
+    from raindrop_enhancer.content.fetcher import FetchResult
+    from raindrop_enhancer.models import Raindrop, RaindropLink
+    from raindrop_enhancer.storage.sqlite_store import SQLiteStore
+
+    count = int(os.environ.get("PERF_BACKOFF_LINKS", "200"))
+    dead_every = int(os.environ.get("PERF_BACKOFF_DEAD_EVERY", "4"))
+    timeout = 0.5
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            n = int(self.path.rsplit("/", 1)[-1])
+            if n % dead_every == 0:
+                # a dead link: the client gives up after its timeout
+                time.sleep(timeout * 2)
+                return
+            body = f"<html><body><p>page {n}</p></body></html>".encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        request_queue_size = 128
+
+    server = Server(("0.0.0.0", 0), Handler)
+    server.daemon_threads = True
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    class LocalFetcher:
+        # Minimal urllib fetcher; extraction is not what this test measures.
+        def fetch(self, url):
+            try:
+                with urllib.request.urlopen(url, timeout=timeout) as resp:
+                    return FetchResult(url=url, markdown=resp.read().decode(), error=None)
+            except OSError:
+                return FetchResult(url=url, markdown=None, error="network")
+
+    now = datetime.now(timezone.utc)
+    payloads = perf_utils.make_raindrop_payloads(count)
+    for i, p in enumerate(payloads):
+        p["link"] = f"http://127.0.0.{i % 8 + 1}:{port}/doc/{i}"
+    links = [RaindropLink.from_raindrop(Raindrop.from_api(p), now) for p in payloads]
+    dead = len([i for i in range(count) if i % dead_every == 0])
+
+    store = SQLiteStore(tmp_path / "backoff.db")
+    store.connect()
+    store.insert_batch(links)
+    # the per-host circuit breaker would skip the dead hosts' later links;
+    # this test measures backoff alone
+    runner = CaptureRunner(
+        store,
+        LocalFetcher(),
+        concurrency=16,
+        per_host=2,
+        host_delay=0,
+        circuit_failures=0,
+    )
+    timings = {}
+    try:
+        with perf_utils.Timer() as t:
+            first = runner.run(dry_run=False)
+        timings["first run"] = t.elapsed
+        with perf_utils.Timer() as t:
+            retried = runner.run(dry_run=False, retry_failed=True)
+        timings["retry every failure"] = t.elapsed
+        with perf_utils.Timer() as t:
+            repeat = runner.run(dry_run=False)
+        timings["with backoff"] = t.elapsed
+    finally:
+        server.shutdown()
+        waiting, quarantined = store.capture_backoff_counts()
+        store.close()
+
+    for name, elapsed in timings.items():
+        print(f"{name}: {elapsed:.2f}s")
+    statuses = [a.status for a in first.attempts]
+    assert statuses.count("failed") == dead
+    assert statuses.count("skipped") == 0
+    assert len(retried.attempts) == dead
+    assert repeat.attempts == []
+    assert (waiting, quarantined) == (dead, 0)
+    assert timings["with backoff"] < timings["retry every failure"] / 10
@@ -0,0 +1,140 @@
+import os
+import pytest
+
+
+def _serve(pages, latency):
+    """Start a local HTTP server answering /doc/<n> with pages[n % len] after `latency` s."""
+    import threading
+    import time
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)  # stand-in for network and server time
+            body = pages[int(self.path.rsplit("/", 1)[-1]) % len(pages)].encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        # the default backlog of 5 drops connects at high concurrency
+        request_queue_size = 128
+
+    server = Server(("0.0.0.0", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _html_pages(perf_utils, count, repeat=1):
+    return [
+        "<html><head><title>Doc</title></head><body><article>"
+        + "".join(f"<p>{line}</p>" for line in doc.splitlines() if line) * repeat
+        + "</article></body></html>"
+        for doc in perf_utils.make_markdown_documents(count)
+    ]
+
+
+def _links(perf_utils, count, port):
+    from datetime import datetime, timezone
+    from raindrop_enhancer.models import Raindrop, RaindropLink
+
+    # Spread links over 8 "hosts" (loopback aliases) so per-host limits
+    # still leave room for the global concurrency cap.
+    now = datetime.now(timezone.utc)
+    payloads = perf_utils.make_raindrop_payloads(count)
+    for i, p in enumerate(payloads):
+        p["link"] = f"http://127.0.0.{i % 8 + 1}:{port}/doc/{i}"
+    return [RaindropLink.from_raindrop(Raindrop.from_api(p), now) for p in payloads]
+
+
+class LocalFetcher:
+    """Minimal urllib fetcher, so the runner alone is measured."""
+
+    def download(self, url):
+        from urllib.request import urlopen
+        from raindrop_enhancer.content.fetcher import DownloadResult
+
+        with urlopen(url, timeout=10.0) as resp:
+            return DownloadResult(url=url, html=resp.read().decode(), error=None)
+
+    def fetch(self, url):
+        from raindrop_enhancer.content.fetcher import FetchResult, extract_markdown
+
+        markdown = extract_markdown(self.download(url).html)
+        return FetchResult(url=url, markdown=markdown, error=None)
+
+
+def _capture_rate(perf_utils, db_path, links, **runner_kwargs):
+    from raindrop_enhancer.content.capture_runner import CaptureRunner
+    from raindrop_enhancer.storage.sqlite_store import SQLiteStore
+
+    store = SQLiteStore(db_path)
+    store.connect()
+    store.insert_batch(links)
+    runner = CaptureRunner(store, LocalFetcher(), per_host=2, **runner_kwargs)
+    with perf_utils.Timer() as t:
+        summary = runner.run(dry_run=False)
+    assert [a.link_id for a in summary.attempts] == [l.raindrop_id for l in links]
+    assert store.select_uncaptured() == []
+    store.close()
+    return len(links) / t.elapsed
+
+
+def test_perf_capture_throughput_scales_with_concurrency(perf_utils, tmp_path):
+    """Capture from a local slow HTTP server at increasing concurrency."""
+    # Skip perf tests by default; enable by setting ENABLE_PERF=1 in environment
+    if not (os.environ.get("ENABLE_PERF") == "1"):
+        pytest.skip("Perf tests disabled by default")
+
+    count = int(os.environ.get("PERF_CAPTURE_LINKS", "64"))
+    latency = int(os.environ.get("PERF_CAPTURE_LATENCY_MS", "100")) / 1000
+    server = _serve(_html_pages(perf_utils, 16), latency)
+    links = _links(perf_utils, count, server.server_address[1])
+
+    rates = {}
+    try:
+        for concurrency in (1, 4, 16):
+            rates[concurrency] = _capture_rate(
+                perf_utils, tmp_path / f"c{concurrency}.db", links, concurrency=concurrency
+            )
+            print(f"concurrency={concurrency}: {rates[concurrency]:.1f} links/s")
+    finally:
+        server.shutdown()
+
+    assert rates[4] > rates[1] * 2.5
+    assert rates[16] > rates[4] * 2.5
+
+
+def test_perf_capture_extraction_uses_all_cores(perf_utils, tmp_path):
+    """Capture large pages from a fast server with and without extractor processes."""
+    if not (os.environ.get("ENABLE_PERF") == "1"):
+        pytest.skip("Perf tests disabled by default")
+
+    count = int(os.environ.get("PERF_CAPTURE_LINKS", "64"))
+    cores = os.cpu_count() or 1
+    server = _serve(_html_pages(perf_utils, 16, repeat=20), 0.005)
+    links = _links(perf_utils, count, server.server_address[1])
+
+    try:
+        inline = _capture_rate(perf_utils, tmp_path / "inline.db", links, concurrency=16)
+        pooled = _capture_rate(
+            perf_utils,
+            tmp_path / "pooled.db",
+            links,
+            concurrency=16,
+            extract_workers=cores,
+        )
+    finally:
+        server.shutdown()
+    print(f"inline extraction: {inline:.1f} links/s")
+    print(f"{cores} extractor processes: {pooled:.1f} links/s")
+
+    # Extraction is CPU-bound, so processes only pay off with several cores.
+    if cores >= 4:
+        assert pooled > inline * 1.5
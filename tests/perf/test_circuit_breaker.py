@@ -0,0 +1,87 @@
+import os
+import pytest
+
+
+def test_perf_circuit_breaker_skips_tarpit_host(perf_utils, tmp_path):
+    """Capture an archive where one host never answers, with and without the breaker."""
+    # Skip perf tests by default; enable by setting ENABLE_PERF=1 in environment
+    if not (os.environ.get("ENABLE_PERF") == "1"):
+        pytest.skip("Perf tests disabled by default")
+    import threading
+    import time
+    from datetime import datetime, timezone
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    from raindrop_enhancer.content.capture_runner import CaptureRunner
+    from raindrop_enhancer.content.fetcher import TrafilaturaFetcher
+    from raindrop_enhancer.models import Raindrop, RaindropLink
+    from raindrop_enhancer.storage.sqlite_store import SQLiteStore
+
+    count = int(os.environ.get("PERF_CIRCUIT_LINKS", "200"))
+    dead_every = int(os.environ.get("PERF_CIRCUIT_DEAD_EVERY", "4"))
+    timeout = 1.0
+    tarpit = "127.0.0.9"
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.headers.get("Host", "").startswith(tarpit):
+                # accepts the connection, never answers in time
+                time.sleep(timeout * 3)
+                return
+            body = b"<html><body><article><p>a page</p></article></body></html>"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        request_queue_size = 128
+
+    server = Server(("0.0.0.0", 0), Handler)
+    server.daemon_threads = True
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    now = datetime.now(timezone.utc)
+    payloads = perf_utils.make_raindrop_payloads(count)
+    for i, p in enumerate(payloads):
+        host = tarpit if i % dead_every == 0 else f"127.0.0.{i % 8 + 1}"
+        p["link"] = f"http://{host}:{port}/doc/{i}"
+    links = [RaindropLink.from_raindrop(Raindrop.from_api(p), now) for p in payloads]
+    dead = len([i for i in range(count) if i % dead_every == 0])
+
+    timings = {}
+    summaries = {}
+    try:
+        for name, failures in (("no breaker", 0), ("breaker", 5)):
+            store = SQLiteStore(tmp_path / f"{failures}.db")
+            store.connect()
+            store.insert_batch(links)
+            runner = CaptureRunner(
+                store,
+                TrafilaturaFetcher(timeout=timeout),
+                concurrency=16,
+                per_host=2,
+                circuit_failures=failures,
+            )
+            with perf_utils.Timer() as t:
+                summaries[name] = runner.run(dry_run=False)
+            store.close()
+            timings[name] = t.elapsed
+            print(f"{name}: {t.elapsed:.2f}s")
+    finally:
+        server.shutdown()
+
+    [tripped] = summaries["breaker"].tripped_hosts
+    print(
+        f"tripped {tripped.host} after {tripped.failures} failures, "
+        f"skipped {tripped.skipped}, ~{tripped.seconds_saved:.0f}s saved"
+    )
+    assert tripped.host == tarpit
+    assert tripped.skipped >= dead - 2 * tripped.failures
+    assert summaries["no breaker"].tripped_hosts == []
+    assert timings["breaker"] < timings["no breaker"] / 3
@@ -0,0 +1,58 @@
+import os
+import pytest
+
+
+def test_perf_content_compression_ratio_and_throughput(perf_utils, tmp_path):
+    """Report stored size and read/write MB/s per codec, with and without a dictionary."""
+    # Skip perf tests by default; enable by setting ENABLE_PERF=1 in environment
+    if not (os.environ.get("ENABLE_PERF") == "1"):
+        pytest.skip("Perf tests disabled by default")
+    from datetime import datetime, timezone
+    from raindrop_enhancer.models import Raindrop, RaindropLink
+    from raindrop_enhancer.storage.compression import zstd_available
+    from raindrop_enhancer.storage.sqlite_store import SQLiteStore
+
+    count = int(os.environ.get("PERF_DOC_COUNT", "1000"))
+    now = datetime.now(timezone.utc)
+    links = [
+        RaindropLink.from_raindrop(Raindrop.from_api(p), now)
+        for p in perf_utils.make_raindrop_payloads(count)
+    ]
+    docs = perf_utils.make_markdown_documents(count)
+    raw_bytes = sum(len(d.encode("utf-8")) for d in docs)
+
+    methods = ["none", "zlib"] + (["zstd"] if zstd_available() else [])
+    results = {}
+    for method in methods:
+        for with_dict in (False, True) if method != "none" else (False,):
+            name = f"{method}+dict" if with_dict else method
+            store = SQLiteStore(tmp_path / f"{name}.db", profile="bulk", compression=method)
+            store.connect()
+            store.insert_batch(links)
+            if with_dict:
+                # train on a first capture pass, then measure writes with the dictionary
+                for link, doc in zip(links, docs):
+                    store.update_content(link.raindrop_id, doc)
+                assert store.train_content_dictionary() is not None
+            with perf_utils.Timer() as write_t:
+                for link, doc in zip(links, docs):
+                    store.update_content(link.raindrop_id, doc)
+            with perf_utils.Timer() as read_t:
+                for link, doc in zip(links, docs):
+                    assert store.get_content(link.raindrop_id) == doc
+            stored = store.conn.execute(
+                "SELECT SUM(length(CAST(content_markdown AS BLOB))) FROM link_content"
+            ).fetchone()[0]
+            store.close()
+            results[name] = (stored, write_t.elapsed, read_t.elapsed)
+
+    mb = raw_bytes / 1e6
+    for name, (stored, write_s, read_s) in results.items():
+        print(
+            f"{name}: ratio={raw_bytes / stored:.2f}x "
+            f"write={mb / write_s:.1f}MB/s read={mb / read_s:.1f}MB/s"
+        )
+
+    assert results["zlib"][0] < results["none"][0]
+    # the trained dictionary must not make small-document compression worse
+    assert results["zlib+dict"][0] <= results["zlib"][0]
@@ -0,0 +1,45 @@
+import os
+import pytest
+
+
+def test_perf_db_profiles_baseline_and_capture_writes(perf_utils, tmp_path):
+    """Compare write paths (batched sync inserts, per-link content updates) per profile."""
+    # Skip perf tests by default; enable by setting ENABLE_PERF=1 in environment
+    if not (os.environ.get("ENABLE_PERF") == "1"):
+        pytest.skip("Perf tests disabled by default")
+    from datetime import datetime, timezone
+    from raindrop_enhancer.models import Raindrop, RaindropLink
+    from raindrop_enhancer.storage.sqlite_store import SQLiteStore
+
+    count = int(os.environ.get("PERF_COUNT", "5000"))
+    captures = int(os.environ.get("PERF_CAPTURE_COUNT", "500"))
+    now = datetime.now(timezone.utc)
+    links = [
+        RaindropLink.from_raindrop(Raindrop.from_api(p), now)
+        for p in perf_utils.make_raindrop_payloads(count)
+    ]
+    markdown = "# Title\n\n" + "lorem ipsum " * 500
+
+    results = {}
+    for profile in ("safe", "balanced", "bulk"):
+        store = SQLiteStore(tmp_path / f"{profile}.db", profile=profile)
+        store.connect()
+        # sync writes one transaction per batch of 100 links
+        with perf_utils.Timer() as sync_t:
+            for i in range(0, count, 100):
+                store.insert_batch(links[i : i + 100])
+        # capture commits once per link
+        with perf_utils.Timer() as capture_t:
+            for link in links[:captures]:
+                store.update_content(link.raindrop_id, markdown)
+        store.close()
+        results[profile] = (sync_t.elapsed, capture_t.elapsed)
+
+    for profile, (sync_s, capture_s) in results.items():
+        print(f"{profile}: sync={sync_s:.3f}s capture={capture_s:.3f}s")
+
+    # Relaxing fsync must never be slower than the safe profile (with slack
+    # for timer noise on fast disks / tmpfs where fsync is nearly free).
+    slack = float(os.environ.get("PERF_PROFILE_SLACK", "1.25"))
+    assert results["bulk"][0] <= results["safe"][0] * slack
+    assert results["bulk"][1] <= results["safe"][1] * slack
@@ -0,0 +1,103 @@
+import os
+import pytest
+
+
+def test_perf_capture_with_large_binary_links(perf_utils, tmp_path):
+    """Capture pages mixed with a few huge downloads, with and without gating."""
+    # Skip perf tests by default; enable by setting ENABLE_PERF=1 in environment
+    if not (os.environ.get("ENABLE_PERF") == "1"):
+        pytest.skip("Perf tests disabled by default")
+    import threading
+    import tracemalloc
+    from datetime import datetime, timezone
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    from raindrop_enhancer.content.capture_runner import CaptureRunner
+    from raindrop_enhancer.content.fetcher import TrafilaturaFetcher
+    from raindrop_enhancer.models import Raindrop, RaindropLink
+    from raindrop_enhancer.storage.sqlite_store import SQLiteStore
+
+    count = int(os.environ.get("PERF_GATE_LINKS", "200"))
+    large_mb = int(os.environ.get("PERF_GATE_LARGE_MB", "20"))
+    large_every = 50
+    doc = perf_utils.make_markdown_documents(1)[0]
+    page = (
+        "<html><body><article>"
+        + "".join(f"<p>{line}</p>" for line in doc.splitlines() if line)
+        + "</article></body></html>"
+    ).encode()
+    chunk = b"\0" * (1024 * 1024)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            n = int(self.path.rsplit("/", 1)[-1])
+            if n % large_every:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(page)))
+                self.end_headers()
+                self.wfile.write(page)
+                return
+            # half the large files announce themselves, half are streamed
+            # as HTML without a length
+            binary = n % (2 * large_every) == 0
+            self.send_response(200)
+            if binary:
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("Content-Length", str(large_mb * len(chunk)))
+            else:
+                self.send_header("Content-Type", "text/html")
+            self.end_headers()
+            try:
+                for _ in range(large_mb):
+                    self.wfile.write(chunk)
+            except OSError:
+                pass  # the client gave up
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        request_queue_size = 128
+
+    server = Server(("0.0.0.0", 0), Handler)
+    server.daemon_threads = True
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    now = datetime.now(timezone.utc)
+    payloads = perf_utils.make_raindrop_payloads(count)
+    for i, p in enumerate(payloads):
+        p["link"] = f"http://127.0.0.{i % 8 + 1}:{port}/doc/{i}"
+    links = [RaindropLink.from_raindrop(Raindrop.from_api(p), now) for p in payloads]
+    large = len([i for i in range(count) if i % large_every == 0])
+
+    ungated = TrafilaturaFetcher(
+        max_bytes=2 * large_mb * len(chunk),
+        content_types=("text/html", "application/octet-stream"),
+    )
+    timings = {}
+    peaks = {}
+    summaries = {}
+    try:
+        for name, fetcher in (("ungated", ungated), ("gated", TrafilaturaFetcher())):
+            store = SQLiteStore(tmp_path / f"{name}.db")
+            store.connect()
+            store.insert_batch(links)
+            runner = CaptureRunner(store, fetcher, concurrency=8, per_host=2)
+            tracemalloc.start()
+            with perf_utils.Timer() as t:
+                summaries[name] = runner.run(dry_run=False)
+            peaks[name] = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+            tracemalloc.stop()
+            store.close()
+            timings[name] = t.elapsed
+            print(f"{name}: {t.elapsed:.2f}s, peak {peaks[name]:.0f} MiB")
+    finally:
+        server.shutdown()
+
+    skipped = [a for a in summaries["gated"].attempts if a.status == "skipped"]
+    assert len(skipped) == large
+    assert {a.error_type for a in skipped} == {"unsupported_type", "too_large"}
+    assert timings["gated"] < timings["ungated"]
+    assert peaks["gated"] < peaks["ungated"] / 2
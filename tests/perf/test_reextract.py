@@ -0,0 +1,59 @@
+import os
+import pytest
+
+
+def test_perf_reextract_from_html_cache(perf_utils, tmp_path):
+    """Re-extract cached pages and project the time for a 50k-link archive."""
+    # Skip perf tests by default; enable by setting ENABLE_PERF=1 in environment
+    if not (os.environ.get("ENABLE_PERF") == "1"):
+        pytest.skip("Perf tests disabled by default")
+    from datetime import datetime, timezone
+
+    from raindrop_enhancer.content.capture_runner import CaptureRunner
+    from raindrop_enhancer.content.html_cache import HtmlCache
+    from raindrop_enhancer.models import Raindrop, RaindropLink
+    from raindrop_enhancer.storage.sqlite_store import SQLiteStore
+
+    count = int(os.environ.get("PERF_REEXTRACT_PAGES", "2000"))
+    max_minutes = float(os.environ.get("PERF_REEXTRACT_MAX_MINUTES", "30"))
+    cores = os.cpu_count() or 1
+
+    now = datetime.now(timezone.utc)
+    links = [
+        RaindropLink.from_raindrop(Raindrop.from_api(p), now)
+        for p in perf_utils.make_raindrop_payloads(count)
+    ]
+    store = SQLiteStore(tmp_path / "reextract.db")
+    store.connect()
+    store.insert_batch(links)
+
+    cache = HtmlCache(tmp_path / "html-cache")
+    docs = perf_utils.make_markdown_documents(count)
+    with perf_utils.Timer() as fill_t:
+        for link, doc in zip(links, docs):
+            html = (
+                "<html><head><title>Doc</title></head><body><nav>Home | About</nav>"
+                "<article>"
+                + "".join(f"<p>{line}</p>" for line in doc.splitlines() if line)
+                + "</article><footer>Footer</footer></body></html>"
+            )
+            cache.put(link.url, html, 200, {"content-type": "text/html"})
+
+    class NoNetwork:
+        def download(self, url):  # pragma: no cover - must not be used
+            raise AssertionError("reextract must not download")
+
+    runner = CaptureRunner(
+        store, NoNetwork(), extract_workers=cores if cores > 1 else 0, html_cache=cache
+    )
+    with perf_utils.Timer() as t:
+        summary = runner.run(dry_run=False, reextract=True)
+    cache.close()
+    store.close()
+
+    assert sum(a.status == "success" for a in summary.attempts) == count
+    rate = count / t.elapsed
+    projected = 50_000 / rate / 60
+    print(f"cache fill: {count / fill_t.elapsed:.0f} pages/s")
+    print(f"reextract: {rate:.0f} pages/s on {cores} cores; 50k pages ~ {projected:.1f} min")
+    assert projected <= max_minutes
@@ -0,0 +1,106 @@
+import os
+import pytest
+
+
+def test_perf_refresh_of_static_archive_is_mostly_304s(perf_utils, tmp_path):
+    """Refresh an archive where most pages are static, with and without revalidation."""
+    # Skip perf tests by default; enable by setting ENABLE_PERF=1 in environment
+    if not (os.environ.get("ENABLE_PERF") == "1"):
+        pytest.skip("Perf tests disabled by default")
+    import threading
+    import time
+    from datetime import datetime, timezone
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    from raindrop_enhancer.content.capture_runner import CaptureRunner
+    from raindrop_enhancer.content.fetcher import TrafilaturaFetcher
+    from raindrop_enhancer.models import Raindrop, RaindropLink
+    from raindrop_enhancer.storage.sqlite_store import SQLiteStore
+
+    count = int(os.environ.get("PERF_REFRESH_LINKS", "400"))
+    changed_every = int(os.environ.get("PERF_REFRESH_CHANGED_EVERY", "10"))
+    pages = [
+        "<html><body><article>"
+        + "".join(f"<p>{line}</p>" for line in doc.splitlines() if line) * 10
+        + "</article></body></html>"
+        for doc in perf_utils.make_markdown_documents(32)
+    ]
+    version = {"v": 1}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(0.02)
+            n = int(self.path.rsplit("/", 1)[-1])
+            # every `changed_every`-th page changes between captures
+            etag = f'"{n}-{version["v"] if n % changed_every == 0 else 1}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            body = (pages[n % len(pages)] + f"<!-- {etag} -->").encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        request_queue_size = 128
+
+    server = Server(("0.0.0.0", 0), Handler)
+    server.daemon_threads = True
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    class Unconditional(TrafilaturaFetcher):
+        # re-downloads everything; only the body hash check applies
+        def download(self, url, validators=None):
+            return super().download(url)
+
+    class FetchOnly:
+        # no download(): every page is re-downloaded and re-extracted
+        def __init__(self):
+            self.inner = TrafilaturaFetcher()
+
+        def fetch(self, url):
+            return self.inner.fetch(url)
+
+    now = datetime.now(timezone.utc)
+    payloads = perf_utils.make_raindrop_payloads(count)
+    for i, p in enumerate(payloads):
+        p["link"] = f"http://127.0.0.{i % 8 + 1}:{port}/doc/{i}"
+    links = [RaindropLink.from_raindrop(Raindrop.from_api(p), now) for p in payloads]
+
+    timings = {}
+    try:
+        for name, fetcher in (
+            ("re-extract all", FetchOnly()),
+            ("body hash only", Unconditional()),
+            ("revalidate", TrafilaturaFetcher()),
+        ):
+            version["v"] = 1
+            store = SQLiteStore(tmp_path / f"{name}.db")
+            store.connect()
+            store.insert_batch(links)
+            runner = CaptureRunner(store, fetcher, concurrency=16, per_host=2)
+            runner.run(dry_run=False)
+            version["v"] = 2
+            with perf_utils.Timer() as t:
+                summary = runner.run(dry_run=False, refresh=True)
+            store.close()
+            statuses = [a.status for a in summary.attempts]
+            timings[name] = t.elapsed
+            print(
+                f"{name}: {t.elapsed:.2f}s, {statuses.count('unchanged')} unchanged, "
+                f"{statuses.count('success')} re-extracted"
+            )
+    finally:
+        server.shutdown()
+
+    assert statuses.count("success") == count // changed_every
+    assert timings["revalidate"] < timings["body hash only"] < timings["re-extract all"]
@@ -0,0 +1,41 @@
+import os
+import pytest
+
+
+def test_perf_search_latency_on_large_archive(perf_utils, tmp_path):
+    """Ranked search over titles and captured content should take milliseconds."""
+    # Skip perf tests by default; enable by setting ENABLE_PERF=1 in environment
+    if not (os.environ.get("ENABLE_PERF") == "1"):
+        pytest.skip("Perf tests disabled by default")
+    from datetime import datetime, timezone
+    from raindrop_enhancer.models import Raindrop, RaindropLink
+    from raindrop_enhancer.storage.sqlite_store import SQLiteStore
+
+    rows = int(os.environ.get("PERF_SEARCH_ROWS", "200000"))
+    captured = int(os.environ.get("PERF_SEARCH_CAPTURED", "20000"))
+    max_ms = float(os.environ.get("PERF_SEARCH_MAX_MS", "100"))
+    now = datetime.now(timezone.utc)
+
+    store = SQLiteStore(tmp_path / "search.db", profile="bulk")
+    store.connect()
+    payloads = perf_utils.make_raindrop_payloads(rows)
+    for i in range(0, rows, 10_000):
+        store.insert_batch(
+            [RaindropLink.from_raindrop(Raindrop.from_api(p), now) for p in payloads[i : i + 10_000]]
+        )
+    docs = perf_utils.make_markdown_documents(captured, topic_words=3)
+    for p, doc in zip(payloads, docs):
+        store.update_content(p["_id"], doc)
+
+    queries = ["sqlite", "performance archive", '"release update"', "netw*", "title 4242"]
+    timings = {}
+    for q in queries:
+        store.search(q)  # warm the page cache
+        with perf_utils.Timer() as t:
+            hits = store.search(q, limit=20)
+        timings[q] = (t.elapsed * 1000, len(hits))
+    store.close()
+
+    for q, (ms, n) in timings.items():
+        print(f"{q!r}: {ms:.1f}ms ({n} hits) over {rows} links")
+    assert all(ms <= max_ms for ms, _ in timings.values()), timings
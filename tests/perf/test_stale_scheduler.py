@@ -0,0 +1,51 @@
+import os
+import pytest
+
+
+def test_perf_stale_scheduler_picks_nightly_budget(perf_utils, tmp_path):
+    """Ranking a large captured archive for a nightly recapture budget stays cheap."""
+    # Skip perf tests by default; enable by setting ENABLE_PERF=1 in environment
+    if not (os.environ.get("ENABLE_PERF") == "1"):
+        pytest.skip("Perf tests disabled by default")
+    from datetime import datetime, timezone
+    from raindrop_enhancer.models import Raindrop, RaindropLink
+    from raindrop_enhancer.storage.sqlite_store import SQLiteStore
+
+    rows = int(os.environ.get("PERF_STALE_ROWS", "200000"))
+    budget = int(os.environ.get("PERF_STALE_BUDGET", "2000"))
+    max_seconds = float(os.environ.get("PERF_STALE_MAX_SECONDS", "5.0"))
+    now = datetime.now(timezone.utc)
+
+    store = SQLiteStore(tmp_path / "stale.db", profile="bulk", compression="none")
+    store.connect()
+    payloads = perf_utils.make_raindrop_payloads(rows)
+    for i in range(0, rows, 10_000):
+        batch = [
+            RaindropLink.from_raindrop(Raindrop.from_api(p), now)
+            for p in payloads[i : i + 10_000]
+        ]
+        store.insert_batch(batch)
+        store.update_content_batch([(l.raindrop_id, "# doc", "trafilatura") for l in batch])
+    # spread capture/check ages over a year and give some links a history;
+    # timestamps in the same ISO form the store writes
+    iso = "strftime('%Y-%m-%dT%H:%M:%S+00:00', 'now', '-' || ({}) || ' days')"
+    store.conn.execute(
+        "UPDATE link_content SET "
+        f"captured_since = {iso.format('raindrop_id % 365 + 30')}, "
+        f"checked_at = {iso.format('raindrop_id % 97')}, "
+        "change_count = raindrop_id % 7"
+    )
+    store.conn.execute(
+        "INSERT INTO capture_backoff (raindrop_id, failures, next_attempt_at) "
+        "SELECT raindrop_id, 3, '2000-01-01T00:00:00+00:00' FROM link_content "
+        "WHERE raindrop_id % 13 = 0"
+    )
+    store.conn.commit()
+
+    with perf_utils.Timer() as t:
+        picked = list(store.iter_stale_links(limit=budget))
+    store.close()
+
+    print(f"{rows} captured links: picked {len(picked)} stalest in {t.elapsed:.3f}s")
+    assert len(picked) == budget
+    assert t.elapsed < max_seconds
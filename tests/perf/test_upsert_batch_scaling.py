@@ -0,0 +1,47 @@
+import os
+import pytest
+
+
+def test_perf_upsert_batch_cost_constant_as_table_grows(perf_utils, tmp_path):
+    """Per-batch upsert cost should not grow with the table size."""
+    # Skip perf tests by default; enable by setting ENABLE_PERF=1 in environment
+    if not (os.environ.get("ENABLE_PERF") == "1"):
+        pytest.skip("Perf tests disabled by default")
+    from raindrop_enhancer.storage.sqlite_store import SQLiteStore
+
+    make_raindrop_payloads = perf_utils.make_raindrop_payloads
+    Timer = perf_utils.Timer
+    from raindrop_enhancer.models import Raindrop, RaindropLink
+    from datetime import datetime, timezone
+
+    batch_size = int(os.environ.get("PERF_BATCH_SIZE", "1000"))
+    batches = int(os.environ.get("PERF_BATCHES", "100"))
+    # allowed ratio between the slowest late batch and the early batches
+    max_ratio = float(os.environ.get("PERF_MAX_GROWTH", "3.0"))
+
+    payloads = make_raindrop_payloads(batch_size * batches)
+    now = datetime.now(timezone.utc)
+    links = [RaindropLink.from_raindrop(Raindrop.from_api(p), now) for p in payloads]
+
+    store = SQLiteStore(tmp_path / "perf_upsert.db")
+    store.connect()
+
+    timings = []
+    for i in range(batches):
+        batch = links[i * batch_size : (i + 1) * batch_size]
+        with Timer() as t:
+            inserted, updated = store.upsert_batch(batch)
+        assert (inserted, updated) == (len(batch), 0)
+        timings.append(t.elapsed)
+
+    # re-sending an already stored batch is an update check, not a rewrite
+    assert store.upsert_batch(links[:batch_size]) == (0, 0)
+
+    window = max(1, batches // 10)
+    early = sorted(timings[:window])[window // 2]
+    late = sorted(timings[-window:])[window // 2]
+    assert late <= early * max_ratio, (
+        f"Per-batch cost grew from {early:.4f}s to {late:.4f}s "
+        f"at {store.count_links()} rows"
+    )
+    store.close()
@@ -0,0 +1,50 @@
+import os
+import pytest
+
+
+def test_perf_work_queues_scale_with_pending_links(perf_utils, tmp_path):
+    """Capture/tag queue reads should cost O(pending), not O(table)."""
+    # Skip perf tests by default; enable by setting ENABLE_PERF=1 in environment
+    if not (os.environ.get("ENABLE_PERF") == "1"):
+        pytest.skip("Perf tests disabled by default")
+    from datetime import datetime, timezone
+    from raindrop_enhancer.models import Raindrop, RaindropLink
+    from raindrop_enhancer.storage.sqlite_store import SQLiteStore
+
+    rows = int(os.environ.get("PERF_QUEUE_ROWS", "500000"))
+    pending = int(os.environ.get("PERF_QUEUE_PENDING", "1000"))
+    now = datetime.now(timezone.utc)
+
+    store = SQLiteStore(tmp_path / "queues.db", profile="bulk")
+    store.connect()
+    payloads = perf_utils.make_raindrop_payloads(rows)
+    for i in range(0, rows, 10_000):
+        store.insert_batch(
+            [RaindropLink.from_raindrop(Raindrop.from_api(p), now) for p in payloads[i : i + 10_000]]
+        )
+    # everything but every n-th link has been captured and tagged already
+    step = max(1, rows // pending)
+    store.conn.execute(
+        "UPDATE raindrop_links SET has_content = (raindrop_id % ?) != 0, has_auto_tags = (raindrop_id % ?) != 0",
+        (step, step),
+    )
+    store.conn.commit()
+
+    with perf_utils.Timer() as uncaptured_t:
+        uncaptured = store.select_uncaptured()
+    with perf_utils.Timer() as untagged_t:
+        untagged = store.fetch_untagged_links()
+    assert len(uncaptured) == len(untagged) == rows // step
+    # the same queue read forced through a full table scan
+    with perf_utils.Timer() as scan_t:
+        store.conn.execute(
+            "SELECT raindrop_id, url FROM raindrop_links NOT INDEXED WHERE has_content = 0 ORDER BY synced_at"
+        ).fetchall()
+    store.close()
+
+    print(
+        f"{rows} rows, {len(uncaptured)} pending: uncaptured={uncaptured_t.elapsed:.4f}s "
+        f"untagged={untagged_t.elapsed:.4f}s full scan={scan_t.elapsed:.4f}s"
+    )
+    assert uncaptured_t.elapsed < scan_t.elapsed
+    assert untagged_t.elapsed < scan_t.elapsed
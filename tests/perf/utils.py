@@ -29,6 +29,41 @@ def make_raindrop_payloads(count: int, start: datetime | None = None) -> List[Di
     return out
 
 
+def make_markdown_documents(
+    count: int, seed: int = 0, topic_words: int | None = None
+) -> List[str]:
+    """Generate article-like Markdown: shared boilerplate around varied prose.
+
+    With `topic_words`, each document uses only that many of the topic words
+    (padded with filler from a large vocabulary), so a word matches a
+    realistic fraction of documents instead of all of them.
+    """
+    import random
+
+    rng = random.Random(seed)
+    words = (
+        "data storage index query page cache article python sqlite network "
+        "design system user release update feature performance archive link"
+    ).split()
+    out: List[str] = []
+    for i in range(count):
+        doc_words = words
+        if topic_words:
+            doc_words = rng.sample(words, topic_words) + [
+                f"w{rng.randint(0, 50_000)}" for _ in range(topic_words * 4)
+            ]
+        paragraphs = [
+            " ".join(rng.choice(doc_words) for _ in range(rng.randint(30, 90))).capitalize() + "."
+            for _ in range(rng.randint(2, 12))
+        ]
+        out.append(
+            f"# Article {i}\n\nPublished by Example Blog | Share on Twitter | Share on Facebook\n\n"
+            + "\n\n".join(paragraphs)
+            + "\n\n## Related posts\n\nSubscribe to our newsletter to get new posts by email.\n"
+        )
+    return out
+
+
 class Timer:
     def __init__(self):
         self.start = 0.0
@@ -0,0 +1,149 @@
+import asyncio
+from datetime import datetime, timezone
+
+from raindrop_enhancer.api.raindrop_client import AsyncRaindropClient
+from raindrop_enhancer.api.rate_limiter import TokenBucket
+from raindrop_enhancer.sync.orchestrator import Orchestrator
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_allows_burst_then_spaces_requests():
+    clock = FakeClock()
+    bucket = TokenBucket(60, burst=2, clock=clock)
+    # two tokens available immediately
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    # third and fourth queue up one second apart (60/min -> 1/s)
+    assert bucket.reserve() == 1.0
+    assert bucket.reserve() == 2.0
+    # after time passes the debt is repaid
+    clock.now = 10.0
+    assert bucket.reserve() == 0.0
+
+
+def test_async_client_paginates_and_counts_requests(httpx_mock):
+    httpx_mock.add_response(
+        method="GET",
+        url="https://api.raindrop.io/rest/v1/raindrops/1?page=0&perpage=2",
+        json={"items": [{"_id": 1}, {"_id": 2}]},
+    )
+    httpx_mock.add_response(
+        method="GET",
+        url="https://api.raindrop.io/rest/v1/raindrops/1?page=1&perpage=2",
+        json={"items": [{"_id": 3}]},
+    )
+    requests = []
+    client = AsyncRaindropClient(token="x", per_page=2, on_request=requests.append)
+
+    async def _collect():
+        try:
+            return [it async for it in client.list_raindrops(1)]
+        finally:
+            await client.aclose()
+
+    items = asyncio.run(_collect())
+    assert [i["_id"] for i in items] == [1, 2, 3]
+    assert len(requests) == 2
+
+
+def _collect(client, collection_id, count):
+    async def _run():
+        try:
+            return [
+                it["_id"]
+                async for it in client.list_raindrops(collection_id, count=count)
+            ]
+        finally:
+            await client.aclose()
+
+    return asyncio.run(_run())
+
+
+def test_count_plans_pages_without_probing(httpx_mock):
+    # count=5, perpage=2 -> exactly pages 0..2; the short last page ends the walk
+    pages = {0: [1, 2], 1: [3, 4], 2: [5]}
+    for page, ids in pages.items():
+        httpx_mock.add_response(
+            method="GET",
+            url=f"https://api.raindrop.io/rest/v1/raindrops/7?page={page}&perpage=2",
+            json={"items": [{"_id": i} for i in ids]},
+        )
+    client = AsyncRaindropClient(token="x", per_page=2, enforce_rate_limit=False)
+    assert _collect(client, 7, count=5) == [1, 2, 3, 4, 5]
+
+
+def test_stale_count_falls_back_to_sequential_probing(httpx_mock):
+    # count says 2 items but a third was added since /collections was read
+    httpx_mock.add_response(
+        method="GET",
+        url="https://api.raindrop.io/rest/v1/raindrops/7?page=0&perpage=2",
+        json={"items": [{"_id": 1}, {"_id": 2}]},
+    )
+    httpx_mock.add_response(
+        method="GET",
+        url="https://api.raindrop.io/rest/v1/raindrops/7?page=1&perpage=2",
+        json={"items": [{"_id": 3}]},
+    )
+    client = AsyncRaindropClient(token="x", per_page=2, enforce_rate_limit=False)
+    assert _collect(client, 7, count=2) == [1, 2, 3]
+
+
+def test_map_collections_bounds_concurrency():
+    client = AsyncRaindropClient(token="x", max_concurrency=2)
+    active = 0
+    peak = 0
+
+    async def worker(_):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+
+    asyncio.run(client.map_collections(range(6), worker))
+    assert peak == 2
+
+
+class StubAsyncClient(AsyncRaindropClient):
+    def __init__(self, per_collection):
+        super().__init__(token="x", max_concurrency=3)
+        self.per_collection = per_collection
+
+    async def list_collections(self):
+        return [{"_id": cid, "title": f"C{cid}"} for cid in self.per_collection]
+
+    async def list_raindrops_since(self, collection_id, iso_cursor=None, count=None):
+        for p in self.per_collection.get(collection_id, []):
+            await asyncio.sleep(0)
+            yield p
+
+
+def _payload(rid: int, cid: int) -> dict:
+    created = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    return {
+        "_id": rid,
+        "collectionId": cid,
+        "title": f"T{rid}",
+        "link": f"https://x/{rid}",
+        "created": created,
+        "tags": [],
+    }
+
+
+def test_orchestrator_syncs_with_async_client(tmp_path):
+    per_collection = {
+        1: [_payload(i, 1) for i in range(150)],
+        2: [_payload(1000 + i, 2) for i in range(30)],
+        3: [],
+    }
+    orch = Orchestrator(tmp_path / "async.db", StubAsyncClient(per_collection))
+    outcome = orch.run(full_refresh=True, dry_run=False)
+    assert outcome.new_links == 180
+    assert outcome.total_links == 180
@@ -0,0 +1,396 @@
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from raindrop_enhancer.content.capture_runner import CaptureRunner
+from raindrop_enhancer.content.fetcher import FetchResult
+from raindrop_enhancer.models import RaindropLink
+from raindrop_enhancer.storage.sqlite_store import SQLiteStore
+
+
+def _make_link(rid: int) -> RaindropLink:
+    now = datetime.now(timezone.utc).isoformat()
+    return RaindropLink(
+        raindrop_id=rid,
+        collection_id=0,
+        collection_title="",
+        title=f"title-{rid}",
+        url=f"https://example.org/{rid}",
+        created_at=now,
+        synced_at=now,
+        tags_json="[]",
+        raw_payload="{}",
+    )
+
+
+class MapFetcher:
+    """Return markdown per URL; URLs mapped to an exception raise it."""
+
+    def __init__(self, pages: dict):
+        self.pages = pages
+
+    def fetch(self, url: str) -> FetchResult:
+        page = self.pages.get(url)
+        if isinstance(page, BaseException):
+            raise page
+        if page is None:
+            return FetchResult(url=url, markdown=None, error="network")
+        return FetchResult(url=url, markdown=page, error=None)
+
+
+@pytest.fixture
+def store(tmp_path: Path):
+    s = SQLiteStore(tmp_path / "capture.db")
+    s.connect()
+    s.insert_batch([_make_link(i) for i in range(1, 6)])
+    yield s
+    s.close()
+
+
+def test_capture_writes_in_batches(store, monkeypatch):
+    batches = []
+    original = store.update_content_batch
+
+    def record(entries):
+        batches.append([e[0] for e in entries])
+        return original(entries)
+
+    monkeypatch.setattr(store, "update_content_batch", record)
+    fetcher = MapFetcher({f"https://example.org/{i}": f"# page {i}" for i in range(1, 6)})
+    runner = CaptureRunner(store, fetcher, batch_size=2, flush_seconds=3600)
+    summary = runner.run(dry_run=False)
+
+    assert [a.status for a in summary.attempts] == ["success"] * 5
+    assert batches == [[1, 2], [3, 4], [5]]
+    assert store.get_content(5) == "# page 5"
+
+
+def test_capture_flushes_on_elapsed_time(store, monkeypatch):
+    ticks = iter(range(100))
+    batches = []
+    original = store.update_content_batch
+    monkeypatch.setattr(
+        store, "update_content_batch", lambda e: batches.append(len(e)) or original(e)
+    )
+    fetcher = MapFetcher({f"https://example.org/{i}": "# page" for i in range(1, 6)})
+    # every clock read advances one second; flush after two seconds
+    runner = CaptureRunner(
+        store, fetcher, batch_size=100, flush_seconds=2, clock=lambda: next(ticks)
+    )
+    runner.run(dry_run=False)
+    assert sum(batches) == 5 and len(batches) > 1
+
+
+def test_interrupted_capture_keeps_flushed_and_buffered_content(store):
+    fetcher = MapFetcher(
+        {
+            "https://example.org/1": "# one",
+            "https://example.org/2": "# two",
+            "https://example.org/3": KeyboardInterrupt(),
+        }
+    )
+    runner = CaptureRunner(store, fetcher, batch_size=10, flush_seconds=3600)
+    with pytest.raises(KeyboardInterrupt):
+        runner.run(dry_run=False)
+    assert store.get_content(2) == "# two"
+    assert [r[0] for r in store.select_uncaptured()] == [3, 4, 5]
+
+
+def test_fetcher_exception_records_link_as_failed(store):
+    fetcher = MapFetcher(
+        {
+            "https://example.org/1": ValueError("bad url"),
+            **{f"https://example.org/{i}": f"# page {i}" for i in range(2, 6)},
+        }
+    )
+    summary = CaptureRunner(store, fetcher).run(dry_run=False)
+    assert [a.status for a in summary.attempts] == ["failed"] + ["success"] * 4
+    assert summary.attempts[0].error_message == "bad url"
+    row = store.conn.execute(
+        "SELECT status, error_type FROM capture_attempts WHERE raindrop_id = 1"
+    ).fetchone()
+    assert tuple(row) == ("failed", "bad url")
+
+
+def test_refresh_replaces_content_only_on_success(store):
+    store.update_content(1, "# old one")
+    store.update_content(2, "# old two")
+    fetcher = MapFetcher({"https://example.org/1": "# new one"})
+    runner = CaptureRunner(store, fetcher, batch_size=10)
+    runner.run(dry_run=False, refresh=True, limit=2)
+    assert store.get_content(1) == "# new one"
+    # a failed re-fetch keeps the previous capture
+    assert store.get_content(2) == "# old two"
+
+
+def test_concurrent_capture_persists_in_link_order(store, monkeypatch):
+    import random
+    import time
+
+    class SlowFetcher(MapFetcher):
+        def fetch(self, url):
+            time.sleep(random.uniform(0, 0.02))
+            return super().fetch(url)
+
+    batches = []
+    original = store.update_content_batch
+    monkeypatch.setattr(
+        store,
+        "update_content_batch",
+        lambda e: batches.extend(x[0] for x in e) or original(e),
+    )
+    fetcher = SlowFetcher({f"https://example.org/{i}": f"# page {i}" for i in range(1, 6)})
+    runner = CaptureRunner(store, fetcher, batch_size=2, concurrency=4, per_host=4)
+    summary = runner.run(dry_run=False)
+    assert [a.link_id for a in summary.attempts] == [1, 2, 3, 4, 5]
+    assert batches == [1, 2, 3, 4, 5]
+    assert store.select_uncaptured() == []
+
+
+def test_extraction_runs_in_process_pool(store):
+    from raindrop_enhancer.content.fetcher import DownloadResult
+
+    body = " ".join(f"Sentence number {n} about pipelines." for n in range(40))
+    html = f"<html><body><article><h1>Doc</h1><p>{body}</p></article></body></html>"
+
+    class DownloadOnly:
+        def download(self, url):
+            if url.endswith("/2"):
+                return DownloadResult(url=url, html=None, error="network")
+            return DownloadResult(url=url, html=html, error=None)
+
+        def fetch(self, url):  # pragma: no cover - must not be used
+            raise AssertionError("fetch called with extractor pool")
+
+    runner = CaptureRunner(store, DownloadOnly(), concurrency=2, extract_workers=1)
+    summary = runner.run(dry_run=False)
+    assert [a.status for a in summary.attempts] == [
+        "success",
+        "failed",
+        "success",
+        "success",
+        "success",
+    ]
+    assert summary.attempts[1].error_type == "network"
+    assert "Sentence number 39" in store.get_content(1)
+    assert store.get_content(2) is None
+
+
+def test_extractor_pool_starts_on_first_extraction(store, monkeypatch):
+    from raindrop_enhancer.content import capture_runner
+    from raindrop_enhancer.content.fetcher import DownloadResult
+
+    started = []
+    monkeypatch.setattr(
+        capture_runner, "ProcessPoolExecutor", lambda **kw: started.append(kw)
+    )
+
+    class Unreachable:
+        def download(self, url):
+            return DownloadResult(url=url, html=None, error="network")
+
+    runner = CaptureRunner(store, Unreachable(), extract_workers=2)
+    runner.run(dry_run=True)
+    runner.run(dry_run=False)
+    # nothing was downloaded, so nothing needed extracting
+    assert started == []
+
+
+def test_reextract_uses_cached_html_only(store, tmp_path):
+    from raindrop_enhancer.content.fetcher import DownloadResult
+    from raindrop_enhancer.content.html_cache import HtmlCache
+
+    body = " ".join(f"Cached sentence {n} for extraction." for n in range(40))
+    html = f"<html><body><article><h1>Doc</h1><p>{body}</p></article></body></html>"
+
+    class Downloader:
+        def __init__(self):
+            self.calls = 0
+
+        def download(self, url):
+            self.calls += 1
+            if url.endswith("/2"):
+                return DownloadResult(url=url, html=None, error="network")
+            return DownloadResult(url=url, html=html, error=None, status=200)
+
+    cache = HtmlCache(tmp_path / "html")
+    fetcher = Downloader()
+    runner = CaptureRunner(store, fetcher, html_cache=cache)
+    runner.run(dry_run=False)
+    assert fetcher.calls == 5
+    assert len(cache) == 4
+    assert cache.get("https://example.org/1").status == 200
+
+    store.update_content(1, "# stale")
+    summary = runner.run(dry_run=False, reextract=True)
+    assert fetcher.calls == 5  # no downloads
+    assert [a.status for a in summary.attempts] == [
+        "success",
+        "skipped",
+        "success",
+        "success",
+        "success",
+    ]
+    assert summary.attempts[1].error_type == "not_cached"
+    assert "Cached sentence 39" in store.get_content(1)
+
+    with pytest.raises(ValueError):
+        CaptureRunner(store, fetcher).run(dry_run=False, reextract=True)
+
+
+def test_refresh_revalidates_before_extracting(store):
+    from raindrop_enhancer.content.fetcher import DownloadResult
+    from raindrop_enhancer.models import ContentValidators
+
+    body = " ".join(f"Sentence {n} of a static article." for n in range(40))
+    html = f"<html><body><article><h1>Doc</h1><p>{body}</p></article></body></html>"
+    changed = html.replace("static", "rewritten")
+
+    class Revalidating:
+        def __init__(self):
+            self.sent = {}
+
+        def download(self, url, validators=None):
+            self.sent[url] = validators
+            n = int(url.rsplit("/", 1)[-1])
+            if n == 1 and validators is not None:
+                return DownloadResult(url, None, None, status=304, not_modified=True)
+            page = changed if (n == 3 and validators is not None) else html
+            return DownloadResult(url, page, None, status=200, headers={"etag": f'"{n}"'})
+
+    fetcher = Revalidating()
+    runner = CaptureRunner(store, fetcher)
+    runner.run(dry_run=False, limit=3)
+    assert store.get_validators(1).etag == '"1"'
+    original = store.get_content(2)
+
+    summary = runner.run(dry_run=False, refresh=True)
+    assert [a.status for a in summary.attempts] == [
+        "unchanged",  # 304
+        "unchanged",  # same body hash
+        "success",  # new body
+        "success",  # first capture
+        "success",
+    ]
+    assert fetcher.sent["https://example.org/1"].etag == '"1"'
+    assert fetcher.sent["https://example.org/4"] is None
+    assert store.get_content(2) == original
+    assert "rewritten" in store.get_content(3)
+    assert store.get_validators(3).body_hash != store.get_validators(2).body_hash
+    assert store.get_validators(1) == ContentValidators(
+        '"1"', None, store.get_validators(2).body_hash
+    )
+
+
+def test_stale_recapture_within_budget(store):
+    pages = {f"https://example.org/{i}": f"# page {i}" for i in range(1, 6)}
+    CaptureRunner(store, MapFetcher(pages)).run(dry_run=False)
+
+    # nothing is older than a day yet
+    runner = CaptureRunner(store, MapFetcher({}))
+    assert runner.run(dry_run=False, stale=True).attempts == []
+
+    summary = runner.run(dry_run=False, stale=True, min_age_days=0, limit=3)
+    assert len(summary.attempts) == 3
+    assert {a.status for a in summary.attempts} == {"failed"}
+    failed = [a.link_id for a in summary.attempts]
+    rows = store.conn.execute(
+        "SELECT raindrop_id, failures FROM capture_backoff ORDER BY raindrop_id"
+    ).fetchall()
+    assert {r[0]: r[1] for r in rows} == {i: 1 for i in failed}
+    assert store.get_content(failed[0]) == f"# page {failed[0]}"
+
+    summary = runner.run(dry_run=False, stale=True, min_age_days=0, time_budget=0)
+    assert summary.attempts == [] and summary.budget_exhausted
+
+    # failed links back off; the next budget goes to the others
+    summary = runner.run(dry_run=False, stale=True, min_age_days=0)
+    assert sorted(a.link_id for a in summary.attempts) == sorted(
+        set(range(1, 6)) - set(failed)
+    )
+
+
+def test_failing_links_logged_and_backed_off(store):
+    pages = {f"https://example.org/{i}": f"# page {i}" for i in (1, 2, 3)}
+    runner = CaptureRunner(store, MapFetcher(pages))
+    summary = runner.run(dry_run=False)
+    assert [a.status for a in summary.attempts] == ["success"] * 3 + ["failed"] * 2
+
+    log = store.conn.execute(
+        "SELECT raindrop_id, status, error_type, duration_ms FROM capture_attempts "
+        "ORDER BY raindrop_id"
+    ).fetchall()
+    assert [tuple(r)[:3] for r in log] == [
+        (1, "success", None),
+        (2, "success", None),
+        (3, "success", None),
+        (4, "failed", "network"),
+        (5, "failed", "network"),
+    ]
+    assert all(r[3] is not None and r[3] >= 0 for r in log)
+
+    # the next run leaves the failing links alone until their backoff expires
+    assert runner.run(dry_run=False).attempts == []
+    assert store.capture_backoff_counts() == (2, 0)
+    retried = runner.run(dry_run=False, retry_failed=True)
+    assert [a.link_id for a in retried.attempts] == [4, 5]
+    assert [a.retry_count for a in retried.attempts] == [1, 1]
+    retries = store.conn.execute(
+        "SELECT retry_count FROM capture_attempts WHERE raindrop_id = 4 ORDER BY id"
+    ).fetchall()
+    assert [r[0] for r in retries] == [0, 1]
+
+
+def test_circuit_opens_for_failing_host(store):
+    store.insert_batch(
+        [
+            RaindropLink(**{**_make_link(i).__dict__, "url": f"https://dead.example/{i}"})
+            for i in range(6, 12)
+        ]
+    )
+    pages = {f"https://example.org/{i}": f"# page {i}" for i in range(1, 6)}
+    runner = CaptureRunner(store, MapFetcher(pages), circuit_failures=2)
+    summary = runner.run(dry_run=False)
+
+    outcomes = [(a.status, a.error_type) for a in summary.attempts]
+    # which dead links are tried first depends on thread scheduling
+    assert outcomes[:5] == [("success", None)] * 5
+    assert sorted(outcomes[5:]) == [("failed", "network")] * 2 + [
+        ("skipped", "circuit_open")
+    ] * 4
+    [tripped] = summary.tripped_hosts
+    assert (tripped.host, tripped.failures, tripped.skipped) == ("dead.example", 2, 4)
+    # skipped links are not backed off and come back next session
+    assert store.capture_backoff_counts() == (2, 0)
+    skipped = [a.link_id for a in summary.attempts if a.status == "skipped"]
+    assert [a.link_id for a in runner.run(dry_run=False).attempts] == skipped
+
+
+def test_binary_and_oversized_links_skipped_and_quarantined(store):
+    from raindrop_enhancer.content.fetcher import (
+        TOO_LARGE,
+        UNSUPPORTED_TYPE,
+        DownloadResult,
+    )
+
+    body = " ".join(f"Sentence number {n} about pipelines." for n in range(40))
+    html = f"<html><body><article><p>{body}</p></article></body></html>"
+
+    class GatedFetcher:
+        def download(self, url):
+            if url.endswith("/2"):
+                return DownloadResult(url, None, UNSUPPORTED_TYPE, status=200, skipped=True)
+            if url.endswith("/3"):
+                return DownloadResult(url, None, TOO_LARGE, status=200, skipped=True)
+            return DownloadResult(url, html, None, status=200)
+
+    runner = CaptureRunner(store, GatedFetcher(), circuit_failures=1)
+    summary = runner.run(dry_run=False)
+    outcomes = [(a.status, a.error_type) for a in summary.attempts]
+    assert outcomes[1:3] == [("skipped", UNSUPPORTED_TYPE), ("skipped", TOO_LARGE)]
+    # the host answered: no circuit trips
+    assert summary.tripped_hosts == []
+    # retrying would not change the answer
+    assert store.capture_backoff_counts() == (0, 2)
+    assert runner.run(dry_run=False).attempts == []
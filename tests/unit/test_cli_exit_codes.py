@@ -35,12 +35,12 @@ def test_persistence_failure_returns_3(monkeypatch, tmp_path):
                 }
             )
 
-    # Ensure the CLI will process at least one item by patching fetch_untagged_links
+    # Ensure the CLI will process at least one item by patching iter_untagged_links
     from raindrop_enhancer.storage.sqlite_store import SQLiteStore as StoreClass
 
     monkeypatch.setattr(
         StoreClass,
-        "fetch_untagged_links",
+        "iter_untagged_links",
         lambda self, limit=None: [(1, "T", "http://", "c")],
     )
 
@@ -103,7 +103,7 @@ def test_fail_on_error_returns_4(monkeypatch, tmp_path):
 
     monkeypatch.setattr(
         StoreClass2,
-        "fetch_untagged_links",
+        "iter_untagged_links",
         lambda self, limit=None: [(1, "T", "http://", "c")],
     )
 
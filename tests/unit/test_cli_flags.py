@@ -68,3 +68,34 @@ def test_dry_run(monkeypatch):
     res = runner.invoke(entry, ["export", "--dry-run"])
     assert res.exit_code == 0
     assert "Dry run" in res.output
+
+
+def test_max_retries_reaches_rate_controller(monkeypatch):
+    runner = CliRunner()
+    entry = _get_entry()
+    if entry is None:
+        return
+
+    from raindrop_enhancer import cli as cli_mod
+
+    made = []
+
+    class FakeClient:
+        def __init__(self, *args, **kwargs):
+            made.append(kwargs)
+
+        def list_collections(self):
+            return [{"_id": -1}]
+
+        def list_raindrops(self, cid):
+            return []
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(cli_mod, "RaindropClient", FakeClient, raising=False)
+    monkeypatch.setenv("RAINDROP_TOKEN", "fake-token")
+
+    res = runner.invoke(entry, ["export", "--dry-run", "--max-retries", "20"])
+    assert res.exit_code == 0
+    assert made[0]["rate_controller"].max_retries == 20
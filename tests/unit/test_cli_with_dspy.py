@@ -27,7 +27,7 @@ def test_cli_with_dspy_callable_predictor(monkeypatch, tmp_path):
 
     monkeypatch.setattr(
         StoreClass,
-        "fetch_untagged_links",
+        "iter_untagged_links",
         lambda self, limit=None: [(1, "Title", "http://", "content")],
     )
 
@@ -1,22 +1,19 @@
 import types
-import pytest
 
+import httpx
+import pytest
 
-def test_trafilatura_fetcher_timeout_and_extract(monkeypatch):
-    # Patch trafilatura.fetch_url and extract to simulate timeout and successful extract
-    fake_module = types.SimpleNamespace()
 
-    def fake_fetch_url(url, timeout=10.0):
-        if "slow" in url:
-            raise TimeoutError("timeout")
-        return "<html>content</html>"
+def test_trafilatura_fetcher_timeout_and_extract(monkeypatch, httpx_mock):
+    # Simulate a timeout on one URL and patch trafilatura.extract
+    httpx_mock.add_response(url="https://example.org/fast", html="<html>content</html>")
+    httpx_mock.add_exception(httpx.ReadTimeout("timeout"), url="https://example.org/slow")
 
     def fake_extract(html, output_format="markdown"):
         return "# Title\n\nBody"
 
+    fake_module = types.SimpleNamespace(extract=fake_extract)
     monkeypatch.setitem(__import__("sys").modules, "trafilatura", fake_module)
-    fake_module.fetch_url = fake_fetch_url
-    fake_module.extract = fake_extract
 
     from raindrop_enhancer.content.fetcher import TrafilaturaFetcher
 
@@ -28,3 +25,110 @@ def test_trafilatura_fetcher_timeout_and_extract(monkeypatch):
     r2 = f.fetch("https://example.org/slow")
     assert r2.markdown is None
     assert r2.error is not None
+
+
+def test_download_and_extract_halves(monkeypatch, httpx_mock):
+    httpx_mock.add_response(url="https://example.org/a", html="<p>x</p>")
+    httpx_mock.add_response(url="https://example.org/empty", html="", is_reusable=True)
+    fake_module = types.SimpleNamespace(
+        extract=lambda html, output_format="markdown": f"md:{html}",
+    )
+    monkeypatch.setitem(__import__("sys").modules, "trafilatura", fake_module)
+
+    from raindrop_enhancer.content.fetcher import TrafilaturaFetcher, extract_markdown
+
+    f = TrafilaturaFetcher()
+    d = f.download("https://example.org/a")
+    assert d.html == "<p>x</p>" and d.error is None
+    assert extract_markdown(d.html) == "md:<p>x</p>"
+    assert f.download("https://example.org/empty").error == "no_content"
+    assert f.fetch("https://example.org/empty").error == "no_content"
+
+
+def test_conditional_download_sends_validators(httpx_mock):
+    from raindrop_enhancer.content.fetcher import TrafilaturaFetcher
+    from raindrop_enhancer.models import ContentValidators
+
+    httpx_mock.add_response(
+        url="https://example.org/same",
+        match_headers={"If-None-Match": '"v1"'},
+        status_code=304,
+        headers={"ETag": '"v1"'},
+    )
+    httpx_mock.add_response(
+        url="https://example.org/changed",
+        match_headers={"If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"},
+        text="<p>new</p>",
+        headers={"Last-Modified": "Tue, 02 Jan 2024 00:00:00 GMT"},
+    )
+    f = TrafilaturaFetcher()
+    same = f.download("https://example.org/same", ContentValidators(etag='"v1"'))
+    assert same.not_modified and same.html is None and same.error is None
+    assert same.validators().etag == '"v1"'
+
+    changed = f.download(
+        "https://example.org/changed",
+        ContentValidators(last_modified="Mon, 01 Jan 2024 00:00:00 GMT"),
+    )
+    assert not changed.not_modified
+    assert changed.html == "<p>new</p>"
+    assert changed.validators("h").last_modified == "Tue, 02 Jan 2024 00:00:00 GMT"
+
+
+def test_per_call_timeout(httpx_mock):
+    httpx_mock.add_response(url="https://example.org/a", html="<p>x</p>", is_reusable=True)
+
+    from raindrop_enhancer.content.fetcher import TrafilaturaFetcher
+
+    f = TrafilaturaFetcher(timeout=10.0)
+    f.download("https://example.org/a")
+    f.download("https://example.org/a", timeout=2.5)
+    timeouts = [r.extensions["timeout"]["read"] for r in httpx_mock.get_requests()]
+    assert timeouts == [10.0, 2.5]
+
+
+def test_download_gates_type_and_size(httpx_mock):
+    from raindrop_enhancer.content.fetcher import (
+        TOO_LARGE,
+        UNSUPPORTED_TYPE,
+        TrafilaturaFetcher,
+    )
+
+    httpx_mock.add_response(
+        url="https://example.org/paper.pdf",
+        content=b"%PDF-1.7",
+        headers={"Content-Type": "application/pdf"},
+    )
+    httpx_mock.add_response(
+        url="https://example.org/huge",
+        content=b"<p>" + b"x" * 2000,
+        headers={"Content-Type": "text/html", "Content-Length": "2003"},
+    )
+    httpx_mock.add_response(
+        url="https://example.org/chunked",
+        stream=httpx.ByteStream(b"<p>" + b"x" * 2000),
+        headers={"Content-Type": "text/html"},
+    )
+    httpx_mock.add_response(
+        url="https://example.org/latin1",
+        content='<meta charset="iso-8859-1"><p>caf\xe9</p>'.encode("latin-1"),
+    )
+    f = TrafilaturaFetcher(max_bytes=1000)
+
+    pdf = f.download("https://example.org/paper.pdf")
+    assert (pdf.html, pdf.error, pdf.skipped) == (None, UNSUPPORTED_TYPE, True)
+    huge = f.download("https://example.org/huge")
+    assert (huge.html, huge.error, huge.skipped) == (None, TOO_LARGE, True)
+    chunked = f.download("https://example.org/chunked")
+    assert (chunked.html, chunked.error, chunked.skipped) == (None, TOO_LARGE, True)
+    assert "caf\xe9" in f.download("https://example.org/latin1").html
+
+
+def test_invalid_url_is_an_error_not_an_exception():
+    from raindrop_enhancer.content.fetcher import TrafilaturaFetcher
+
+    f = TrafilaturaFetcher()
+    for url in ("http://[::1", "https://example.org/a\x00b"):
+        d = f.download(url)
+        assert d.html is None and d.error
+        assert f.fetch(url).error
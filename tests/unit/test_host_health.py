@@ -0,0 +1,64 @@
+from raindrop_enhancer.content.host_health import (
+    MIN_SAMPLES,
+    MIN_TIMEOUT,
+    HostHealth,
+    is_host_failure,
+    percentile,
+)
+
+
+def test_host_failures_exclude_page_errors():
+    assert is_host_failure("network")
+    assert is_host_failure("http_503")
+    assert not is_host_failure("http_404")
+    assert not is_host_failure("no_content")
+    assert not is_host_failure(None)
+
+
+def test_percentile_nearest_rank():
+    assert percentile([3, 1, 2], 50) == 2
+    assert percentile(range(1, 101), 95) == 95
+    assert percentile([7], 99) == 7
+
+
+def test_circuit_opens_after_consecutive_failures():
+    health = HostHealth(trip_after=3)
+    for _ in range(2):
+        health.record("dead.example", "network", 10.0)
+    health.record("dead.example", "http_404", 0.1)  # host answered: reset
+    for _ in range(2):
+        health.record("dead.example", "network", 10.0)
+    assert not health.is_open("dead.example")
+    health.record("dead.example", "timed out", 10.0)
+    assert health.is_open("dead.example")
+    assert not health.is_open("ok.example")
+
+    for _ in range(4):
+        health.skip("dead.example")
+    [tripped] = health.tripped()
+    assert (tripped.host, tripped.failures, tripped.skipped) == ("dead.example", 3, 4)
+    assert tripped.seconds_saved == 40.0
+
+
+def test_breaker_can_be_disabled():
+    health = HostHealth(trip_after=0)
+    for _ in range(20):
+        health.record("dead.example", "network", 1.0)
+    assert not health.is_open("dead.example")
+    assert health.tripped() == []
+
+
+def test_timeout_adapts_to_latency():
+    health = HostHealth(timeout=10.0)
+    assert health.timeout_for("a") is None
+    for _ in range(MIN_SAMPLES):
+        health.record("a", None, 1.0)
+        health.record("fast", None, 0.01)
+        health.record("slow", None, 5.0)
+    assert health.timeout_for("a") == 4.0
+    assert health.timeout_for("fast") == MIN_TIMEOUT
+    assert health.timeout_for("slow") == 10.0
+    # a failure restores the full timeout until the host answers again
+    health.record("a", "network", 4.0)
+    assert health.timeout_for("a") is None
+    assert HostHealth(timeout=None).timeout_for("a") is None
@@ -0,0 +1,75 @@
+import threading
+import time
+
+import pytest
+
+from raindrop_enhancer.content.host_limiter import HostLimiter, host_of
+
+
+def test_host_of_normalizes():
+    assert host_of("https://Example.org:8080/a?b") == "example.org"
+    assert host_of("not a url") == ""
+
+
+def test_per_host_concurrency_is_capped():
+    limiter = HostLimiter(per_host=2)
+    active = {"a": 0, "b": 0}
+    peak = {"a": 0, "b": 0}
+    lock = threading.Lock()
+
+    def work(host: str) -> None:
+        with limiter.slot(host):
+            with lock:
+                active[host] += 1
+                peak[host] = max(peak[host], active[host])
+            time.sleep(0.02)
+            with lock:
+                active[host] -= 1
+
+    threads = [threading.Thread(target=work, args=(h,)) for h in "ab" * 5]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak == {"a": 2, "b": 2}
+
+
+def test_min_delay_spaces_request_starts():
+    limiter = HostLimiter(per_host=5, min_delay=0.05)
+    starts = []
+    for _ in range(3):
+        with limiter.slot("a"):
+            starts.append(time.monotonic())
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert all(g >= 0.045 for g in gaps)
+    # other hosts are not delayed
+    t0 = time.monotonic()
+    with limiter.slot("b"):
+        pass
+    assert time.monotonic() - t0 < 0.04
+
+
+def test_rejects_non_positive_limit():
+    with pytest.raises(ValueError):
+        HostLimiter(per_host=0)
+
+
+def test_cancelled_wait_does_not_take_the_slot():
+    limiter = HostLimiter(per_host=1)
+    closed = threading.Event()
+    results = []
+
+    def waiter() -> None:
+        with limiter.slot("a", cancel=closed.is_set) as acquired:
+            results.append(acquired)
+
+    with limiter.slot("a") as acquired:
+        assert acquired
+        t = threading.Thread(target=waiter)
+        t.start()
+        time.sleep(0.02)
+        closed.set()
+    t.join()
+    assert results == [False]
+    with limiter.slot("a", cancel=lambda: False) as acquired:
+        assert acquired
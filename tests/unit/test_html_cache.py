@@ -0,0 +1,54 @@
+from raindrop_enhancer.content.html_cache import HtmlCache
+
+
+def test_put_get_round_trip(tmp_path):
+    cache = HtmlCache(tmp_path / "cache")
+    digest = cache.put(
+        "https://example.org/a", "<p>a</p>", 200, {"etag": '"x"'}, "2025-01-01T00:00:00+00:00"
+    )
+    page = cache.get("https://example.org/a")
+    assert page.html == "<p>a</p>"
+    assert page.status == 200
+    assert page.headers == {"etag": '"x"'}
+    assert page.fetched_at == "2025-01-01T00:00:00+00:00"
+    assert page.digest == digest
+    assert (tmp_path / "cache" / digest[:2] / digest).exists()
+    assert cache.get("https://example.org/missing") is None
+    cache.close()
+
+    # the index survives reopening
+    reopened = HtmlCache(tmp_path / "cache")
+    assert "https://example.org/a" in reopened
+    assert reopened.total_bytes > 0
+
+
+def test_identical_pages_share_a_blob_and_replaced_blobs_are_removed(tmp_path):
+    cache = HtmlCache(tmp_path)
+    d1 = cache.put("https://example.org/a", "<p>same</p>")
+    d2 = cache.put("https://example.org/b", "<p>same</p>")
+    assert d1 == d2
+    size = cache.total_bytes
+
+    d3 = cache.put("https://example.org/a", "<p>changed</p>")
+    # still used by /b
+    assert (tmp_path / d1[:2] / d1).exists()
+    cache.put("https://example.org/b", "<p>changed</p>")
+    assert not (tmp_path / d1[:2] / d1).exists()
+    assert cache.get("https://example.org/b").digest == d3
+    assert cache.total_bytes < size * 2
+
+
+def test_least_recently_used_pages_are_evicted(tmp_path):
+    import os
+
+    # incompressible pages so sizes are predictable
+    pages = {f"https://example.org/{i}": os.urandom(3000).hex() for i in range(4)}
+    cache = HtmlCache(tmp_path, max_bytes=4000 * 3)
+    for url in list(pages)[:3]:
+        cache.put(url, pages[url])
+    cache.get("https://example.org/0")  # 1 is now the least recently used
+    cache.put("https://example.org/3", pages["https://example.org/3"])
+
+    assert "https://example.org/1" not in cache
+    assert {u for u in pages if u in cache} >= {"https://example.org/0", "https://example.org/3"}
+    assert cache.total_bytes <= cache.max_bytes
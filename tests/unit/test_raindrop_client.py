@@ -16,3 +16,22 @@ def test_pagination_and_retry_behavior(httpx_mock):
     assert len(items) == 1
     assert items[0]["_id"] == 1
     client.close()
+
+
+def test_changed_since_stops_at_high_water_mark(httpx_mock):
+    # sorted by -lastUpdate; the walk ends at the first item older than the mark
+    httpx_mock.add_response(
+        method="GET",
+        url="https://api.raindrop.io/rest/v1/raindrops/0?page=0&perpage=200&sort=-lastUpdate",
+        json={
+            "items": [
+                {"_id": 3, "lastUpdate": "2024-03-01T00:00:00.000Z"},
+                {"_id": 2, "lastUpdate": "2024-02-01T00:00:00.000Z"},
+                {"_id": 1, "lastUpdate": "2024-01-01T00:00:00.000Z"},
+            ]
+        },
+    )
+    client = RaindropClient(token="dummy")
+    items = list(client.list_raindrops_changed_since(0, "2024-02-01T00:00:00+00:00"))
+    assert [i["_id"] for i in items] == [3, 2]
+    client.close()
@@ -56,3 +56,110 @@ def test_retry_backoff_increases_delay(httpx_mock):
     assert len(calls) >= 2
     assert calls[0][1] < calls[1][1]
     assert calls[1][2] >= calls[0][2]
+
+
+def _no_sleep(monkeypatch):
+    slept = []
+    monkeypatch.setattr(
+        "raindrop_enhancer.api.raindrop_client.time.sleep", slept.append
+    )
+    return slept
+
+
+def test_retry_after_header_is_honored_exactly(httpx_mock, monkeypatch):
+    slept = _no_sleep(monkeypatch)
+    httpx_mock.add_response(
+        method="GET",
+        url="https://api.raindrop.io/rest/v1/collections",
+        status_code=429,
+        headers={"Retry-After": "7"},
+    )
+    httpx_mock.add_response(
+        method="GET",
+        url="https://api.raindrop.io/rest/v1/collections",
+        json={"items": []},
+    )
+
+    client = RaindropClient(token="x", enforce_rate_limit=False)
+    assert client.list_collections() == []
+    assert slept == [7.0]
+    assert client.slept_seconds == 7.0
+
+
+def test_transient_5xx_and_transport_errors_are_retried(httpx_mock, monkeypatch):
+    import httpx
+
+    _no_sleep(monkeypatch)
+    url = "https://api.raindrop.io/rest/v1/collections"
+    httpx_mock.add_response(method="GET", url=url, status_code=502)
+    httpx_mock.add_exception(httpx.ConnectError("boom"), method="GET", url=url)
+    httpx_mock.add_exception(httpx.ReadTimeout("slow"), method="GET", url=url)
+    httpx_mock.add_response(method="GET", url=url, json={"items": [{"_id": 1}]})
+
+    retries = []
+    client = RaindropClient(token="x", enforce_rate_limit=False)
+    client.on_retry = lambda u, attempt, delay: retries.append(attempt)
+    assert client.list_collections() == [{"_id": 1}]
+    assert retries == [1, 2, 3]
+
+
+def test_retries_are_bounded_and_4xx_raise(httpx_mock, monkeypatch):
+    import httpx
+    import pytest
+
+    from raindrop_enhancer.api.rate_limiter import AdaptiveRateController
+
+    _no_sleep(monkeypatch)
+    url = "https://api.raindrop.io/rest/v1/collections"
+    for _ in range(3):
+        httpx_mock.add_response(method="GET", url=url, status_code=503)
+    client = RaindropClient(
+        token="x",
+        enforce_rate_limit=False,
+        rate_controller=AdaptiveRateController(max_retries=2),
+    )
+    with pytest.raises(httpx.HTTPStatusError):
+        client.list_collections()
+
+    httpx_mock.add_response(method="GET", url=url, status_code=404)
+    with pytest.raises(httpx.HTTPStatusError):
+        client.list_collections()
+
+
+def test_low_remaining_quota_slows_down_preemptively():
+    import httpx
+
+    from raindrop_enhancer.api.rate_limiter import AdaptiveRateController
+
+    now = [1_700_000_000.0]
+    ctl = AdaptiveRateController(low_watermark=5, clock=lambda: now[0])
+    ok = httpx.Response(
+        200,
+        headers={
+            "X-RateLimit-Remaining": "50",
+            "X-RateLimit-Reset": str(int(now[0]) + 30),
+        },
+    )
+    ctl.observe(ok)
+    assert ctl.pre_request_delay() == 0.0
+
+    low = httpx.Response(
+        200,
+        headers={
+            "X-RateLimit-Remaining": "2",
+            "X-RateLimit-Reset": str(int(now[0]) + 30),
+        },
+    )
+    ctl.observe(low)
+    # 30s left, spread over the remaining 2 requests (+1 for the window reset)
+    assert ctl.pre_request_delay() == 10.0
+
+    exhausted = httpx.Response(
+        200,
+        headers={
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset": str(int(now[0]) + 30),
+        },
+    )
+    ctl.observe(exhausted)
+    assert ctl.pre_request_delay() == 30.0
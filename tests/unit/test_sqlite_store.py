@@ -54,6 +54,100 @@ def test_insert_batch_and_append_only(tmp_path: Path):
     assert store.count_links() == 3
 
 
+def test_upsert_batch_counts_inserted_and_changed_rows(tmp_path: Path):
+    store = SQLiteStore(tmp_path / "test.db")
+    store.connect()
+    links = [_make_link(i) for i in range(3)]
+    assert store.upsert_batch(links) == (3, 0)
+    store.update_content(1000, "# kept")
+
+    links[0].title = "Renamed"
+    assert store.upsert_batch(links + [_make_link(3)]) == (1, 1)
+    row = store.conn.execute(
+        "SELECT title FROM raindrop_links WHERE raindrop_id = 1000"
+    ).fetchone()
+    assert row[0] == "Renamed"
+    assert store.get_content(1000) == "# kept"
+
+
+def test_connection_profile_applied_at_connect(tmp_path: Path):
+    import pytest
+
+    store = SQLiteStore(tmp_path / "test.db", profile="bulk")
+    store.connect()
+    assert store.conn.execute("PRAGMA synchronous").fetchone()[0] == 0  # OFF
+    assert store.conn.execute("PRAGMA cache_size").fetchone()[0] == -64000
+    store.close()
+
+    safe = SQLiteStore(tmp_path / "test.db", profile="safe")
+    safe.connect()
+    assert safe.conn.execute("PRAGMA synchronous").fetchone()[0] == 2  # FULL
+    with pytest.raises(ValueError):
+        SQLiteStore(tmp_path / "test.db", profile="turbo")
+
+
+def test_legacy_db_migrated_once(tmp_path: Path, monkeypatch):
+    from raindrop_enhancer.storage import sqlite_store
+
+    db = tmp_path / "legacy.db"
+    # a pre-migration database: base schema only, unreliable user_version
+    conn = sqlite3.connect(db)
+    conn.executescript(sqlite_store.DB_SCHEMA + "PRAGMA user_version = 1;")
+    conn.execute(
+        "ALTER TABLE raindrop_links ADD COLUMN content_markdown TEXT DEFAULT NULL"
+    )
+    conn.execute(
+        "INSERT INTO raindrop_links VALUES (7, 1, 'C', 'T', 'https://x', '', '', '[]', '{}', '# legacy')"
+    )
+    conn.commit()
+    conn.close()
+
+    store = SQLiteStore(db)
+    store.connect()
+    cols = {r[1] for r in store.conn.execute("PRAGMA table_info(raindrop_links)")}
+    assert {"auto_tags_json", "last_updated_at"} <= cols
+    assert "content_markdown" not in cols
+    # inline content moved to link_content
+    assert store.get_content(7) == "# legacy"
+    # queue flags are backfilled from the migrated content
+    assert store.select_uncaptured() == []
+    version = store.conn.execute("PRAGMA user_version").fetchone()[0]
+    assert version == sqlite_store.SCHEMA_VERSION
+    store.close()
+
+    # an up-to-date database runs no migration step on connect
+    def _fail(self):
+        raise AssertionError("migration step re-run")
+
+    for _, step in sqlite_store.MIGRATIONS:
+        monkeypatch.setattr(SQLiteStore, step, _fail)
+    again = SQLiteStore(db)
+    again.connect()
+    assert again.count_links() == 1
+
+
+def test_work_queues_use_partial_indexes(tmp_path: Path):
+    store = SQLiteStore(tmp_path / "queues.db")
+    store.connect()
+    store.insert_batch([_make_link(i) for i in (1, 2, 3)])
+    store.update_content(1001, "# one")
+    store.write_auto_tags_batch([(1002, '["a"]', "{}"), (1003, "[]", "{}")])
+    assert [r[0] for r in store.select_uncaptured()] == [1002, 1003]
+    assert [r[0] for r in store.fetch_untagged_links()] == [1001, 1003]
+    store.clear_content_for_link(1001)
+    assert [r[0] for r in store.select_uncaptured()] == [1001, 1002, 1003]
+
+    def plan(sql: str) -> str:
+        return " ".join(r[3] for r in store.conn.execute("EXPLAIN QUERY PLAN " + sql))
+
+    assert "idx_links_uncaptured" in plan(
+        "SELECT raindrop_id, url FROM raindrop_links WHERE has_content = 0 ORDER BY synced_at"
+    )
+    assert "idx_links_untagged" in plan(
+        "SELECT raindrop_id FROM raindrop_links WHERE has_auto_tags = 0 ORDER BY synced_at"
+    )
+
+
 def test_corruption_detection(tmp_path: Path):
     db = tmp_path / "test.db"
     store = SQLiteStore(db)
@@ -122,3 +216,26 @@ def test_ensure_tagging_columns_creates_columns(tmp_path: Path):
     assert cols["auto_tags_meta_json"][3] == 0, "auto_tags_meta_json should allow NULL"
 
     cur.close()
+
+
+def test_keyset_iterators_page_through_queues(tmp_path: Path):
+    store = SQLiteStore(tmp_path / "pages.db")
+    store.connect()
+    store.insert_batch([_make_link(i) for i in range(7)])
+    ids = list(range(1000, 1007))
+    assert [r[0] for r in store.iter_all_links(page_size=2)] == ids
+    assert [r[0] for r in store.iter_all_links(limit=5, page_size=2)] == ids[:5]
+
+    # capturing while iterating neither skips nor repeats pending links
+    seen = []
+    for rid, _url in store.iter_uncaptured(page_size=3):
+        seen.append(rid)
+        store.update_content(rid, "# captured")
+    assert sorted(seen) == ids
+    assert store.select_uncaptured() == []
+
+    store.write_auto_tags_batch([(1003, '["a"]', "{}")])
+    untagged = store.iter_untagged_links(page_size=2)
+    assert next(untagged)[3] == "# captured"
+    assert [r[0] for r in untagged] == [i for i in ids if i != 1003][1:]
+    assert store.count_untagged_links() == 6
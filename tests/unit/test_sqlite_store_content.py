@@ -1,4 +1,6 @@
 from pathlib import Path
+
+import pytest
 from raindrop_enhancer.storage.sqlite_store import SQLiteStore
 from raindrop_enhancer.models import RaindropLink
 from datetime import datetime, timezone
@@ -33,23 +35,247 @@ def test_update_and_clear_content(tmp_path: Path):
     store = SQLiteStore(db)
     store.connect()
     store.insert_batch([_make_link(2, "https://example.org/a2")])
-    store._ensure_content_columns()
     store.update_content(2, "MD CONTENT", source="test")
-    cur = store.conn.cursor()
-    cur.execute("SELECT content_markdown FROM raindrop_links WHERE raindrop_id = 2")
-    row = cur.fetchone()
-    assert row[0] == "MD CONTENT"
+    assert store.get_content(2) == "MD CONTENT"
+    row = store.conn.execute(
+        "SELECT content_source, byte_size, content_hash FROM link_content WHERE raindrop_id = 2"
+    ).fetchone()
+    assert row[0] == "test"
+    assert row[1] == len(b"MD CONTENT")
+    assert len(row[2]) == 64
+    assert store.select_uncaptured() == []
     store.clear_content_for_link(2)
-    cur.execute("SELECT content_markdown FROM raindrop_links WHERE raindrop_id = 2")
-    row2 = cur.fetchone()
-    assert row2[0] is None
+    assert store.get_content(2) is None
+    assert store.select_uncaptured() == [(2, "https://example.org/a2")]
+    # content is only stored for existing links
+    store.update_content(99, "orphan")
+    assert store.get_content(99) is None
 
 
-def test_connect_ensures_content_columns(tmp_path: Path):
+def test_connect_keeps_content_out_of_links_table(tmp_path: Path):
     db = tmp_path / "auto-migration.db"
     store = SQLiteStore(db)
     store.connect()
     cur = store.conn.cursor()
     cur.execute("PRAGMA table_info(raindrop_links)")
     cols = {row[1] for row in cur.fetchall()}
-    assert {"content_markdown", "content_fetched_at", "content_source"} <= cols
+    assert not {"content_markdown", "content_fetched_at", "content_source"} & cols
+    cur.execute("PRAGMA table_info(link_content)")
+    content_cols = {row[1] for row in cur.fetchall()}
+    assert {"content_markdown", "content_source", "fetched_at"} <= content_cols
+    assert {"byte_size", "content_hash"} <= content_cols
+
+
+def _markdown(i: int) -> str:
+    return (
+        f"# Article {i}\n\nShare this article on social media\n\n"
+        + f"Paragraph {i} about storage and compression. " * 40
+        + "\n\nSubscribe to our newsletter for more stories\n"
+    )
+
+
+def test_content_compressed_transparently(tmp_path: Path):
+    store = SQLiteStore(tmp_path / "zlib.db", compression="zlib")
+    store.connect()
+    store.insert_batch([_make_link(i, f"https://example.org/{i}") for i in (1, 2)])
+    store.update_content(1, _markdown(1))
+    store.update_content(2, "short")
+    rows = dict(
+        store.conn.execute(
+            "SELECT raindrop_id, codec FROM link_content"
+        ).fetchall()
+    )
+    # tiny documents stay plain text
+    assert rows == {1: "zlib", 2: None}
+    value, size = store.conn.execute(
+        "SELECT content_markdown, byte_size FROM link_content WHERE raindrop_id = 1"
+    ).fetchone()
+    assert isinstance(value, bytes) and len(value) < size == len(_markdown(1))
+    assert store.get_content(1) == _markdown(1)
+    assert store.get_content(2) == "short"
+    assert store.fetch_untagged_links()[0][3] == _markdown(1)
+
+
+def test_content_stored_as_plain_text_by_default(tmp_path: Path):
+    store = SQLiteStore(tmp_path / "plain.db")
+    store.connect()
+    store.insert_batch([_make_link(1, "https://example.org/1")])
+    store.update_content(1, _markdown(1))
+    row = store.conn.execute(
+        "SELECT content_markdown, codec FROM link_content WHERE raindrop_id = 1"
+    ).fetchone()
+    assert tuple(row) == (_markdown(1), None)
+
+
+def test_recompress_with_trained_dictionary(tmp_path: Path):
+    db = tmp_path / "recompress.db"
+    store = SQLiteStore(db, compression="none")
+    store.connect()
+    store.insert_batch([_make_link(i, f"https://example.org/{i}") for i in range(20)])
+    for i in range(20):
+        store.update_content(i, _markdown(i))
+    store.close()
+
+    store = SQLiteStore(db, compression="zlib")
+    store.connect()
+    dict_id = store.train_content_dictionary()
+    assert dict_id is not None
+    stats = store.recompress_content(batch_size=7)
+    assert stats["rows"] == stats["rewritten"] == 20
+    assert stats["bytes_after"] < stats["bytes_before"]
+    codecs = {r[0] for r in store.conn.execute("SELECT codec FROM link_content")}
+    assert codecs == {f"zlib:{dict_id}"}
+    store.close()
+
+    # a fresh connection reads dictionary-compressed rows back
+    store = SQLiteStore(db, compression="none")
+    store.connect()
+    assert store.get_content(5) == _markdown(5)
+    # decompressing everything again leaves the now unused dictionary behind
+    assert store.recompress_content()["rewritten"] == 20
+    assert store.conn.execute("SELECT COUNT(*) FROM compression_dicts").fetchone()[0] == 0
+    assert store.get_content(5) == _markdown(5)
+
+
+def test_zstd_round_trip(tmp_path: Path):
+    pytest.importorskip("zstandard")
+    store = SQLiteStore(tmp_path / "zstd.db", compression="zstd")
+    store.connect()
+    store.insert_batch([_make_link(1, "https://example.org/1")])
+    store.update_content(1, _markdown(1))
+    assert store.conn.execute("SELECT codec FROM link_content").fetchone()[0] == "zstd"
+    assert store.get_content(1) == _markdown(1)
+
+
+def test_validators_stored_and_marked_unchanged(tmp_path: Path):
+    from raindrop_enhancer.models import ContentValidators
+
+    store = SQLiteStore(tmp_path / "test.db")
+    store.connect()
+    store.insert_batch([_make_link(1, "https://example.org/1"), _make_link(2, "https://example.org/2")])
+    v = ContentValidators(etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT", body_hash="h1")
+    store.update_content_batch([(1, "# one", "trafilatura", v)])
+    assert store.get_validators(1) == v
+    assert store.get_validators(2) is None
+    assert [r[2] for r in store.iter_refresh_links()] == [v, None]
+
+    # a 304 that sends a new ETag only replaces that validator
+    assert store.mark_unchanged_batch([(1, ContentValidators(etag='"v2"'))]) == 1
+    assert store.get_validators(1) == ContentValidators('"v2"', v.last_modified, "h1")
+    assert store.get_content(1) == "# one"
+    checked = store.conn.execute(
+        "SELECT checked_at FROM link_content WHERE raindrop_id = 1"
+    ).fetchone()[0]
+    assert checked is not None
+
+    # new content without validators clears the stale ones
+    store.update_content(1, "# one, again")
+    assert store.get_validators(1) == ContentValidators()
+
+
+def test_stale_links_ranked_by_age_change_rate_and_failures(tmp_path: Path):
+    from datetime import timedelta
+
+    store = SQLiteStore(tmp_path / "test.db")
+    store.connect()
+    store.insert_batch([_make_link(i, f"https://example.org/{i}") for i in range(1, 6)])
+    store.update_content_batch([(i, f"# {i}", "trafilatura") for i in range(1, 6)])
+    now = datetime.now(timezone.utc)
+
+    def age(link_id, captured_days, checked_days, changes=0, failures=0):
+        store.conn.execute(
+            "UPDATE link_content SET captured_since = ?, checked_at = ?, "
+            "change_count = ? WHERE raindrop_id = ?",
+            (
+                (now - timedelta(days=captured_days)).isoformat(),
+                (now - timedelta(days=checked_days)).isoformat(),
+                changes,
+                link_id,
+            ),
+        )
+        if failures:
+            # backoff already expired, so only the ranking is affected
+            store.conn.execute(
+                "INSERT INTO capture_backoff (raindrop_id, failures, next_attempt_at) "
+                "VALUES (?, ?, ?)",
+                (link_id, failures, (now - timedelta(days=1)).isoformat()),
+            )
+
+    age(1, 100, 10)  # quiet page, checked 10 days ago
+    age(2, 100, 10, changes=20)  # changes often
+    age(3, 100, 40)  # quiet but long unchecked
+    age(4, 100, 40, failures=3)  # keeps failing
+    age(5, 100, 0.1)  # just checked
+    store.conn.commit()
+
+    ranked = [r[0] for r in store.iter_stale_links(page_size=2, now=now)]
+    assert ranked == [2, 3, 1, 4]
+    assert [r[0] for r in store.iter_stale_links(limit=2, now=now)] == [2, 3]
+    assert [r[0] for r in store.iter_stale_links(min_age_days=20, now=now)] == [3, 4]
+
+    # a failed recapture keeps content and backs the link off
+    from raindrop_enhancer.models import LinkCaptureAttempt
+
+    store.record_capture_attempts(
+        [LinkCaptureAttempt(2, now, "failed", error_type="network")]
+    )
+    assert store.get_content(2) == "# 2"
+    assert 2 not in [r[0] for r in store.iter_stale_links(now=now)]
+    assert 2 in [r[0] for r in store.iter_stale_links(now=now, include_backoff=True)]
+
+
+def test_failed_captures_back_off_then_quarantine(tmp_path: Path):
+    from raindrop_enhancer.models import LinkCaptureAttempt
+    from raindrop_enhancer.storage.sqlite_store import CAPTURE_QUARANTINE_AFTER
+
+    store = SQLiteStore(tmp_path / "test.db")
+    store.connect()
+    store.insert_batch([_make_link(i, f"https://example.org/{i}") for i in range(1, 4)])
+    now = datetime.now(timezone.utc)
+
+    def attempt(link_id, status, error_type=None):
+        return LinkCaptureAttempt(link_id, now, status, error_type=error_type, duration_ms=5)
+
+    store.record_capture_attempts(
+        [attempt(1, "failed", "network"), attempt(2, "skipped", "not_cached"), attempt(3, "success")]
+    )
+    assert [r[0] for r in store.iter_uncaptured()] == [2, 3]
+    assert [r[0] for r in store.iter_uncaptured(include_backoff=True)] == [1, 2, 3]
+    assert store.capture_backoff_counts() == (1, 0)
+
+    for _ in range(CAPTURE_QUARANTINE_AFTER - 1):
+        store.record_capture_attempts([attempt(1, "failed", "network")])
+    assert store.capture_backoff_counts() == (0, 1)
+    log = store.conn.execute(
+        "SELECT retry_count, status, error_type, duration_ms FROM capture_attempts "
+        "WHERE raindrop_id = 1 ORDER BY id"
+    ).fetchall()
+    assert [r[0] for r in log] == list(range(CAPTURE_QUARANTINE_AFTER))
+    assert tuple(log[0])[1:] == ("failed", "network", 5)
+
+    # a later success clears the backoff
+    store.record_capture_attempts([attempt(1, "success")])
+    assert store.capture_backoff_counts() == (0, 0)
+    assert store.prune_capture_attempts(keep_days=0) == CAPTURE_QUARANTINE_AFTER + 3
+
+
+def test_full_refresh_drops_capture_history_of_deleted_links(tmp_path: Path):
+    from raindrop_enhancer.models import LinkCaptureAttempt
+
+    store = SQLiteStore(tmp_path / "test.db")
+    store.connect()
+    store.insert_batch([_make_link(i, f"https://example.org/{i}") for i in (1, 2)])
+    now = datetime.now(timezone.utc)
+    store.update_content(1, "# 1")
+    store.update_content(2, "# 2")
+    store.record_capture_attempts(
+        [LinkCaptureAttempt(i, now, "failed", error_type="network") for i in (1, 2)]
+    )
+
+    # raindrop 2 was deleted upstream
+    store.begin_shadow_refresh("run-1")
+    store.insert_batch([_make_link(1, "https://example.org/1")])
+    store.finish_shadow_refresh()
+    for table in ("link_content", "capture_backoff", "capture_attempts"):
+        ids = store.conn.execute(f"SELECT DISTINCT raindrop_id FROM {table}").fetchall()
+        assert [r[0] for r in ids] == [1], table
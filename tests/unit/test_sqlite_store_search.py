@@ -0,0 +1,248 @@
+from dataclasses import replace
+from pathlib import Path
+
+from raindrop_enhancer.models import RaindropLink
+from raindrop_enhancer.storage.sqlite_store import SQLiteStore
+
+
+def _make_link(rid: int, title: str, tags: str = "[]") -> RaindropLink:
+    return RaindropLink(
+        raindrop_id=rid,
+        collection_id=1,
+        collection_title="C",
+        title=title,
+        url=f"https://example.org/{rid}",
+        created_at="2025-01-01T00:00:00Z",
+        synced_at="2025-01-01T00:00:00Z",
+        tags_json=tags,
+        raw_payload="{}",
+    )
+
+
+def _check_index(store: SQLiteStore) -> None:
+    # a contentless index has no text to check itself against: compare its
+    # per-column term counts with those of a fresh rebuild
+    store.conn.execute(
+        "INSERT INTO link_search(link_search, rank) VALUES ('integrity-check', 1)"
+    )
+    store.conn.commit()
+    store.conn.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS temp.link_vocab USING fts5vocab(main, link_search, 'col')"
+    )
+    vocab = "SELECT term, col, doc, cnt FROM temp.link_vocab ORDER BY term, col"
+    before = [tuple(r) for r in store.conn.execute(vocab)]
+    store.rebuild_search_index()
+    assert [tuple(r) for r in store.conn.execute(vocab)] == before
+
+
+def _ids(store: SQLiteStore, query: str) -> list[int]:
+    return [h.raindrop_id for h in store.search(query)]
+
+
+def test_search_follows_links_content_and_tags(tmp_path: Path):
+    store = SQLiteStore(tmp_path / "search.db", compression="zlib")
+    store.connect()
+    store.insert_batch(
+        [
+            _make_link(1, "Indexing SQLite databases", '["databases"]'),
+            _make_link(2, "Gardening notes"),
+            _make_link(3, "Cooking pasta"),
+        ]
+    )
+    assert _ids(store, "sqlite") == [1]
+    assert _ids(store, "databases") == [1]
+
+    body = "Tomatoes need sunlight and regular watering. " * 20
+    store.update_content(2, body)
+    hits = store.search("tomatoes")
+    assert [h.raindrop_id for h in hits] == [2]
+    assert "[Tomatoes]" in hits[0].snippet
+    # the index keeps no copy of the text
+    tables = {r[0] for r in store.conn.execute("SELECT name FROM sqlite_master")}
+    assert "link_search_content" not in tables
+    assert store.conn.execute("SELECT content FROM link_search WHERE rowid = 2").fetchone()[0] is None
+
+    store.write_auto_tags_batch([(3, '["italian"]', "{}")])
+    assert _ids(store, "italian") == [3]
+
+    # edits from sync replace the indexed title
+    store.upsert_batch([replace(_make_link(3, "Baking bread"), synced_at="2025-02-01")])
+    assert _ids(store, "pasta") == []
+    assert _ids(store, "bread") == [3]
+
+    store.update_content(2, "Roses in winter")
+    assert _ids(store, "tomatoes") == []
+    store.clear_content_for_link(2)
+    assert _ids(store, "roses") == []
+    assert _ids(store, "gardening") == [2]
+
+    store.delete_links([1])
+    assert _ids(store, "sqlite") == []
+    _check_index(store)
+
+
+def test_search_ranks_title_matches_first_and_accepts_plain_words(tmp_path: Path):
+    store = SQLiteStore(tmp_path / "rank.db")
+    store.connect()
+    store.insert_batch([_make_link(1, "Misc"), _make_link(2, "Python packaging")])
+    store.update_content(1, "A note that mentions python once among other things.")
+    assert _ids(store, "python") == [2, 1]
+    assert _ids(store, "python NOT packaging") == [1]
+    # invalid FTS5 syntax falls back to plain words
+    assert _ids(store, 'python "') == [2, 1]
+    assert _ids(store, "nosuchcolumn:python") == []
+
+
+def test_search_reports_errors_other_than_query_syntax(tmp_path: Path):
+    import sqlite3
+
+    import pytest
+
+    store = SQLiteStore(tmp_path / "broken.db")
+    store.connect()
+    store.conn.execute("DROP TABLE link_search")
+    with pytest.raises(sqlite3.OperationalError, match="no such table"):
+        store.search("python")
+
+
+def test_search_index_survives_full_refresh_and_recompression(tmp_path: Path):
+    store = SQLiteStore(tmp_path / "refresh.db", compression="none")
+    store.connect()
+    store.insert_batch([_make_link(1, "Alpha"), _make_link(2, "Beta")])
+    store.update_content(1, "kept content about zebras " * 20)
+
+    store.begin_shadow_refresh("run-1")
+    store.insert_batch([_make_link(1, "Alpha renamed"), _make_link(3, "Gamma")])
+    store.finish_shadow_refresh()
+    assert _ids(store, "zebras") == [1]
+    assert _ids(store, "renamed") == [1]
+    assert _ids(store, "beta") == []
+    assert _ids(store, "gamma") == [3]
+    _check_index(store)
+    store.close()
+
+    store = SQLiteStore(tmp_path / "refresh.db", compression="zlib")
+    store.connect()
+    store.recompress_content()
+    assert _ids(store, "zebras") == [1]
+    _check_index(store)
+
+
+def test_other_sqlite_clients_can_write_indexed_tables(tmp_path: Path):
+    import sqlite3
+
+    db = tmp_path / "external.db"
+    store = SQLiteStore(db, compression="zlib")
+    store.connect()
+    store.insert_batch([_make_link(1, "Alpha"), _make_link(2, "Beta")])
+    store.update_content(1, "compressed content about zebras " * 20)
+    store.close()
+
+    # no custom functions registered on this connection
+    conn = sqlite3.connect(db)
+    conn.execute("UPDATE raindrop_links SET title = 'Alpha renamed' WHERE raindrop_id = 1")
+    conn.execute("DELETE FROM link_content WHERE raindrop_id = 1")
+    conn.execute("DELETE FROM raindrop_links WHERE raindrop_id = 2")
+    conn.commit()
+    conn.close()
+
+    store = SQLiteStore(db)
+    store.connect()
+    assert _ids(store, "renamed") == [1]
+    assert _ids(store, "zebras") == []
+    assert _ids(store, "beta") == []
+    _check_index(store)
+
+
+def test_view_backed_search_index_is_migrated(tmp_path: Path):
+    from raindrop_enhancer.storage import sqlite_store
+
+    db = tmp_path / "legacy.db"
+    store = SQLiteStore(db)
+    store.connect()
+    store.insert_batch([_make_link(1, "Alpha")])
+    store.update_content(1, "legacy content about zebras " * 20)
+    # the index layout before content was stored in it
+    conn = store.conn
+    conn.create_function("decode_content", 2, lambda v, codec: v)
+    for kind, name in sqlite_store.SEARCH_SYNC_OBJECTS:
+        conn.execute(f"DROP {kind.upper()} {name}")
+    conn.execute("DROP TABLE link_search")
+    conn.executescript(
+        "CREATE VIEW link_search_source AS SELECT l.raindrop_id, l.title, l.url, "
+        "l.tags_json AS tags, l.auto_tags_json AS auto_tags, "
+        "decode_content(c.content_markdown, c.codec) AS content FROM raindrop_links AS l "
+        "LEFT JOIN link_content AS c ON c.raindrop_id = l.raindrop_id;"
+        "CREATE VIRTUAL TABLE link_search USING fts5(title, url, tags, auto_tags, content, "
+        "content='link_search_source', content_rowid='raindrop_id');"
+        "INSERT INTO link_search(link_search) VALUES ('rebuild');"
+        "PRAGMA user_version = 13;"
+    )
+    store.close()
+
+    store = SQLiteStore(db)
+    store.connect()
+    assert _ids(store, "zebras") == [1]
+    views = store.conn.execute("SELECT name FROM sqlite_master WHERE type = 'view'").fetchall()
+    assert views == []
+    _check_index(store)
+
+
+def test_full_refresh_reindexes_only_changed_links(tmp_path: Path, monkeypatch):
+    store = SQLiteStore(tmp_path / "swap.db", compression="zlib")
+    store.connect()
+    store.insert_batch([_make_link(i, f"Link {i}") for i in (1, 2, 3)])
+    for i in (1, 2, 3):
+        store.update_content(i, f"content number{i} " * 20)
+
+    decoded = []
+    original = store._decode_content
+
+    def decode(value, codec):
+        text = original(value, codec)
+        decoded.append(text)
+        return text
+
+    store.begin_shadow_refresh("run-1")
+    store.insert_batch([_make_link(1, "Link 1"), _make_link(2, "Renamed")])
+    monkeypatch.setattr(store, "_decode_content", decode)
+    store.finish_shadow_refresh()
+    assert not any("number1" in (t or "") for t in decoded)
+    assert _ids(store, "number1") == [1]
+    assert _ids(store, "renamed") == [2]
+    assert _ids(store, "number3") == []
+    _check_index(store)
+
+
+def test_plain_text_search_index_is_migrated_to_contentless(tmp_path: Path):
+    from raindrop_enhancer.storage import sqlite_store
+
+    db = tmp_path / "plain.db"
+    store = SQLiteStore(db)
+    store.connect()
+    store.insert_batch([_make_link(1, "Alpha")])
+    store.update_content(1, "plain content about zebras " * 20)
+    # the index layout that stored its own copy of the text
+    conn = store.conn
+    for kind, name in sqlite_store.SEARCH_SYNC_OBJECTS:
+        conn.execute(f"DROP {kind.upper()} {name}")
+    conn.executescript(
+        "DROP TABLE link_search; DROP TABLE link_search_pending;"
+        "CREATE VIRTUAL TABLE link_search USING fts5(title, url, tags, auto_tags, content);"
+        "INSERT INTO link_search(rowid, title, url, tags, auto_tags, content) "
+        "SELECT l.raindrop_id, l.title, l.url, l.tags_json, l.auto_tags_json, c.content_markdown "
+        "FROM raindrop_links AS l LEFT JOIN link_content AS c ON c.raindrop_id = l.raindrop_id;"
+        "PRAGMA user_version = 14;"
+    )
+    store.close()
+
+    store = SQLiteStore(db)
+    store.connect()
+    sql = store.conn.execute(
+        "SELECT sql FROM sqlite_master WHERE name = 'link_search'"
+    ).fetchone()[0]
+    assert "content=''" in sql
+    hits = store.search("zebras")
+    assert [h.raindrop_id for h in hits] == [1]
+    assert "[zebras]" in hits[0].snippet
+    _check_index(store)
@@ -63,6 +63,27 @@ def test_full_refresh_flag_resets_db(tmp_path: Path):
     assert outcome2.new_links == 2
 
 
+def test_full_refresh_keeps_captured_content_and_tags(tmp_path: Path):
+    db = tmp_path / "test.db"
+    payloads = _make_payloads(3)
+    orch = Orchestrator(db, StubClient(payloads))
+    orch.run(full_refresh=True, dry_run=False)
+    orch.store.update_content(1, "# captured")
+    orch.store.write_auto_tags_batch([(1, '["a"]', "{}")])
+
+    # raindrop 3 no longer exists upstream and raindrop 1 was renamed
+    refreshed = [dict(payloads[0], title="Renamed"), payloads[1]]
+    orch2 = Orchestrator(db, StubClient(refreshed))
+    outcome = orch2.run(full_refresh=True, dry_run=False)
+    assert outcome.total_links == 2
+    row = orch2.store.conn.execute(
+        "SELECT title, auto_tags_json FROM raindrop_links WHERE raindrop_id = 1"
+    ).fetchone()
+    assert tuple(row) == ("Renamed", '["a"]')
+    assert orch2.store.get_content(1) == "# captured"
+    assert not orch2.store.shadow_refresh_pending()
+
+
 def test_incremental_updates_cursor_and_dry_run(tmp_path: Path):
     db = tmp_path / "test.db"
     # initial payloads
@@ -86,3 +107,262 @@ def test_incremental_updates_cursor_and_dry_run(tmp_path: Path):
     orch3 = Orchestrator(db, client2)
     outcome_real = orch3.run(full_refresh=False, dry_run=False)
     assert outcome_real.new_links == 2
+
+
+class SlowStubClient(StubClient):
+    def list_collections(self):
+        return [{"_id": 1, "title": "A"}, {"_id": 2, "title": "B"}]
+
+    def list_raindrops_since(self, collection_id: int, iso_cursor: str | None = None):
+        for p in self._payloads:
+            if p["collectionId"] == collection_id:
+                yield p
+
+
+def test_pipelined_sync_writes_everything_and_reports_stages(tmp_path: Path):
+    db = tmp_path / "test.db"
+    payloads = _make_payloads(450)
+    for p in payloads[200:]:
+        p["collectionId"] = 2
+    orch = Orchestrator(db, SlowStubClient(payloads))
+    orch.pipeline = True
+    orch.queue_size = 1
+    orch.commit_every = 250
+    outcome = orch.run(full_refresh=True, dry_run=False)
+    assert outcome.new_links == 450
+    assert outcome.total_links == 450
+    assert outcome.fetch_seconds > 0
+    assert outcome.write_seconds > 0
+
+
+def test_pipelined_sync_propagates_fetch_errors(tmp_path: Path):
+    import pytest
+
+    class FailingClient(StubClient):
+        def list_raindrops_since(self, collection_id, iso_cursor=None):
+            yield from self._payloads
+            raise RuntimeError("network down")
+
+    orch = Orchestrator(tmp_path / "test.db", FailingClient(_make_payloads(120)))
+    orch.pipeline = True
+    with pytest.raises(RuntimeError, match="network down"):
+        orch.run(full_refresh=True, dry_run=False)
+    # complete batches received before the failure are still committed
+    assert orch.store.count_links() == 100
+
+
+class PagedStubClient(StubClient):
+    """Serves collections in 200-item pages and can fail mid-walk."""
+
+    def __init__(self, payloads, collections, fail_after=None):
+        super().__init__(payloads)
+        self.collections = collections
+        self.fail_after = fail_after
+        self.calls = []
+
+    def list_collections(self):
+        return self.collections
+
+    def list_raindrops_since(self, collection_id, iso_cursor=None, start_page=0):
+        self.calls.append((collection_id, iso_cursor, start_page))
+        items = [p for p in self._payloads if p["collectionId"] == collection_id]
+        for n, p in enumerate(items[start_page * 200 :]):
+            if self.fail_after is not None and n >= self.fail_after:
+                raise RuntimeError("connection reset")
+            yield p
+
+
+def test_interrupted_sync_resumes_from_checkpoint(tmp_path: Path):
+    import pytest
+
+    db = tmp_path / "test.db"
+    payloads = _make_payloads(450)
+    collections = [{"_id": 1, "title": "A", "lastUpdate": "2024-01-01T00:00:00Z"}]
+    client = PagedStubClient(payloads, collections, fail_after=330)
+    with pytest.raises(RuntimeError, match="connection reset"):
+        Orchestrator(db, client).run(full_refresh=True, dry_run=False)
+
+    # 300 links (three complete batches) and their checkpoint were committed;
+    # the resumed walk restarts at page 1 and skips the 100 already stored.
+    client2 = PagedStubClient(payloads, collections)
+    outcome = Orchestrator(db, client2).run(full_refresh=False, dry_run=False)
+    assert outcome.resumed is True
+    assert (1, None, 1) in client2.calls
+    assert outcome.new_links == 150
+    assert outcome.total_links == 450
+
+
+def test_failed_full_refresh_never_swaps_in_a_later_runs_shadow(tmp_path: Path):
+    import pytest
+
+    db = tmp_path / "test.db"
+    payloads = _make_payloads(450)
+    collections = [{"_id": 1, "title": "A", "lastUpdate": "2024-01-01T00:00:00Z"}]
+    orch = Orchestrator(db, PagedStubClient(payloads, collections))
+    orch.run(full_refresh=True, dry_run=False)
+    orch.store.update_content(1, "# captured")
+
+    class NoCollectionsClient(PagedStubClient):
+        def list_collections(self):
+            raise RuntimeError("collections unavailable")
+
+    # the refresh fails before committing anything: its shadow is dropped
+    failing = Orchestrator(db, NoCollectionsClient(payloads, collections))
+    with pytest.raises(RuntimeError, match="collections unavailable"):
+        failing.run(full_refresh=True, dry_run=False)
+    assert not failing.store.shadow_refresh_pending()
+
+    # an interrupted incremental run, resumed next time, writes to the live table
+    newer = _make_payloads(450, start=datetime.now(timezone.utc) + timedelta(hours=1))
+    for i, p in enumerate(newer):
+        p["_id"] = 1000 + i
+    collections[0]["lastUpdate"] = "2024-02-01T00:00:00Z"
+    with pytest.raises(RuntimeError, match="connection reset"):
+        Orchestrator(db, PagedStubClient(newer, collections, fail_after=150)).run(
+            full_refresh=False, dry_run=False
+        )
+    outcome = Orchestrator(db, PagedStubClient(newer, collections)).run(
+        full_refresh=False, dry_run=False
+    )
+    assert outcome.resumed is True
+    assert outcome.was_full_refresh is False
+    assert outcome.total_links == 900
+    assert _stored_content(db) == "# captured"
+
+
+def test_interrupted_incremental_drops_stale_shadow(tmp_path: Path):
+    db = tmp_path / "test.db"
+    orch = Orchestrator(db, StubClient(_make_payloads(3)))
+    orch.run(full_refresh=True, dry_run=False)
+    # a shadow table owned by some other (abandoned) run
+    orch.store.begin_shadow_refresh("abandoned")
+    orch.store.close()
+
+    outcome = Orchestrator(db, StubClient(_make_payloads(3))).run(
+        full_refresh=False, dry_run=False
+    )
+    assert outcome.total_links == 3
+    check = Orchestrator(db, StubClient([]))
+    check.store.connect()
+    assert not check.store.shadow_refresh_pending()
+
+
+def _stored_content(db: Path):
+    orch = Orchestrator(db, StubClient([]))
+    orch.store.connect()
+    return orch.store.get_content(1)
+
+
+def test_unchanged_collection_is_skipped(tmp_path: Path):
+    db = tmp_path / "test.db"
+    payloads = _make_payloads(6)
+    for p in payloads[3:]:
+        p["collectionId"] = 2
+    collections = [
+        {"_id": 1, "title": "A", "count": 3, "lastUpdate": "2024-01-01T00:00:00Z"},
+        {"_id": 2, "title": "B", "count": 3, "lastUpdate": "2024-01-01T00:00:00Z"},
+        {"_id": 3, "title": "C", "count": 0, "lastUpdate": "2024-01-01T00:00:00Z"},
+    ]
+    orch = Orchestrator(db, PagedStubClient(payloads, collections))
+    orch.run(full_refresh=True)
+    known = orch.store.get_collections()
+    assert known[1].count == 3
+    assert known[1].last_updated_at.year == 2024
+
+    # 2 has a new lastUpdate, 3 a new count; only 1 is unchanged
+    collections[1] = dict(collections[1], lastUpdate="2024-02-01T00:00:00Z")
+    collections[2] = dict(collections[2], count=1)
+    client = PagedStubClient(payloads, collections)
+    outcome = Orchestrator(db, client).run(full_refresh=False, dry_run=False)
+    assert outcome.collections_skipped == 1
+    walked = [call[0] for call in client.calls]
+    assert 1 not in walked
+    assert 2 in walked and 3 in walked
+    assert outcome.resumed is False
+
+
+class ChangesStubClient(StubClient):
+    """In-memory account supporting lastUpdate walks, trash and stats."""
+
+    def __init__(self, payloads, trash=()):
+        super().__init__(payloads)
+        self.trash = list(trash)
+        self.walked = []
+
+    def list_collections(self):
+        count = sum(1 for p in self._payloads if p["collectionId"] == 1)
+        return [{"_id": 1, "title": "Test", "count": count}]
+
+    def get_user_stats(self):
+        return []
+
+    def list_raindrops_since(self, collection_id, iso_cursor=None):
+        self.walked.append(collection_id)
+        return [p for p in self._payloads if p["collectionId"] == collection_id]
+
+    def list_raindrops_changed_since(self, collection_id, iso_since=None):
+        source = self.trash if collection_id == -99 else self._payloads
+        items = sorted(source, key=lambda p: p["lastUpdate"], reverse=True)
+        return [p for p in items if iso_since is None or p["lastUpdate"] >= iso_since]
+
+
+def test_track_changes_applies_edits_and_deletions(tmp_path: Path):
+    db = tmp_path / "test.db"
+    payloads = _make_payloads(5, start=datetime(2024, 1, 1, tzinfo=timezone.utc))
+    for p in payloads:
+        p["lastUpdate"] = p["created"]
+    Orchestrator(db, ChangesStubClient(payloads)).run(full_refresh=True)
+
+    later = "2024-06-01T00:00:00Z"
+    edited = dict(payloads[0], title="Edited", lastUpdate=later)
+    trashed = dict(payloads[1], collectionId=-99, lastUpdate=later)
+    # payloads[2] is removed permanently: only the collection count shows it
+    current = [edited, payloads[3], payloads[4]]
+    client = ChangesStubClient(current, trash=[trashed])
+    orch = Orchestrator(db, client)
+    orch.track_changes = True
+    outcome = orch.run(full_refresh=False, dry_run=False)
+
+    assert outcome.updated_links >= 1
+    assert outcome.deleted_links == 2
+    assert outcome.total_links == 3
+    assert client.walked == [1]
+    urls = {r[1] for r in orch.store.select_all_links()}
+    assert urls == {"https://x/0", "https://x/3", "https://x/4"}
+    cur = orch.store.conn.execute(
+        "SELECT title FROM raindrop_links WHERE raindrop_id = ?", (1,)
+    )
+    assert cur.fetchone()[0] == "Edited"
+    assert orch.store.get_sync_state().last_update_iso.startswith("2024-06-01")
+
+
+def test_track_changes_writes_the_feed_in_batches(tmp_path: Path):
+    from raindrop_enhancer.sync.orchestrator import BATCH_SIZE
+
+    db = tmp_path / "test.db"
+    payloads = _make_payloads(250, start=datetime(2024, 1, 1, tzinfo=timezone.utc))
+    for p in payloads:
+        p["lastUpdate"] = p["created"]
+    Orchestrator(db, ChangesStubClient(payloads)).run(full_refresh=True)
+
+    edited = [dict(p, title="Edited", lastUpdate="2024-06-01T00:00:00Z") for p in payloads]
+    written_during_feed = []
+
+    class StreamingClient(ChangesStubClient):
+        def list_raindrops_changed_since(self, collection_id, iso_since=None):
+            if collection_id == -99:
+                return
+            yield from edited
+            # the feed is exhausted: earlier chunks are already stored
+            written_during_feed.append(
+                orch.store.conn.execute(
+                    "SELECT COUNT(*) FROM raindrop_links WHERE title = 'Edited'"
+                ).fetchone()[0]
+            )
+
+    orch = Orchestrator(db, StreamingClient(edited))
+    orch.track_changes = True
+    outcome = orch.run(full_refresh=False, dry_run=False)
+
+    assert outcome.updated_links == 250
+    assert written_during_feed == [250 - 250 % BATCH_SIZE]